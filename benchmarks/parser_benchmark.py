@@ -0,0 +1,25 @@
+import shlex
+import timeit
+
+from cmdweaver import parser
+
+LINES = {
+    "plain": "interface ethernet 0/1 switchport access vlan 100",
+    "quoted": 'description "uplink to core switch" mode "trunk all"',
+    "escaped": r"set banner motd Welcome\ to\ the\ lab",
+}
+
+
+def main(number: int = 20000) -> None:
+    for name, line in LINES.items():
+        shlex_time = timeit.timeit(lambda line=line: shlex.split(line), number=number)
+        tokenize_time = timeit.timeit(lambda line=line: parser.tokenize(line), number=number)
+        print(
+            f"{name:8} shlex={shlex_time / number * 1e6:8.2f}us "
+            f"tokenize={tokenize_time / number * 1e6:8.2f}us "
+            f"speedup={shlex_time / tokenize_time:6.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
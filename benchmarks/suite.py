@@ -0,0 +1,102 @@
+import argparse
+import json
+import platform
+import sys
+import timeit
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+from benchmarks.trees import SyntheticTree, build_commands, build_tree
+from cmdweaver.interpreter import Interpreter
+
+DEFAULT_SIZES = [100, 1000, 10000, 100000]
+FORMAT_VERSION = 1
+
+
+def time_per_call(operation: Callable[[], object], calls: int, repeat: int = 3) -> float:
+    timer = timeit.Timer(operation)
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat=repeat, number=number)) / number / calls
+
+
+def over_lines(function: Callable[[str], object], lines: list[str]) -> Callable[[], None]:
+    def run() -> None:
+        for line in lines:
+            function(line)
+
+    return run
+
+
+def measure_add_command(size: int) -> float:
+    commands, _ = build_commands(size)
+
+    def register() -> None:
+        interpreter = Interpreter()
+        for command in commands:
+            interpreter.add_command(command)
+
+    return time_per_call(register, len(commands))
+
+
+def measure(size: int) -> dict[str, float]:
+    tree: SyntheticTree = build_tree(size)
+    interpreter = tree.interpreter
+    return {
+        "parse": time_per_call(over_lines(interpreter.parser.parse, tree.eval_lines), len(tree.eval_lines)),
+        "eval": time_per_call(over_lines(interpreter.eval, tree.eval_lines), len(tree.eval_lines)),
+        "complete": time_per_call(over_lines(interpreter.complete, tree.complete_lines), len(tree.complete_lines)),
+        "help": time_per_call(over_lines(interpreter.help, tree.help_lines), len(tree.help_lines)),
+        "add_command": measure_add_command(size),
+    }
+
+
+def run(sizes: list[int]) -> dict[str, Any]:
+    results: dict[str, float] = {}
+    for size in sizes:
+        for operation, seconds in measure(size).items():
+            results[f"{operation}[{size}]"] = seconds
+            print(f"{operation:12} size={size:<7} {seconds * 1e6:12.2f}us/op", file=sys.stderr)
+    return {
+        "format": FORMAT_VERSION,
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "results": results,
+    }
+
+
+def compare(current: dict[str, Any], baseline: dict[str, Any], threshold: float) -> list[str]:
+    regressions: list[str] = []
+    for name, seconds in current["results"].items():
+        reference = baseline["results"].get(name)
+        if reference and seconds > reference * (1 + threshold):
+            regressions.append(
+                f"{name}: {reference * 1e6:.2f}us -> {seconds * 1e6:.2f}us (+{seconds / reference - 1:.0%})"
+            )
+    return regressions
+
+
+def main(argv: list[str] | None = None) -> int:
+    arguments = argparse.ArgumentParser(description="Benchmark cmdweaver on synthetic command trees")
+    arguments.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    arguments.add_argument("--output", type=Path, help="write the results as JSON")
+    arguments.add_argument("--baseline", type=Path, help="compare against a previous JSON result")
+    arguments.add_argument("--threshold", type=float, default=0.2, help="allowed slowdown ratio (default 0.2)")
+    options = arguments.parse_args(argv)
+
+    current = run(options.sizes)
+    if options.output:
+        options.output.write_text(json.dumps(current, indent=2, sort_keys=True) + "\n")
+    else:
+        print(json.dumps(current, indent=2, sort_keys=True))
+
+    if options.baseline:
+        regressions = compare(current, json.loads(options.baseline.read_text()), options.threshold)
+        for regression in regressions:
+            print(f"REGRESSION {regression}", file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
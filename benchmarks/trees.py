@@ -0,0 +1,75 @@
+import random
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import cast
+
+from cmdweaver import basic_types
+from cmdweaver.command import Command
+from cmdweaver.interpreter import Interpreter
+
+VERBS = ["show", "set", "delete", "clear", "debug"]
+AREAS = ["interface", "router", "vlan", "system", "user", "logging", "snmp", "ntp", "acl", "qos"]
+NOUNS = ["port", "group", "policy", "profile", "peer", "pool", "rule", "server", "class", "map"]
+PORTS = [f"eth{slot}/{port}" for slot in range(4) for port in range(48)]
+
+SlotFactory = Callable[[], basic_types.BaseType]
+
+
+@dataclass(frozen=True)
+class SyntheticTree:
+    interpreter: Interpreter
+    commands: list[Command]
+    eval_lines: list[str]
+    complete_lines: list[str]
+    help_lines: list[str]
+
+
+SLOTS: list[tuple[SlotFactory, str]] = [
+    (basic_types.StringType, "value"),
+    (lambda: basic_types.OptionsType(["enable", "disable", "auto"]), "auto"),
+    (lambda: basic_types.DynamicOptionsType(lambda: PORTS, cache_ttl=60), "eth2/17"),
+    (lambda: basic_types.DynamicOptionsType(lambda: PORTS), "eth1/3"),
+    (lambda: basic_types.RegexType(r"^\d+\.\d+\.\d+\.\d+$"), "10.0.0.1"),
+    (
+        lambda: cast(
+            basic_types.BaseType,
+            basic_types.OrType(basic_types.IntegerType(min=0, max=4096), basic_types.OptionsType(["any", "none"])),
+        ),
+        "100",
+    ),
+]
+
+
+def build_commands(size: int, seed: int = 0) -> tuple[list[Command], list[str]]:
+    generator = random.Random(seed)
+    commands: list[Command] = []
+    lines: list[str] = []
+    for index in range(size):
+        keywords = [generator.choice(VERBS), generator.choice(AREAS)]
+        keywords += [generator.choice(NOUNS) for _ in range(generator.randint(0, 3))]
+        keywords.append(f"{generator.choice(NOUNS)}{index}")
+        slots = [generator.choice(SLOTS) for _ in range(generator.randint(0, 2))]
+        placement = generator.random()
+        context_name = "config" if placement < 0.2 else None
+        definitions: list[str | basic_types.BaseType] = [*keywords]
+        definitions += [factory() for factory, _ in slots]
+        commands.append(
+            Command(definitions, lambda *args, **kwargs: None, context_name=context_name, always=placement > 0.95)
+        )
+        lines.append(" ".join(keywords + [sample for _, sample in slots]))
+    return commands, lines
+
+
+def build_tree(size: int, samples: int = 20, seed: int = 0) -> SyntheticTree:
+    commands, lines = build_commands(size, seed)
+    interpreter = Interpreter()
+    for command in commands:
+        interpreter.add_command(command)
+
+    generator = random.Random(seed + 1)
+    default_lines = [line for command, line in zip(commands, lines, strict=True) if command.context_name is None]
+    eval_lines = generator.sample(default_lines, min(samples, len(default_lines)))
+    complete_lines = [line[: len(line) // 2] for line in eval_lines]
+    complete_lines += [" ".join(line.split()[:2]) + " " for line in eval_lines]
+    help_lines = [" ".join(line.split()[:2]) for line in eval_lines]
+    return SyntheticTree(interpreter, commands, eval_lines, complete_lines, help_lines)
@@ -0,0 +1,137 @@
+from __future__ import annotations
+
+import asyncio
+import inspect
+import time
+from collections.abc import Iterable
+from concurrent.futures import Executor
+from typing import TYPE_CHECKING, Any
+
+from cmdweaver import basic_types, exceptions
+from cmdweaver import completion as completion_module
+from cmdweaver import executor as executor_module
+from cmdweaver import metrics as metrics_module
+from cmdweaver import parser as parser_module
+from cmdweaver import registry as registry_module
+from cmdweaver.interpreter import Interpreter
+
+if TYPE_CHECKING:
+    from cmdweaver.command import Command, MatchResult
+
+
+class AsyncInterpreter(Interpreter):
+    def __init__(
+        self,
+        parser: parser_module.Parser | None = None,
+        prompt: str = "",
+        dispatch_cache_size: int | None = None,
+        executor: Executor | None = None,
+        completion_cache_size: int | None = None,
+        abbreviations: bool = False,
+        registry: registry_module.CommandRegistry | None = None,
+        command_executor: executor_module.CommandExecutor | None = None,
+        metrics: metrics_module.MetricsRegistry | None = None,
+    ) -> None:
+        super().__init__(
+            parser=parser,
+            prompt=prompt,
+            dispatch_cache_size=dispatch_cache_size,
+            registry=registry,
+            command_executor=command_executor,
+            metrics=metrics,
+            completion_cache_size=completion_cache_size,
+            abbreviations=abbreviations,
+        )
+        self.executor = executor
+
+    async def aeval(self, line_text: str) -> Any:
+        if self.metrics is not None:
+            return await self._ameasured_eval(line_text, self.metrics)
+        result = await self._aparse(line_text)
+        if not result:
+            return None
+
+        return await self._arun(result, line_text)
+
+    async def _ameasured_eval(self, line_text: str, metrics: metrics_module.MetricsRegistry) -> Any:
+        start = time.perf_counter()
+        try:
+            result = await self._aparse(line_text)
+        except exceptions.EvalError as error:
+            self._record_dispatch_error(metrics, error)
+            raise
+        if not result:
+            return None
+
+        try:
+            return await self._arun(result, line_text)
+        finally:
+            self._record_eval(metrics, result.command, start)
+
+    async def _aparse(self, line_text: str) -> MatchResult | None:
+        line_text = line_text.strip()
+        if not line_text:
+            return None
+
+        with basic_types.evaluation_scope():
+            tokens = self._tokenize(line_text)
+            await self._prefetch_options(self.candidates_for(tokens))
+            return self._dispatch(tokens, line_text)
+
+    async def _arun(self, result: MatchResult, line_text: str) -> Any:
+        if not self._profile_hooks:
+            return await self._aexecute_command(result)
+        context = self.actual_context()
+        start = time.perf_counter()
+        try:
+            return await self._aexecute_command(result)
+        finally:
+            self._emit_phase("execute", line_text.strip(), start, context, result.command)
+
+    async def aeval_multiple(self, lines: list[str]) -> list[Any]:
+        return [await self.aeval(line) for line in lines]
+
+    async def acomplete(self, line_to_complete: str) -> set[str]:
+        with basic_types.evaluation_scope():
+            await self._prefetch_reachable(line_to_complete)
+            return self.complete(line_to_complete)
+
+    async def acomplete_limited(self, line_to_complete: str, limit: int) -> completion_module.LimitedCompletions:
+        with basic_types.evaluation_scope():
+            await self._prefetch_reachable(line_to_complete)
+            return self.complete_limited(line_to_complete, limit)
+
+    async def ahelp(self, line_text: str) -> dict[Command, str | None]:
+        with basic_types.evaluation_scope():
+            await self._prefetch_reachable(line_text)
+            return self.help(line_text)
+
+    async def _aexecute_command(self, result: MatchResult) -> Any:
+        call = self._handler_call(result)
+        try:
+            if self.executor is not None and not inspect.iscoroutinefunction(result.command.command_function):
+                value = await asyncio.get_running_loop().run_in_executor(self.executor, call)
+            else:
+                value = call()
+            if inspect.isawaitable(value):
+                value = await value
+            return value
+        except KeyboardInterrupt:
+            return None
+
+    async def _prefetch_options(self, commands: list[Command]) -> None:
+        await self._prefetch(
+            slot_type
+            for command in commands
+            for definition in command.definitions
+            for slot_type in basic_types.flatten_types(definition)
+            if isinstance(slot_type, basic_types.DynamicOptionsType)
+        )
+
+    async def _prefetch_reachable(self, line_text: str) -> None:
+        tokens = self.parser.parse(line_text)
+        await self._prefetch(completion_module.reachable_dynamic_types(self.active_commands(), tokens))
+
+    async def _prefetch(self, slot_types: Iterable[basic_types.DynamicOptionsType]) -> None:
+        providers = {id(slot_type): slot_type for slot_type in slot_types if slot_type.is_async}
+        await asyncio.gather(*(provider.prefetch() for provider in providers.values()))
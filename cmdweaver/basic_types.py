@@ -1,13 +1,37 @@
 from __future__ import annotations
 
+import heapq
+import inspect
 import re
-from collections.abc import Callable
+import sys
+import time
+from bisect import bisect_left
+from collections.abc import Awaitable, Callable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
 from typing import TYPE_CHECKING, Any, TypeAlias
 
+from cmdweaver.references import check_reference, reference_for, resolve_reference
+
 if TYPE_CHECKING:
     from cmdweaver.interpreter import Context
 
 Completion: TypeAlias = tuple[str, bool]
+OptionsProvider: TypeAlias = Callable[[], list[str]] | Callable[[], Awaitable[list[str]]]
+
+_evaluation_memo: ContextVar[dict[int, list[str]] | None] = ContextVar("cmdweaver_evaluation_memo", default=None)
+
+
+@contextmanager
+def evaluation_scope() -> Iterator[None]:
+    if _evaluation_memo.get() is not None:
+        yield
+        return
+    token = _evaluation_memo.set({})
+    try:
+        yield
+    finally:
+        _evaluation_memo.reset(token)
 
 
 class BaseType:
@@ -17,6 +41,9 @@ class BaseType:
     def complete(self, token: str, tokens: list[str], context: Context) -> list[Completion]:
         return []
 
+    def iter_complete(self, token: str, tokens: list[str], context: Context) -> Iterator[Completion]:
+        yield from sorted(self.complete(token, tokens, context), key=completion_text)
+
     def match(self, word: str, context: Context, partial_line: list[str] | None = None) -> bool:
         return False
 
@@ -29,6 +56,10 @@ class BaseType:
         return f"<{self.__class__.__name__}>"
 
 
+def completion_text(completion: Completion | str) -> str:
+    return completion[0] if isinstance(completion, tuple) else completion
+
+
 class OrType:
     def __init__(self, *types: BaseType, name: str | None = None) -> None:
         self.types = types
@@ -40,6 +71,9 @@ class OrType:
             completions.extend(t.complete(token, tokens, context))
         return completions
 
+    def iter_complete(self, token: str, tokens: list[str], context: Context) -> Iterator[Any]:
+        return heapq.merge(*(t.iter_complete(token, tokens, context) for t in self.types), key=completion_text)
+
     def match(self, word: str, context: Context, partial_line: list[str] | None = None) -> bool:
         return any(t.match(word, context, partial_line) for t in self.types)
 
@@ -52,24 +86,81 @@ class OrType:
         return f"<{self.__class__.__name__}>"
 
 
+class OptionIndex:
+    __slots__ = ("members", "sorted_options")
+
+    def __init__(self, options: list[str]) -> None:
+        self.members = frozenset(options)
+        self.sorted_options = tuple(sorted(self.members))
+
+    def starting_with(self, prefix: str) -> tuple[str, ...]:
+        start = bisect_left(self.sorted_options, prefix)
+        return self.sorted_options[start : self._prefix_end(prefix, start)]
+
+    def iter_starting_with(self, prefix: str) -> Iterator[str]:
+        options = self.sorted_options
+        for position in range(bisect_left(options, prefix), len(options)):
+            option = options[position]
+            if not option.startswith(prefix):
+                return
+            yield option
+
+    def has_prefix(self, prefix: str) -> bool:
+        start = bisect_left(self.sorted_options, prefix)
+        return start < len(self.sorted_options) and self.sorted_options[start].startswith(prefix)
+
+    def _prefix_end(self, prefix: str, start: int) -> int:
+        if not prefix:
+            return len(self.sorted_options)
+        if ord(prefix[-1]) == sys.maxunicode:
+            end = start
+            while end < len(self.sorted_options) and self.sorted_options[end].startswith(prefix):
+                end += 1
+            return end
+        successor = prefix[:-1] + chr(ord(prefix[-1]) + 1)
+        return bisect_left(self.sorted_options, successor, start)
+
+
 class OptionsType(BaseType):
+    _indexed: tuple[list[str], OptionIndex] | None = None
+
     def __init__(self, valid_options: list[str] | None = None, name: str | None = None) -> None:
         super().__init__()
         self.name = name
         self.valid_options = valid_options or []
 
+    @property
+    def valid_options(self) -> list[str]:
+        return self._valid_options
+
+    @valid_options.setter
+    def valid_options(self, options: list[str]) -> None:
+        self._valid_options = options
+        self._indexed = None
+
     def match(self, word: str, context: Context, partial_line: list[str] | None = None) -> bool:
-        return word in self.get_valid_options()
+        return word in self.option_index().members
 
     def partial_match(self, word: str, context: Context, partial_line: list[str] | None = None) -> bool:
-        return any(op.startswith(word) for op in self.get_valid_options())
+        return self.option_index().has_prefix(word)
 
     def complete(self, token: str, tokens: list[str], context: Context) -> list[Completion]:
-        return [(option, True) for option in self.get_valid_options() if option.startswith(token)]
+        return [(option, True) for option in self.option_index().starting_with(token)]
+
+    def iter_complete(self, token: str, tokens: list[str], context: Context) -> Iterator[Completion]:
+        for option in self.option_index().iter_starting_with(token):
+            yield option, True
 
     def get_valid_options(self) -> list[str]:
         return self.valid_options
 
+    def option_index(self) -> OptionIndex:
+        options = self.get_valid_options()
+        indexed = self._indexed
+        if indexed is None or indexed[0] is not options:
+            indexed = self._indexed = (options, OptionIndex(options))
+        return indexed[1]
+
     def __str__(self) -> str:
         if self.name is not None:
             return f"<{self.name}>"
@@ -77,12 +168,105 @@ class OptionsType(BaseType):
 
 
 class DynamicOptionsType(OptionsType):
-    def __init__(self, valid_options_func: Callable[[], list[str]], name: str | None = None) -> None:
+    def __init__(
+        self,
+        valid_options_func: OptionsProvider | str,
+        name: str | None = None,
+        cache_ttl: float | None = None,
+        cache_max_size: int | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
         self.name = name
-        self.valid_options_func = valid_options_func
+        self._valid_options_func: OptionsProvider | str = (
+            check_reference(valid_options_func) if isinstance(valid_options_func, str) else valid_options_func
+        )
+        self.cache_ttl = cache_ttl
+        self.cache_max_size = cache_max_size
+        self._clock = clock
+        self.provider_reference = valid_options_func if isinstance(valid_options_func, str) else None
+        self._cache: tuple[float, list[str]] | None = None
+        self._indexed = None
+
+    def __getstate__(self) -> dict[str, Any]:
+        state = dict(self.__dict__)
+        state["_cache"] = state["_indexed"] = None
+        reference = self.provider_reference or reference_for(self._valid_options_func)
+        if reference is not None:
+            state["_valid_options_func"] = reference
+        return state
 
     def get_valid_options(self) -> list[str]:
-        return self.valid_options_func()
+        memo = _evaluation_memo.get()
+        if memo is None:
+            return self._load_options()
+        options = memo.get(id(self))
+        if options is None:
+            options = memo[id(self)] = self._load_options()
+        return options
+
+    @property
+    def valid_options_func(self) -> OptionsProvider:
+        provider = self._valid_options_func
+        if isinstance(provider, str):
+            provider = self._valid_options_func = resolve_reference(provider)
+        return provider
+
+    @property
+    def cacheable(self) -> bool:
+        return self.cache_ttl is not None
+
+    def invalidate(self) -> None:
+        self._cache = None
+
+    def __str__(self) -> str:
+        if self.name is None and self.is_async and id(self) not in (_evaluation_memo.get() or {}):
+            return f"<{self.__class__.__name__}>"
+        return super().__str__()
+
+    @property
+    def is_async(self) -> bool:
+        provider = self.valid_options_func
+        return inspect.iscoroutinefunction(provider) or inspect.iscoroutinefunction(type(provider).__call__)
+
+    async def prefetch(self) -> None:
+        memo = _evaluation_memo.get()
+        if memo is None or id(self) in memo:
+            return
+        options = self.cached_options()
+        if options is None:
+            options = self._remember(await self.valid_options_func())  # type: ignore[misc]
+        memo[id(self)] = options
+
+    def _load_options(self) -> list[str]:
+        options = self.cached_options()
+        if options is not None:
+            return options
+        loaded = self.valid_options_func()
+        if inspect.isawaitable(loaded):
+            if inspect.iscoroutine(loaded):
+                loaded.close()
+            raise TypeError(f"{self.name or self.valid_options_func!r} has an async provider; use AsyncInterpreter")
+        return self._remember(loaded)
+
+    def cached_options(self) -> list[str] | None:
+        cache = self._cache
+        if self.cache_ttl is None or cache is None or self._clock() - cache[0] >= self.cache_ttl:
+            return None
+        return cache[1]
+
+    def _remember(self, options: list[str]) -> list[str]:
+        if self.cache_ttl is not None:
+            fits = self.cache_max_size is None or len(options) <= self.cache_max_size
+            self._cache = (self._clock(), options) if fits else None
+        return options
+
+
+def flatten_types(definition: Any) -> Iterator[Any]:
+    if isinstance(definition, OrType):
+        for slot_type in definition.types:
+            yield from flatten_types(slot_type)
+    else:
+        yield definition
 
 
 class StringType(BaseType):
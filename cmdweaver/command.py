@@ -1,10 +1,13 @@
 from __future__ import annotations
 
-from collections.abc import Callable
+import time
+from collections.abc import Callable, Iterable, Iterator
+from dataclasses import dataclass
 from typing import TYPE_CHECKING, Any, TypeAlias
 
-from cmdweaver.basic_types import OptionsType
+from cmdweaver.basic_types import BoolType, IntegerType, OptionIndex, OptionsType, RegexType, StringType
 from cmdweaver.exceptions import ArgumentError
+from cmdweaver.references import check_reference, reference_for, resolve_reference
 
 if TYPE_CHECKING:
     from cmdweaver.basic_types import BaseType
@@ -12,6 +15,22 @@ if TYPE_CHECKING:
 
     KeywordDefinition: TypeAlias = str | BaseType
 
+SlotResolver: TypeAlias = Callable[[str, list[str], "Context"], str | None]
+SlotTimer: TypeAlias = Callable[["BaseType", float], None]
+
+_COMPILED_ATTRIBUTES = ("_slot_resolvers", "_keyword_resolvers", "_parameter_slots", "shape")
+
+
+@dataclass(frozen=True)
+class MatchResult:
+    command: Command
+    tokens: list[str]
+    argument_errors: list[ArgumentError]
+
+    @property
+    def is_valid(self) -> bool:
+        return not self.argument_errors
+
 
 class KeywordType:
     def __init__(self, name: str) -> None:
@@ -36,11 +55,13 @@ class Command:
     def __init__(
         self,
         keywords: list[KeywordDefinition],
-        command_function: Callable[..., Any] | None = None,
+        command_function: Callable[..., Any] | str | None = None,
         help: str | None = None,
         context_name: str | None = None,
         always: bool = False,
         cmd_id: str | None = None,
+        enters_context: str | None = None,
+        exits_context: bool = False,
     ) -> None:
         self.definitions: list[KeywordType | BaseType] = []
         for definition in keywords:
@@ -50,11 +71,70 @@ class Command:
                 self.definitions.append(definition)
 
         self.keywords = keywords
+        self._command_function: Callable[..., Any] | str | None = None
+        self.handler_reference: str | None = None
         self.command_function = command_function
         self.help = help
         self.context_name = context_name
         self.always = always
         self.cmd_id = cmd_id
+        self.enters_context = enters_context
+        self.exits_context = exits_context
+
+        self.arity = len(self.definitions)
+        self.keyword_positions: tuple[tuple[int, str], ...] = tuple(
+            (index, definition.name)
+            for index, definition in enumerate(self.definitions)
+            if isinstance(definition, KeywordType)
+        )
+        self._compile()
+
+    def _compile(self) -> None:
+        self._slot_resolvers: tuple[SlotResolver, ...] = tuple(
+            self._compile_slot(definition) for definition in self.definitions
+        )
+        self._keyword_resolvers: tuple[tuple[int, SlotResolver], ...] = tuple(
+            (index, self._slot_resolvers[index])
+            for index, definition in enumerate(self.definitions)
+            if isinstance(definition, KeywordType)
+        )
+        self._parameter_slots: tuple[tuple[int, BaseType, SlotResolver], ...] = tuple(
+            (index, definition, self._slot_resolvers[index])
+            for index, definition in enumerate(self.definitions)
+            if not isinstance(definition, KeywordType)
+        )
+        self.shape: str = " ".join(_slot_shape(definition) for definition in self.definitions)
+
+    def __getstate__(self) -> dict[str, Any]:
+        state = dict(self.__dict__)
+        for compiled in _COMPILED_ATTRIBUTES:
+            state.pop(compiled, None)
+        reference = self.handler_reference or reference_for(self._command_function)
+        if reference is not None:
+            state["_command_function"] = reference
+        return state
+
+    def __getattr__(self, name: str) -> Any:
+        if name not in _COMPILED_ATTRIBUTES:
+            raise AttributeError(f"{type(self).__name__!r} object has no attribute {name!r}")
+        self._compile()
+        return self.__dict__[name]
+
+    @property
+    def command_function(self) -> Callable[..., Any] | None:
+        function = self._command_function
+        if isinstance(function, str):
+            function = self._command_function = resolve_reference(function)
+        return function
+
+    @command_function.setter
+    def command_function(self, function: Callable[..., Any] | str | None) -> None:
+        self._command_function = check_reference(function) if isinstance(function, str) else function
+        self.handler_reference = function if isinstance(function, str) else None
+
+    @property
+    def changes_context(self) -> bool:
+        return self.enters_context is not None or self.exits_context
 
     def __lt__(self, other: Command) -> bool:
         return self.__str__().__lt__(other.__str__())
@@ -66,22 +146,42 @@ class Command:
         return str(self)
 
     def normalize_tokens(self, tokens: list[str], context: Context) -> list[str]:
-        result: list[str] = []
-        for index, word in enumerate(tokens):
-            definition_for_that_index = self.keywords[index]
-            if self._is_keyword(definition_for_that_index):
-                result.append(definition_for_that_index)  # type: ignore[arg-type]
-            else:
-                result.append(self._expand_parameter(self.definitions[index], word, tokens, context))
-        return result
+        normalized_tokens = list(tokens)
+        for index, keyword in self.keyword_positions:
+            if index < len(tokens):
+                normalized_tokens[index] = keyword
+        for index, _, resolver in self._parameter_slots:
+            if index < len(tokens):
+                resolved_word = resolver(tokens[index], tokens, context)
+                if resolved_word is not None:
+                    normalized_tokens[index] = resolved_word
+        return normalized_tokens
+
+    def _compile_slot(self, definition: KeywordType | BaseType) -> SlotResolver:
+        kind = type(definition)
+        if kind is KeywordType:
+            name = definition.name
+            return lambda word, tokens, context: word if word == name else None
+        if kind is StringType:
+            return lambda word, tokens, context: word if word else None
+        if kind is RegexType:
+            regex = definition.regex  # type: ignore[union-attr]
+            return lambda word, tokens, context: word if regex.match(word) is not None else None
+        if kind is IntegerType:
+            return lambda word, tokens, context: word if definition.match(word, context, partial_line=tokens) else None
+        if kind is OptionsType or kind is BoolType:
+            options_type: OptionsType = definition  # type: ignore[assignment]
+            return lambda word, tokens, context: _resolve_option(options_type.option_index(), word)
+        if isinstance(definition, KeywordType):
+            return lambda word, tokens, context: word if definition.match(word, context, partial_line=tokens) else None
+        return lambda word, tokens, context: self._resolve_parameter(definition, word, tokens, context)
+
+    def _resolve_parameter(self, definition: BaseType, word: str, tokens: list[str], context: Context) -> str | None:
+        expanded_word = self._expand_parameter(definition, word, tokens, context)
+        return expanded_word if definition.match(expanded_word, context, partial_line=tokens) else None
 
     def _match_word(self, index: int, word: str, context: Context, partial_line: list[str]) -> bool:
-        definition = self.definitions[index]
-        if isinstance(definition, KeywordType):
-            return definition.match(word, context, partial_line=partial_line)
-        else:
-            word = self._expand_parameter(self.definitions[index], word, partial_line, context)
-            return self.definitions[index].match(word, context, partial_line=partial_line)
+        return self._slot_resolvers[index](word, partial_line, context) is not None
 
     def _expand_parameter(
         self, definition: KeywordType | BaseType, word: str, tokens: list[str], context: Context
@@ -95,18 +195,20 @@ class Command:
         return self.definitions[index].partial_match(word, context, partial_line=partial_line)
 
     def partial_match(self, tokens: list[str], context: Context) -> bool:
+        return self.match_completed_tokens(tokens, context) and self.partial_match_last_token(tokens, context)
+
+    def match_completed_tokens(self, tokens: list[str], context: Context, start: int = 0) -> bool:
         if len(tokens) > len(self.keywords):
             return False
+        return all(
+            self._match_word(index, tokens[index], context, partial_line=tokens)
+            for index in range(start, len(tokens) - 1)
+        )
 
-        for index, word in enumerate(tokens):
-            if index == len(tokens) - 1:
-                if not self._partial_match(index, word, context, partial_line=tokens):
-                    return False
-            else:
-                if not self._match_word(index, word, context, partial_line=tokens):
-                    return False
-
-        return True
+    def partial_match_last_token(self, tokens: list[str], context: Context) -> bool:
+        if not tokens:
+            return True
+        return self._partial_match(len(tokens) - 1, tokens[-1], context, partial_line=tokens)
 
     def context_match(self, context: Context) -> bool:
         if self.always:
@@ -126,44 +228,54 @@ class Command:
     def match(self, tokens: list[str], context: Context) -> bool:
         if not self.context_match(context):
             return False
-        if len(tokens) != len(self.keywords):
+        if len(tokens) != self.arity:
             return False
-        return all(self._match_word(index, word, context, partial_line=tokens) for index, word in enumerate(tokens))
+        return all(
+            resolver(word, tokens, context) is not None
+            for resolver, word in zip(self._slot_resolvers, tokens, strict=True)
+        )
 
     def structural_match(self, tokens: list[str], context: Context) -> bool:
         if not self.context_match(context):
             return False
-        if len(tokens) != len(self.keywords):
+        if len(tokens) != self.arity:
             return False
-        for index, word in enumerate(tokens):
-            definition = self.definitions[index]
-            if isinstance(definition, KeywordType) and not definition.match(word, context, partial_line=tokens):
-                return False
-        return True
+        return all(resolver(tokens[index], tokens, context) is not None for index, resolver in self._keyword_resolvers)
 
-    def validate_arguments(self, tokens: list[str], context: Context) -> list[ArgumentError]:
+    def resolve(self, tokens: list[str], context: Context, on_slot: SlotTimer | None = None) -> MatchResult | None:
+        if not self.structural_match(tokens, context):
+            return None
+        normalized_tokens = list(tokens)
         errors: list[ArgumentError] = []
-        for index, word in enumerate(tokens):
-            definition = self.definitions[index]
-            if isinstance(definition, KeywordType):
-                continue
-            expanded_word = self._expand_parameter(definition, word, tokens, context)
-            if not definition.match(expanded_word, context, partial_line=tokens):
-                valid_options = (
-                    list(definition.get_valid_options())
-                    if isinstance(definition, OptionsType)
-                    else None
-                )
-                errors.append(
-                    ArgumentError(
-                        index=index,
-                        name=getattr(definition, "name", None),
-                        value=word,
-                        slot_str=str(definition),
-                        valid_options=valid_options,
-                    )
-                )
-        return errors
+        for index, definition, resolver in self._parameter_slots:
+            if on_slot is None:
+                resolved_word = resolver(tokens[index], tokens, context)
+            else:
+                start = time.perf_counter()
+                resolved_word = resolver(tokens[index], tokens, context)
+                on_slot(definition, time.perf_counter() - start)
+            if resolved_word is None:
+                errors.append(self._argument_error(index, definition, tokens[index]))
+            else:
+                normalized_tokens[index] = resolved_word
+        return MatchResult(self, normalized_tokens, errors)
+
+    def validate_arguments(self, tokens: list[str], context: Context) -> list[ArgumentError]:
+        return [
+            self._argument_error(index, definition, tokens[index])
+            for index, definition, resolver in self._parameter_slots
+            if resolver(tokens[index], tokens, context) is None
+        ]
+
+    def _argument_error(self, index: int, definition: BaseType, word: str) -> ArgumentError:
+        valid_options = list(definition.get_valid_options()) if isinstance(definition, OptionsType) else None
+        return ArgumentError(
+            index=index,
+            name=getattr(definition, "name", None),
+            value=word,
+            slot_str=str(definition),
+            valid_options=valid_options,
+        )
 
     def matching_parameters(self, tokens: list[str]) -> list[str]:
         parameters: list[str] = []
@@ -187,14 +299,19 @@ class Command:
         else:
             raw_completions = definition.complete(token, tokens, context)  # type: ignore[union-attr]
 
-        completions: list[str] = []
-        for completion in raw_completions:
-            if isinstance(completion, tuple):
-                completions.append(completion[0] + (" " if completion[1] else ""))
-            else:
-                completions.append(completion.strip() + " ")
+        is_last_token = self._is_last_token(tokens)
+        return [_format_completion(completion, is_last_token) for completion in raw_completions]
+
+    def iter_complete(self, tokens: list[str], context: Context) -> Iterator[str]:
+        definition, token = self._select_token_to_complete(tokens)
+        if self._is_keyword(definition):
+            raw_completions: Iterable[Any] = self._complete_keyword(definition, token, tokens, context)  # type: ignore[arg-type]
+        else:
+            raw_completions = definition.iter_complete(token, tokens, context)  # type: ignore[union-attr]
 
-        return [completion.strip() if self._is_last_token(tokens) else completion for completion in completions]
+        is_last_token = self._is_last_token(tokens)
+        for completion in raw_completions:
+            yield _format_completion(completion, is_last_token)
 
     def _complete_keyword(self, definition: str, token: str, tokens: list[str], context: Context) -> list[str]:
         if definition == token:
@@ -216,3 +333,25 @@ class Command:
 
     def _is_keyword(self, definition: KeywordDefinition) -> bool:
         return isinstance(definition, str)
+
+
+def _format_completion(completion: Any, is_last_token: bool) -> str:
+    if isinstance(completion, tuple):
+        formatted: str = completion[0] + (" " if completion[1] else "")
+    else:
+        formatted = completion.strip() + " "
+    return formatted.strip() if is_last_token else formatted
+
+
+def _resolve_option(index: OptionIndex, word: str) -> str | None:
+    completions = index.starting_with(word)
+    if len(completions) == 1:
+        return completions[0]
+    return word if word in index.members else None
+
+
+def _slot_shape(definition: KeywordType | BaseType) -> str:
+    if isinstance(definition, KeywordType):
+        return definition.name
+    name = getattr(definition, "name", None)
+    return f"<{name or type(definition).__name__}>"
@@ -0,0 +1,193 @@
+from __future__ import annotations
+
+import heapq
+import threading
+from collections import OrderedDict
+from collections.abc import Iterator
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, TypeAlias
+
+from cmdweaver import basic_types
+
+if TYPE_CHECKING:
+    from cmdweaver.command import Command
+    from cmdweaver.interpreter import Context, Interpreter
+
+
+DynamicSnapshot: TypeAlias = tuple[tuple[basic_types.DynamicOptionsType, list[str]], ...]
+
+
+def collect_completions(commands: list[Command], tokens: list[str], context: Context) -> set[str]:
+    completions: set[str] = set()
+    for command in commands:
+        completions.update(command.complete(tokens, context))
+    return completions
+
+
+@dataclass(frozen=True)
+class LimitedCompletions:
+    completions: list[str]
+    has_more: bool
+
+
+def collect_limited_completions(
+    commands: list[Command], tokens: list[str], context: Context, limit: int
+) -> LimitedCompletions:
+    completions: set[str] = set()
+    for completion in heapq.merge(*(command.iter_complete(tokens, context) for command in commands)):
+        if completion in completions:
+            continue
+        if len(completions) >= limit:
+            return LimitedCompletions(sorted(completions), True)
+        completions.add(completion)
+    return LimitedCompletions(sorted(completions), False)
+
+
+@dataclass
+class _Narrowing:
+    context: Context
+    commands_version: int
+    completed_tokens: list[str]
+    survivors: list[Command]
+
+
+class CompletionSession:
+    def __init__(self, interpreter: Interpreter) -> None:
+        self._interpreter = interpreter
+        self._narrowing: _Narrowing | None = None
+
+    def complete(self, line_to_complete: str) -> set[str]:
+        tokens = self._interpreter.parser.parse(line_to_complete)
+        context = self._interpreter.actual_context()
+        with basic_types.evaluation_scope():
+            candidates = [
+                command
+                for command in self._surviving_commands(tokens, context)
+                if command.partial_match_last_token(tokens, context)
+            ]
+            return collect_completions(candidates, tokens, context)
+
+    def reset(self) -> None:
+        self._narrowing = None
+
+    def _surviving_commands(self, tokens: list[str], context: Context) -> list[Command]:
+        completed_tokens = tokens[:-1]
+        previous = self._narrowing
+        if previous is not None and self._extends(previous, completed_tokens, context):
+            start = len(previous.completed_tokens)
+            commands = previous.survivors
+        else:
+            start = 0
+            commands = self._interpreter.active_commands()
+        survivors = [command for command in commands if command.match_completed_tokens(tokens, context, start)]
+        self._narrowing = _Narrowing(context, self._interpreter.commands_version, completed_tokens, survivors)
+        return survivors
+
+    def _extends(self, previous: _Narrowing, completed_tokens: list[str], context: Context) -> bool:
+        return (
+            previous.context is context
+            and previous.commands_version == self._interpreter.commands_version
+            and completed_tokens[: len(previous.completed_tokens)] == previous.completed_tokens
+        )
+
+
+@dataclass(frozen=True)
+class CompletionCacheStats:
+    hits: int
+    misses: int
+    size: int
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+@dataclass(frozen=True)
+class _CachedCompletions:
+    completions: frozenset[str]
+    dynamic: DynamicSnapshot
+
+    def is_fresh(self) -> bool:
+        return all(slot_type.cached_options() is options for slot_type, options in self.dynamic)
+
+
+class CompletionCache:
+    def __init__(self, max_size: int = 256) -> None:
+        self.max_size = max_size
+        self._entries: OrderedDict[tuple[str, ...], _CachedCompletions] = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._version = 0
+        self._context: Context | None = None
+
+    def sync(self, version: int, context: Context) -> None:
+        if version != self._version or context is not self._context:
+            self.clear()
+            self._version = version
+            self._context = context
+
+    def lookup(self, tokens: list[str]) -> set[str] | None:
+        key = tuple(tokens)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and not entry.is_fresh():
+                del self._entries[key]
+                entry = None
+            if entry is None:
+                self._misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return set(entry.completions)
+
+    def store(self, tokens: list[str], completions: set[str], commands: list[Command]) -> None:
+        dynamic = dynamic_snapshot(commands, tokens)
+        if dynamic is None:
+            return
+        key = tuple(tokens)
+        with self._lock:
+            self._entries[key] = _CachedCompletions(frozenset(completions), dynamic)
+            self._entries.move_to_end(key)
+            if len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> CompletionCacheStats:
+        with self._lock:
+            return CompletionCacheStats(self._hits, self._misses, len(self._entries))
+
+
+def dynamic_snapshot(commands: list[Command], tokens: list[str]) -> DynamicSnapshot | None:
+    slot_types = {id(slot_type): slot_type for slot_type in reachable_dynamic_types(commands, tokens)}
+    snapshot: list[tuple[basic_types.DynamicOptionsType, list[str]]] = []
+    for slot_type in slot_types.values():
+        options = slot_type.cached_options()
+        if options is None:
+            return None
+        snapshot.append((slot_type, options))
+    return tuple(snapshot)
+
+
+def reachable_dynamic_types(commands: list[Command], tokens: list[str]) -> Iterator[basic_types.DynamicOptionsType]:
+    completed = max(len(tokens), 1)
+    for command in commands:
+        if command.arity < completed or not _keywords_allow(command, tokens):
+            continue
+        for definition in command.definitions[:completed]:
+            for slot_type in basic_types.flatten_types(definition):
+                if isinstance(slot_type, basic_types.DynamicOptionsType):
+                    yield slot_type
+
+
+def _keywords_allow(command: Command, tokens: list[str]) -> bool:
+    last = len(tokens) - 1
+    return all(
+        tokens[index] == keyword if index < last else keyword.startswith(tokens[index])
+        for index, keyword in command.keyword_positions
+        if index <= last
+    )
@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, TypeAlias
+
+from cmdweaver.basic_types import DynamicOptionsType, flatten_types
+
+if TYPE_CHECKING:
+    from cmdweaver.command import Command
+    from cmdweaver.index import ActiveCommands
+
+Positions: TypeAlias = tuple[int, ...]
+DispatchKey: TypeAlias = tuple["ActiveCommands", int, Positions, tuple[str, ...]]
+
+
+@dataclass(frozen=True)
+class DispatchCacheStats:
+    hits: int
+    misses: int
+    size: int
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class DispatchCache:
+    def __init__(self, max_size: int = 1024) -> None:
+        self.max_size = max_size
+        self._entries: OrderedDict[DispatchKey, Command] = OrderedDict()
+        self._shapes: dict[tuple[ActiveCommands, int], set[Positions]] = {}
+        self._cacheable: dict[tuple[ActiveCommands, Command], bool] = {}
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._version = 0
+
+    def sync(self, version: int) -> None:
+        if version != self._version:
+            self.clear()
+            self._version = version
+
+    def lookup(self, active: ActiveCommands, tokens: list[str]) -> Command | None:
+        with self._lock:
+            for positions in self._shapes.get((active, len(tokens)), ()):
+                key = (active, len(tokens), positions, tuple(tokens[index] for index in positions))
+                command = self._entries.get(key)
+                if command is not None:
+                    self._entries.move_to_end(key)
+                    self._hits += 1
+                    return command
+            self._misses += 1
+            return None
+
+    def store(self, active: ActiveCommands, command: Command) -> None:
+        with self._lock:
+            if not self._is_cacheable(active, command):
+                return
+            positions = tuple(index for index, _ in command.keyword_positions)
+            keywords = tuple(keyword for _, keyword in command.keyword_positions)
+            self._shapes.setdefault((active, command.arity), set()).add(positions)
+            self._entries[(active, command.arity, positions, keywords)] = command
+            self._entries.move_to_end((active, command.arity, positions, keywords))
+            if len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._shapes.clear()
+            self._cacheable.clear()
+
+    def stats(self) -> DispatchCacheStats:
+        with self._lock:
+            return DispatchCacheStats(self._hits, self._misses, len(self._entries))
+
+    def _is_cacheable(self, active: ActiveCommands, command: Command) -> bool:
+        cacheable = self._cacheable.get((active, command))
+        if cacheable is None:
+            cacheable = self._cacheable[(active, command)] = all(
+                is_cacheable_slot(definition) for definition in command.definitions
+            ) and not any(_shares_shape(command, other) for other in active.commands())
+        return cacheable
+
+
+def is_cacheable_slot(definition: Any) -> bool:
+    return all(
+        slot_type.cacheable for slot_type in flatten_types(definition) if isinstance(slot_type, DynamicOptionsType)
+    )
+
+
+def _shares_shape(command: Command, other: Command) -> bool:
+    if other is command or other.arity != command.arity:
+        return False
+    other_keywords = dict(other.keyword_positions)
+    return all(other_keywords.get(index, keyword) == keyword for index, keyword in command.keyword_positions)
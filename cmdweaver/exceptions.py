@@ -43,9 +43,37 @@ class InvalidArgumentError(EvalError):
         return f"InvalidArgumentError(command={self.command}, errors=[{details}])"
 
 
+class ScriptError(EvalError):
+    def __init__(self, line_number: int, line: str, error: Exception) -> None:
+        self.line_number = line_number
+        self.line = line
+        self.error = error
+        super().__init__(line_number, line, error)
+
+    def __str__(self) -> str:
+        return f"line {self.line_number}: {self.line!r}: {self.error!r}"
+
+
 class NotContextDefinedError(Exception):
     pass
 
 
+class RegistryFrozenError(Exception):
+    pass
+
+
+class NoCommandExecutorError(Exception):
+    pass
+
+
+class SpecError(Exception):
+    def __init__(self, problems: list[str]) -> None:
+        self.problems = problems
+        super().__init__(problems)
+
+    def __str__(self) -> str:
+        return "invalid command spec:\n" + "\n".join(f"  {problem}" for problem in self.problems)
+
+
 class EndOfProgram(Exception):
     pass
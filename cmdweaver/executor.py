@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+import threading
+from collections import deque
+from collections.abc import Callable
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any
+
+
+class CommandExecutor:
+    def __init__(self, max_workers: int | None = None) -> None:
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="cmdweaver")
+
+    def serial_queue(self) -> SerialQueue:
+        return SerialQueue(self._pool)
+
+    def shutdown(self, wait: bool = True) -> None:
+        self._pool.shutdown(wait=wait)
+
+    def __enter__(self) -> CommandExecutor:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.shutdown()
+
+
+class SerialQueue:
+    def __init__(self, pool: ThreadPoolExecutor) -> None:
+        self._pool = pool
+        self._pending: deque[tuple[Future[Any], Callable[[], Any]]] = deque()
+        self._lock = threading.Lock()
+        self._draining = False
+
+    def submit(self, call: Callable[[], Any]) -> Future[Any]:
+        future: Future[Any] = Future()
+        with self._lock:
+            self._pending.append((future, call))
+            if not self._draining:
+                self._draining = True
+                self._pool.submit(self._drain)
+        return future
+
+    def cancel_pending(self) -> int:
+        with self._lock:
+            pending = list(self._pending)
+            self._pending.clear()
+        cancelled = 0
+        for future, _ in pending:
+            if future.set_running_or_notify_cancel():
+                future.set_result(None)
+                cancelled += 1
+        return cancelled
+
+    def _drain(self) -> None:
+        while self._run_next():
+            try:
+                self._pool.submit(self._drain)
+            except RuntimeError:
+                continue
+            return
+
+    def _run_next(self) -> bool:
+        with self._lock:
+            if not self._pending:
+                self._draining = False
+                return False
+            future, call = self._pending.popleft()
+        if future.set_running_or_notify_cancel():
+            try:
+                future.set_result(call())
+            except BaseException as error:
+                future.set_exception(error)
+        with self._lock:
+            if not self._pending:
+                self._draining = False
+                return False
+            return True
@@ -0,0 +1,136 @@
+from __future__ import annotations
+
+import heapq
+import math
+import re
+from bisect import bisect_left, insort
+from typing import TYPE_CHECKING, NamedTuple
+
+from cmdweaver.command import KeywordType
+
+if TYPE_CHECKING:
+    from cmdweaver.command import Command
+
+_WORD = re.compile(r"[^\W_]+")
+
+KEYWORD_WEIGHT = 4.0
+CMD_ID_WEIGHT = 3.0
+SLOT_NAME_WEIGHT = 2.0
+HELP_WEIGHT = 1.0
+PREFIX_FACTOR = 0.5
+
+
+def search_terms(text: str) -> list[str]:
+    return _WORD.findall(text.lower())
+
+
+class _TermMatch(NamedTuple):
+    term: str
+    postings: dict[int, float]
+    factor: float
+
+
+class HelpIndex:
+    def __init__(self) -> None:
+        self._commands: list[Command] = []
+        self._postings: dict[str, dict[int, float]] = {}
+        self._terms: list[str] = []
+        self._rankings: dict[str, list[tuple[int, float]]] = {}
+
+    def add(self, command: Command) -> None:
+        sequence = len(self._commands)
+        self._commands.append(command)
+        for term, weight in _weighted_terms(command).items():
+            postings = self._postings.get(term)
+            if postings is None:
+                postings = self._postings[term] = {}
+                insort(self._terms, term)
+            postings[sequence] = weight
+            self._rankings.pop(term, None)
+
+    def search(self, query: str, limit: int | None = None) -> list[tuple[Command, float]]:
+        matches = [self._matches(term) for term in dict.fromkeys(search_terms(query))]
+        if not matches or not all(matches):
+            return []
+        if limit is not None and len(matches) == 1 and len(matches[0]) == 1:
+            return self._top_postings(matches[0][0], limit)
+
+        matches.sort(key=_size)
+        scores = _best_scores(matches[0])
+        for term_matches in matches[1:]:
+            if len(scores) * len(term_matches) > _size(term_matches):
+                term_scores = _best_scores(term_matches)
+                scores = {
+                    sequence: score + term_scores[sequence]
+                    for sequence, score in scores.items()
+                    if sequence in term_scores
+                }
+            else:
+                scores = {
+                    sequence: score + term_score
+                    for sequence, score in scores.items()
+                    if (term_score := _best_score(term_matches, sequence))
+                }
+            if not scores:
+                return []
+        ranked = heapq.nsmallest(
+            len(scores) if limit is None else limit, scores.items(), key=lambda entry: (-entry[1], entry[0])
+        )
+        return [(self._commands[sequence], score) for sequence, score in ranked]
+
+    def _top_postings(self, match: _TermMatch, limit: int) -> list[tuple[Command, float]]:
+        ranking = self._rankings.get(match.term)
+        if ranking is None:
+            ranking = self._rankings[match.term] = sorted(
+                match.postings.items(), key=lambda entry: (-entry[1], entry[0])
+            )
+        return [(self._commands[sequence], weight * match.factor) for sequence, weight in ranking[:limit]]
+
+    def _matches(self, term: str) -> list[_TermMatch]:
+        matches: list[_TermMatch] = []
+        for position in range(bisect_left(self._terms, term), len(self._terms)):
+            indexed_term = self._terms[position]
+            if not indexed_term.startswith(term):
+                break
+            postings = self._postings[indexed_term]
+            factor = math.log(1 + len(self._commands) / len(postings))
+            matches.append(
+                _TermMatch(indexed_term, postings, factor if indexed_term == term else factor * PREFIX_FACTOR)
+            )
+        return matches
+
+
+def _size(matches: list[_TermMatch]) -> int:
+    return sum(len(match.postings) for match in matches)
+
+
+def _best_scores(matches: list[_TermMatch]) -> dict[int, float]:
+    if len(matches) == 1:
+        _, postings, factor = matches[0]
+        return {sequence: weight * factor for sequence, weight in postings.items()}
+    scores: dict[int, float] = {}
+    for _, postings, factor in matches:
+        for sequence, weight in postings.items():
+            score = weight * factor
+            if score > scores.get(sequence, 0.0):
+                scores[sequence] = score
+    return scores
+
+
+def _best_score(matches: list[_TermMatch], sequence: int) -> float:
+    return max(postings.get(sequence, 0.0) * factor for _, postings, factor in matches)
+
+
+def _weighted_terms(command: Command) -> dict[str, float]:
+    weights: dict[str, float] = {}
+    fields: list[tuple[str | None, float]] = [(command.cmd_id, CMD_ID_WEIGHT), (command.help, HELP_WEIGHT)]
+    for definition in command.definitions:
+        if isinstance(definition, KeywordType):
+            fields.append((definition.name, KEYWORD_WEIGHT))
+        else:
+            fields.append((getattr(definition, "name", None), SLOT_NAME_WEIGHT))
+    for text, weight in fields:
+        if text:
+            for term in set(search_terms(text)):
+                weights[term] = weights.get(term, 0.0) + weight
+    return weights
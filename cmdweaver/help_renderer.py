@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+import threading
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, TypeAlias
+
+from cmdweaver import basic_types
+
+if TYPE_CHECKING:
+    from cmdweaver.command import Command
+    from cmdweaver.registry import CommandRegistry
+
+HelpEntry: TypeAlias = tuple[str, str | None]
+GroupKey: TypeAlias = tuple[bool, str | None]
+
+DEFAULT_PAGE_SIZE = 40
+
+
+@dataclass(frozen=True)
+class HelpPage:
+    context_name: str | None
+    always: bool
+    number: int
+    total: int
+    lines: list[str]
+
+
+@dataclass(frozen=True)
+class HelpGroup:
+    context_name: str | None
+    always: bool
+    entries: tuple[HelpEntry, ...]
+    width: int
+
+    def page_count(self, page_size: int) -> int:
+        return max(1, -(-len(self.entries) // page_size))
+
+    def page(self, number: int, page_size: int = DEFAULT_PAGE_SIZE) -> HelpPage:
+        total = self.page_count(page_size)
+        if not 1 <= number <= total:
+            raise IndexError(f"page {number} out of range 1-{total}")
+        start = (number - 1) * page_size
+        return HelpPage(self.context_name, self.always, number, total, self.lines(start, start + page_size))
+
+    def pages(self, page_size: int = DEFAULT_PAGE_SIZE) -> Iterator[HelpPage]:
+        for number in range(1, self.page_count(page_size) + 1):
+            yield self.page(number, page_size)
+
+    def lines(self, start: int = 0, stop: int | None = None) -> list[str]:
+        return [f"{key:<{self.width}}  {help}" if help else key for key, help in self.entries[start:stop]]
+
+
+class HelpRenderer:
+    def __init__(self, registry: CommandRegistry, page_size: int = DEFAULT_PAGE_SIZE) -> None:
+        self.registry = registry
+        self.page_size = page_size
+        self._lock = threading.Lock()
+        self._version = 0
+        self._entries: dict[GroupKey, list[HelpEntry]] = {}
+        self._groups: dict[GroupKey, HelpGroup] = {}
+
+    def groups(self) -> list[HelpGroup]:
+        groups = self._current_groups()
+        return [groups[key] for key in sorted(groups, key=lambda key: (key[0], key[1] is not None, key[1] or ""))]
+
+    def group(self, context_name: str | None, always: bool = False) -> HelpGroup:
+        key = (always, None if always else context_name)
+        return self._current_groups().get(key) or HelpGroup(key[1], always, (), 0)
+
+    def pages(self, groups: Iterable[HelpGroup] | None = None, page_size: int | None = None) -> Iterator[HelpPage]:
+        for group in self.groups() if groups is None else groups:
+            if group.entries:
+                yield from group.pages(page_size or self.page_size)
+
+    def _current_groups(self) -> dict[GroupKey, HelpGroup]:
+        version = self.registry.version
+        if version == self._version:
+            return self._groups
+        with self._lock:
+            if version != self._version:
+                self._update(version)
+            return self._groups
+
+    def _update(self, version: int) -> None:
+        changed: set[GroupKey] = set()
+        for command in self.registry.commands()[self._version : version]:
+            key = (command.always, None if command.always else command.context_name)
+            self._entries.setdefault(key, []).append((_help_key(command), command.help))
+            changed.add(key)
+        groups = dict(self._groups)
+        for key in changed:
+            entries = self._entries[key]
+            entries.sort(key=lambda entry: entry[0])
+            groups[key] = HelpGroup(key[1], key[0], tuple(entries), max(len(name) for name, _ in entries))
+        self._groups = groups
+        self._version = version
+
+
+def _help_key(command: Command) -> str:
+    return " ".join(
+        f"<{definition.name or type(definition).__name__}>"
+        if isinstance(definition, basic_types.DynamicOptionsType)
+        else str(definition)
+        for definition in command.definitions
+    )
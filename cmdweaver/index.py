@@ -0,0 +1,197 @@
+from __future__ import annotations
+
+import heapq
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, TypeAlias
+
+from cmdweaver.command import KeywordType
+
+if TYPE_CHECKING:
+    from cmdweaver.command import Command
+    from cmdweaver.interpreter import Context
+
+IndexedCommand: TypeAlias = tuple[int, "Command"]
+
+
+@dataclass(frozen=True)
+class Abbreviation:
+    tokens: list[str]
+    ambiguous: list[Command]
+
+
+class _TrieNode:
+    __slots__ = ("children", "commands_by_arity", "_prefixes")
+
+    def __init__(self) -> None:
+        self.children: dict[str, _TrieNode] = {}
+        self.commands_by_arity: dict[int, list[IndexedCommand]] = {}
+        self._prefixes: dict[str, tuple[str, ...]] | None = None
+
+    def child(self, keyword: str) -> _TrieNode:
+        node = self.children.get(keyword)
+        if node is None:
+            node = self.children[keyword] = _TrieNode()
+            self._prefixes = None
+        return node
+
+    def keywords_starting_with(self, prefix: str) -> tuple[str, ...]:
+        prefixes = self._prefixes
+        if prefixes is None:
+            prefixes = self._prefixes = _prefix_table(self.children)
+        return prefixes.get(prefix, ())
+
+
+def _prefix_table(keywords: Iterable[str]) -> dict[str, tuple[str, ...]]:
+    table: dict[str, tuple[str, ...]] = {}
+    for keyword in keywords:
+        for end in range(1, len(keyword) + 1):
+            matches = table.get(keyword[:end], ())
+            if len(matches) < 2:
+                table[keyword[:end]] = (*matches, keyword)
+    return table
+
+
+class KeywordTrie:
+    def __init__(self) -> None:
+        self._root = _TrieNode()
+
+    @property
+    def root(self) -> _TrieNode:
+        return self._root
+
+    def add(self, sequence: int, command: Command) -> None:
+        node = self._root
+        for keyword in leading_keywords(command):
+            node = node.child(keyword)
+        node.commands_by_arity.setdefault(len(command.definitions), []).append((sequence, command))
+
+    def indexed_candidates(self, tokens: list[str]) -> Iterator[IndexedCommand]:
+        buckets = [bucket for node in self._path(tokens) if (bucket := node.commands_by_arity.get(len(tokens)))]
+        if len(buckets) == 1:
+            return iter(buckets[0])
+        return heapq.merge(*buckets)
+
+    def candidates(self, tokens: list[str]) -> list[Command]:
+        return [command for _, command in self.indexed_candidates(tokens)]
+
+    def _path(self, tokens: list[str]) -> Iterator[_TrieNode]:
+        node = self._root
+        yield node
+        for token in tokens:
+            child = node.children.get(token)
+            if child is None:
+                return
+            node = child
+            yield node
+
+
+def leading_keywords(command: Command) -> list[str]:
+    keywords: list[str] = []
+    for definition in command.definitions:
+        if not isinstance(definition, KeywordType):
+            break
+        keywords.append(definition.name)
+    return keywords
+
+
+class CommandBucket:
+    __slots__ = ("commands", "trie")
+
+    def __init__(self) -> None:
+        self.commands: list[IndexedCommand] = []
+        self.trie = KeywordTrie()
+
+    def add(self, sequence: int, command: Command) -> None:
+        self.commands.append((sequence, command))
+        self.trie.add(sequence, command)
+
+
+class ActiveCommands:
+    __slots__ = ("_buckets",)
+
+    def __init__(self, buckets: tuple[CommandBucket, ...]) -> None:
+        self._buckets = buckets
+
+    def commands(self) -> list[Command]:
+        return [command for _, command in heapq.merge(*(bucket.commands for bucket in self._buckets))]
+
+    def candidates(self, tokens: list[str]) -> list[Command]:
+        return [
+            command for _, command in heapq.merge(*(bucket.trie.indexed_candidates(tokens) for bucket in self._buckets))
+        ]
+
+    def expand_abbreviations(self, tokens: list[str]) -> Abbreviation:
+        expanded = list(tokens)
+        nodes = [bucket.trie.root for bucket in self._buckets]
+        for position, token in enumerate(tokens):
+            if any(token in node.children for node in nodes):
+                keywords = {token}
+            else:
+                keywords = {keyword for node in nodes for keyword in node.keywords_starting_with(token)}
+            if len(keywords) > 1:
+                return Abbreviation(expanded, self._abbreviated_by(expanded, position))
+            if not keywords:
+                return self._expand_trailing_keywords(expanded, position + 1)
+            keyword = expanded[position] = keywords.pop()
+            nodes = [child for node in nodes if (child := node.children.get(keyword)) is not None]
+        return Abbreviation(expanded, [])
+
+    def _expand_trailing_keywords(self, expanded: list[str], start: int) -> Abbreviation:
+        candidates = self.candidates(expanded)
+        for position in range(start, len(expanded)):
+            keywords = {
+                definition.name
+                for command in candidates
+                if isinstance(definition := command.definitions[position], KeywordType)
+            }
+            token = expanded[position]
+            if not keywords or token in keywords:
+                continue
+            matches = [keyword for keyword in keywords if keyword.startswith(token)]
+            if len(matches) > 1:
+                return Abbreviation(expanded, self._abbreviated_by(expanded, position))
+            if matches:
+                keyword = expanded[position] = matches[0]
+                candidates = [
+                    command
+                    for command in candidates
+                    if not isinstance(definition := command.definitions[position], KeywordType)
+                    or definition.name == keyword
+                ]
+        return Abbreviation(expanded, [])
+
+    def _abbreviated_by(self, expanded: list[str], position: int) -> list[Command]:
+        prefix = expanded[position]
+        return [
+            command
+            for command in self.commands()
+            if position < command.arity
+            and isinstance(definition := command.definitions[position], KeywordType)
+            and definition.name.startswith(prefix)
+            and all(keyword == expanded[index] for index, keyword in command.keyword_positions if index < position)
+        ]
+
+
+class ContextIndex:
+    def __init__(self) -> None:
+        self._always = CommandBucket()
+        self._buckets: dict[str | None, CommandBucket] = {}
+        self._views: dict[str | None, ActiveCommands] = {}
+
+    def add(self, sequence: int, command: Command) -> None:
+        bucket = self._always if command.always else self._bucket(command.context_name)
+        bucket.add(sequence, command)
+
+    def active(self, context: Context) -> ActiveCommands:
+        key = None if context.is_default() else context.context_name
+        view = self._views.get(key)
+        if view is None:
+            view = self._views.setdefault(key, ActiveCommands((self._always, self._bucket(key))))
+        return view
+
+    def _bucket(self, context_name: str | None) -> CommandBucket:
+        bucket = self._buckets.get(context_name)
+        if bucket is None:
+            bucket = self._buckets.setdefault(context_name, CommandBucket())
+        return bucket
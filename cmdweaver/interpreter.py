@@ -1,12 +1,25 @@
 from __future__ import annotations
 
+import functools
+import time
+from collections.abc import Callable, Iterator
+from concurrent.futures import Future
 from typing import TYPE_CHECKING, Any
 
-from cmdweaver import exceptions
+from cmdweaver import basic_types, exceptions
+from cmdweaver import completion as completion_module
+from cmdweaver import dispatch_cache as dispatch_cache_module
+from cmdweaver import executor as executor_module
+from cmdweaver import help_renderer as help_renderer_module
+from cmdweaver import index as index_module
+from cmdweaver import metrics as metrics_module
 from cmdweaver import parser as parser_module
+from cmdweaver import profiling as profiling_module
+from cmdweaver import registry as registry_module
+from cmdweaver import script as script_module
 
 if TYPE_CHECKING:
-    from cmdweaver.command import Command
+    from cmdweaver.command import Command, MatchResult, SlotTimer
 
 
 class Context:
@@ -38,111 +51,358 @@ class Interpreter:
         self,
         parser: parser_module.Parser | None = None,
         prompt: str = "",
+        dispatch_cache_size: int | None = None,
+        registry: registry_module.CommandRegistry | None = None,
+        command_executor: executor_module.CommandExecutor | None = None,
+        metrics: metrics_module.MetricsRegistry | None = None,
+        completion_cache_size: int | None = None,
+        abbreviations: bool = False,
     ) -> None:
-        self._commands: list[Command] = []
+        self.registry = registry if registry is not None else registry_module.CommandRegistry()
         self.parser = parser if parser is not None else parser_module.Parser()
         self.context: list[Context] = [DefaultContext(prompt)]
+        self._active_context = self.context[-1]
+        self._active = self.registry.active(self._active_context)
+        self.dispatch_cache = dispatch_cache_module.DispatchCache(dispatch_cache_size) if dispatch_cache_size else None
+        self.completion_cache = (
+            completion_module.CompletionCache(completion_cache_size) if completion_cache_size else None
+        )
+        self._serial_queue = command_executor.serial_queue() if command_executor is not None else None
+        self._profile_hooks: tuple[profiling_module.ProfileHook, ...] = ()
+        self.metrics = metrics
+        self.abbreviations = abbreviations
 
     def add_command(self, command: Command) -> None:
-        self._commands.append(command)
+        self.registry.add_command(command)
 
     def push_context(self, context_name: str, prompt: str | None = None) -> None:
         self.context.append(Context(context_name, prompt))
+        self._active_view()
 
     def pop_context(self) -> None:
         if len(self.context) == 1:
             raise exceptions.NotContextDefinedError()
         self.context.pop()
+        self._active_view()
 
     def exit(self) -> None:
         raise exceptions.EndOfProgram()
 
-    def _matching_command(self, tokens: list[str], line_text: str) -> Command:
-        matching_commands = self._select_matching_commands(tokens)
-        if len(matching_commands) == 1:
-            return matching_commands[0]
-        if len(matching_commands) > 1:
-            raise exceptions.AmbiguousCommandError(matching_commands)
+    def _matching_command(self, tokens: list[str], line_text: str) -> MatchResult:
+        context = self.actual_context()
+        profiling = bool(self._profile_hooks)
+        start = time.perf_counter() if profiling else 0.0
+        candidates = self._candidates(tokens)
+        if profiling:
+            self._emit_phase("select", line_text, start, context)
+        structural_matches: list[MatchResult] = []
+        for command in candidates:
+            on_slot = self._slot_timer(command, line_text, context) if profiling else None
+            result = command.resolve(tokens, context, on_slot)
+            if result is not None:
+                structural_matches.append(result)
+        return self._select_result(structural_matches, line_text)
+
+    def _candidates(self, tokens: list[str]) -> list[Command]:
+        active = self._active_view()
+        if self.dispatch_cache is not None:
+            self.dispatch_cache.sync(self.registry.version)
+            cached_command = self.dispatch_cache.lookup(active, tokens)
+            if self.metrics is not None:
+                self.metrics.increment(
+                    "cmdweaver_dispatch_cache_lookups_total", (("result", "miss" if cached_command is None else "hit"),)
+                )
+            if cached_command is not None:
+                return [cached_command]
+        return active.candidates(tokens)
+
+    def _slot_timer(self, command: Command, line_text: str, context: Context) -> SlotTimer:
+        def on_slot(definition: basic_types.BaseType, seconds: float) -> None:
+            event = profiling_module.PhaseEvent(
+                "validate", line_text, seconds, context, command, type(definition).__name__
+            )
+            for hook in self._profile_hooks:
+                hook(event)
+
+        return on_slot
+
+    def _select_result(self, structural_matches: list[MatchResult], line_text: str) -> MatchResult:
+        matching_results = [result for result in structural_matches if result.is_valid]
+        if len(matching_results) == 1:
+            self._remember_dispatch(matching_results[0])
+            return matching_results[0]
+        if len(matching_results) > 1:
+            raise exceptions.AmbiguousCommandError([result.command for result in matching_results])
 
-        structural_matches = self._select_structural_matches(tokens)
         if len(structural_matches) == 1:
-            command = structural_matches[0]
-            argument_errors = command.validate_arguments(tokens, self.actual_context())
-            raise exceptions.InvalidArgumentError(command, argument_errors)
+            result = structural_matches[0]
+            self._remember_dispatch(result)
+            raise exceptions.InvalidArgumentError(result.command, result.argument_errors)
         if len(structural_matches) > 1:
-            raise exceptions.AmbiguousCommandError(structural_matches)
+            raise exceptions.AmbiguousCommandError([result.command for result in structural_matches])
         raise exceptions.NoMatchingCommandFoundError(line_text)
 
+    def _remember_dispatch(self, result: MatchResult) -> None:
+        if self.dispatch_cache is not None:
+            self.dispatch_cache.store(self._active_view(), result.command)
+
     def eval_multiple(self, lines: list[str]) -> list[Any]:
         results: list[Any] = []
         for line in lines:
             results.append(self.eval(line))
         return results
 
+    def run_script(
+        self,
+        source: script_module.ScriptSource,
+        on_error: script_module.ErrorPolicy = "stop",
+        comment_prefix: str | None = "#",
+        progress: script_module.ProgressCallback | None = None,
+        progress_every: int = 1000,
+        encoding: str = "utf-8",
+    ) -> Iterator[script_module.ScriptResult]:
+        return script_module.run_script(self, source, on_error, comment_prefix, progress, progress_every, encoding)
+
+    def submit(self, line_text: str) -> Future[Any]:
+        return self._submission_queue().submit(functools.partial(self.eval, line_text))
+
+    def cancel_submitted(self) -> int:
+        return self._submission_queue().cancel_pending()
+
+    def _submission_queue(self) -> executor_module.SerialQueue:
+        if self._serial_queue is None:
+            raise exceptions.NoCommandExecutorError()
+        return self._serial_queue
+
     def parse(self, line_text: str) -> str | None:
-        _, result = self._parse(line_text)
-        return result.cmd_id if result else None
+        with basic_types.evaluation_scope():
+            result = self._parse(line_text)
+        return result.command.cmd_id if result else None
 
     def eval(self, line_text: str) -> Any:
-        tokens, matching_command = self._parse(line_text)
-        if not matching_command:
+        if self.metrics is not None:
+            return self._measured_eval(line_text, self.metrics)
+        with basic_types.evaluation_scope():
+            result = self._parse(line_text)
+        if not result:
             return None
 
-        return self._execute_command(
-            matching_command, matching_command.normalize_tokens(tokens, self.actual_context())
-        )
+        return self._run(result, line_text)
+
+    def _measured_eval(self, line_text: str, metrics: metrics_module.MetricsRegistry) -> Any:
+        start = time.perf_counter()
+        try:
+            with basic_types.evaluation_scope():
+                result = self._parse(line_text)
+        except exceptions.EvalError as error:
+            self._record_dispatch_error(metrics, error)
+            raise
+        if not result:
+            return None
+
+        try:
+            return self._run(result, line_text)
+        finally:
+            self._record_eval(metrics, result.command, start)
+
+    def _record_dispatch_error(self, metrics: metrics_module.MetricsRegistry, error: exceptions.EvalError) -> None:
+        metrics.increment("cmdweaver_dispatch_errors_total", (("error", type(error).__name__),))
+
+    def _record_eval(self, metrics: metrics_module.MetricsRegistry, command: Command, start: float) -> None:
+        labels = (("cmd_id", command.cmd_id or command.shape),)
+        metrics.observe("cmdweaver_eval_seconds", time.perf_counter() - start, labels)
+
+    def _run(self, result: MatchResult, line_text: str) -> Any:
+        if self._profile_hooks:
+            return self._profiled_execute_command(result, line_text.strip())
+        return self._execute_command(result)
+
+    def dry_run(self, line_text: str) -> Command | None:
+        with basic_types.evaluation_scope():
+            result = self._parse(line_text)
+        if not result:
+            return None
 
-    def _parse(self, line_text: str) -> tuple[list[str], Command | None]:
+        self._apply_declared_context(result.command)
+        return result.command
+
+    def _apply_declared_context(self, command: Command) -> None:
+        if command.exits_context:
+            self.pop_context()
+        if command.enters_context is not None:
+            self.push_context(command.enters_context)
+
+    def _parse(self, line_text: str) -> MatchResult | None:
         line_text = line_text.strip()
         if not line_text:
-            return [], None
+            return None
 
+        return self._dispatch(self._tokenize(line_text), line_text)
+
+    def _tokenize(self, line_text: str) -> list[str]:
+        if not self._profile_hooks:
+            return self.parser.parse(line_text)
+        start = time.perf_counter()
         tokens = self.parser.parse(line_text)
-        return tokens, self._matching_command(tokens, line_text)
+        self._emit_phase("parse", line_text, start, self.actual_context())
+        return tokens
 
-    def _execute_command(self, command: Command, tokens: list[str]) -> Any:
-        arguments = command.matching_parameters(tokens)
+    def _dispatch(self, tokens: list[str], line_text: str) -> MatchResult:
+        if not self.abbreviations:
+            return self._matching_command(tokens, line_text)
         try:
-            cmd_id = command.cmd_id
-            if cmd_id is None:
-                return command.execute(*arguments, tokens=tokens, interpreter=self)
-            else:
-                return command.execute(*arguments, tokens=tokens, interpreter=self, cmd_id=cmd_id)
+            return self._matching_command(tokens, line_text)
+        except (exceptions.NoMatchingCommandFoundError, exceptions.InvalidArgumentError) as error:
+            abbreviation = self._active_view().expand_abbreviations(tokens)
+            if abbreviation.ambiguous:
+                raise exceptions.AmbiguousCommandError(abbreviation.ambiguous) from None
+            if abbreviation.tokens == tokens:
+                raise
+            typed_error = error
+        try:
+            return self._matching_command(abbreviation.tokens, line_text)
+        except exceptions.NoMatchingCommandFoundError:
+            raise typed_error from None
+
+    def _execute_command(self, result: MatchResult) -> Any:
+        try:
+            return self._handler_call(result)()
         except KeyboardInterrupt:
             return None
 
-    def _select_matching_commands(self, tokens: list[str]) -> list[Command]:
-        return [command for command in self._commands if command.match(tokens, self.actual_context())]
+    def _profiled_execute_command(self, result: MatchResult, line_text: str) -> Any:
+        context = self.actual_context()
+        start = time.perf_counter()
+        try:
+            return self._execute_command(result)
+        finally:
+            self._emit_phase("execute", line_text, start, context, result.command)
 
-    def _select_structural_matches(self, tokens: list[str]) -> list[Command]:
-        return [
-            command for command in self._commands if command.structural_match(tokens, self.actual_context())
-        ]
+    def add_profile_hook(self, hook: profiling_module.ProfileHook) -> None:
+        self._profile_hooks = (*self._profile_hooks, hook)
+
+    def remove_profile_hook(self, hook: profiling_module.ProfileHook) -> None:
+        self._profile_hooks = tuple(registered for registered in self._profile_hooks if registered != hook)
+
+    def _emit_phase(
+        self,
+        phase: profiling_module.Phase,
+        line_text: str,
+        start: float,
+        context: Context,
+        command: Command | None = None,
+    ) -> None:
+        event = profiling_module.PhaseEvent(phase, line_text, time.perf_counter() - start, context, command)
+        for hook in self._profile_hooks:
+            hook(event)
+
+    def _handler_call(self, result: MatchResult) -> Callable[[], Any]:
+        command = result.command
+        tokens = result.tokens
+        arguments = command.matching_parameters(tokens)
+        cmd_id = command.cmd_id
+        if cmd_id is None:
+            return functools.partial(command.execute, *arguments, tokens=tokens, interpreter=self)
+        return functools.partial(command.execute, *arguments, tokens=tokens, interpreter=self, cmd_id=cmd_id)
 
     def actual_context(self) -> Context:
         return self.context[-1]
 
+    def _active_view(self) -> index_module.ActiveCommands:
+        context = self.actual_context()
+        if context is not self._active_context:
+            self._active_context = context
+            self._active = self.registry.active(context)
+        return self._active
+
     def active_commands(self) -> list[Command]:
-        return [command for command in self._commands if command.context_match(self.actual_context())]
+        return self._active_view().commands()
+
+    def candidates_for(self, tokens: list[str]) -> list[Command]:
+        active = self._active_view()
+        candidates = active.candidates(tokens)
+        if not self.abbreviations:
+            return candidates
+        expanded = active.expand_abbreviations(tokens).tokens
+        if expanded == tokens:
+            return candidates
+        seen = {id(command) for command in candidates}
+        return candidates + [command for command in active.candidates(expanded) if id(command) not in seen]
 
     def _partial_match(self, line_text: str) -> list[Command]:
         tokens = self.parser.parse(line_text)
-        return [command for command in self.active_commands() if command.partial_match(tokens, self.actual_context())]
+        context = self.actual_context()
+        return [command for command in self.active_commands() if command.partial_match(tokens, context)]
 
     def help(self, line_text: str) -> dict[Command, str | None]:
-        return {command: command.help for command in self._partial_match(line_text)}
+        with basic_types.evaluation_scope():
+            return {command: command.help for command in self._partial_match(line_text)}
+
+    def apropos(self, query: str, limit: int | None = None) -> dict[Command, str | None]:
+        return {command: command.help for command, _ in self.registry.search(query, limit)}
 
     def all_commands_help(self) -> dict[Command, str | None]:
-        return {command: command.help for command in self._commands}
+        return {command: command.help for command in self.registry.commands()}
+
+    def help_pages(self, page_size: int | None = None) -> Iterator[help_renderer_module.HelpPage]:
+        context = self.actual_context()
+        renderer = self.help_renderer
+        groups = [
+            renderer.group(None if context.is_default() else context.context_name),
+            renderer.group(None, always=True),
+        ]
+        return renderer.pages(groups, page_size)
 
     def complete(self, line_to_complete: str) -> set[str]:
-        completions: set[str] = set()
-        tokens = self.parser.parse(line_to_complete)
+        if self.metrics is None:
+            return self._complete(line_to_complete)
+        start = time.perf_counter()
+        try:
+            return self._complete(line_to_complete)
+        finally:
+            self.metrics.observe("cmdweaver_complete_seconds", time.perf_counter() - start)
 
-        for command in self._partial_match(line_to_complete):
-            completions.update(command.complete(tokens, self.actual_context()))
+    def _complete(self, line_to_complete: str) -> set[str]:
+        tokens = self.parser.parse(line_to_complete)
+        context = self.actual_context()
+        cache = self.completion_cache
+        if cache is not None:
+            cache.sync(self.registry.version, context)
+            cached = cache.lookup(tokens)
+            if self.metrics is not None:
+                self.metrics.increment(
+                    "cmdweaver_completion_cache_lookups_total", (("result", "miss" if cached is None else "hit"),)
+                )
+            if cached is not None:
+                return cached
+
+        commands = self.active_commands()
+        with basic_types.evaluation_scope():
+            candidates = [command for command in commands if command.partial_match(tokens, context)]
+            completions = completion_module.collect_completions(candidates, tokens, context)
+        if cache is not None:
+            cache.store(tokens, completions, commands)
         return completions
 
+    def complete_limited(self, line_to_complete: str, limit: int) -> completion_module.LimitedCompletions:
+        tokens = self.parser.parse(line_to_complete)
+        context = self.actual_context()
+
+        with basic_types.evaluation_scope():
+            candidates = [command for command in self.active_commands() if command.partial_match(tokens, context)]
+            return completion_module.collect_limited_completions(candidates, tokens, context, limit)
+
+    def completion_session(self) -> completion_module.CompletionSession:
+        return completion_module.CompletionSession(self)
+
+    @property
+    def commands_version(self) -> int:
+        return self.registry.version
+
+    @property
+    def help_renderer(self) -> help_renderer_module.HelpRenderer:
+        return self.registry.help_renderer
+
     @property
     def prompt(self) -> str:
         return self.actual_context().prompt
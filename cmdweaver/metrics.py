@@ -0,0 +1,222 @@
+from __future__ import annotations
+
+import bisect
+import itertools
+import os
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, TypeAlias
+
+Labels: TypeAlias = tuple[tuple[str, str], ...]
+MetricKey: TypeAlias = tuple[str, Labels]
+
+DEFAULT_BUCKETS: tuple[float, ...] = (
+    0.00001,
+    0.000025,
+    0.00005,
+    0.0001,
+    0.00025,
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+BUILTIN_HELP = {
+    "cmdweaver_eval_seconds": "Time spent in Interpreter.eval, by command",
+    "cmdweaver_complete_seconds": "Time spent in Interpreter.complete",
+    "cmdweaver_dispatch_errors_total": "Lines rejected by dispatch, by error type",
+    "cmdweaver_dispatch_cache_lookups_total": "Dispatch cache lookups, by result",
+    "cmdweaver_completion_cache_lookups_total": "Completion cache lookups, by result",
+}
+
+
+class _Histogram:
+    __slots__ = ("counts", "total")
+
+    def __init__(self, size: int) -> None:
+        self.counts = [0] * size
+        self.total = 0.0
+
+
+class _Shard:
+    __slots__ = ("counters", "histograms")
+
+    def __init__(self) -> None:
+        self.counters: dict[MetricKey, float] = {}
+        self.histograms: dict[MetricKey, _Histogram] = {}
+
+
+class MetricsRegistry:
+    def __init__(self, buckets: tuple[float, ...] = DEFAULT_BUCKETS) -> None:
+        self.buckets = tuple(sorted(buckets))
+        self._help = dict(BUILTIN_HELP)
+        self._local = threading.local()
+        self._shards: list[_Shard] = []
+        self._lock = threading.Lock()
+
+    def describe(self, name: str, help: str) -> None:
+        self._help[name] = help
+
+    def increment(self, name: str, labels: Labels = (), amount: float = 1) -> None:
+        counters = self._shard().counters
+        key = (name, labels)
+        counters[key] = counters.get(key, 0) + amount
+
+    def observe(self, name: str, value: float, labels: Labels = ()) -> None:
+        histograms = self._shard().histograms
+        key = (name, labels)
+        histogram = histograms.get(key)
+        if histogram is None:
+            histogram = histograms[key] = _Histogram(len(self.buckets) + 1)
+        histogram.counts[bisect.bisect_left(self.buckets, value)] += 1
+        histogram.total += value
+
+    def _shard(self) -> _Shard:
+        shard: _Shard | None = getattr(self._local, "shard", None)
+        if shard is None:
+            shard = self._local.shard = _Shard()
+            with self._lock:
+                self._shards.append(shard)
+        return shard
+
+    def counters(self) -> dict[MetricKey, float]:
+        totals: dict[MetricKey, float] = {}
+        for shard in self._snapshot_shards():
+            for key, value in list(shard.counters.items()):
+                totals[key] = totals.get(key, 0) + value
+        return totals
+
+    def histograms(self) -> dict[MetricKey, tuple[list[int], float]]:
+        totals: dict[MetricKey, tuple[list[int], float]] = {}
+        for shard in self._snapshot_shards():
+            for key, histogram in list(shard.histograms.items()):
+                counts, total = totals.get(key, ([0] * (len(self.buckets) + 1), 0.0))
+                totals[key] = (
+                    [a + b for a, b in zip(counts, list(histogram.counts), strict=True)],
+                    total + histogram.total,
+                )
+        return totals
+
+    def _snapshot_shards(self) -> list[_Shard]:
+        with self._lock:
+            return list(self._shards)
+
+    def snapshot(self) -> dict[str, Any]:
+        histograms: dict[str, Any] = {}
+        for (name, labels), (counts, total) in sorted(self.histograms().items()):
+            histograms[_series(name, labels)] = {
+                "count": sum(counts),
+                "sum": total,
+                "buckets": dict(
+                    zip([*map(_format_bound, self.buckets), "+Inf"], itertools.accumulate(counts), strict=True)
+                ),
+            }
+        return {
+            "counters": {_series(name, labels): value for (name, labels), value in sorted(self.counters().items())},
+            "histograms": histograms,
+            "dispatch_cache_hit_rate": self.dispatch_cache_hit_rate(),
+        }
+
+    def dispatch_cache_hit_rate(self) -> float:
+        counters = self.counters()
+        hits = counters.get(("cmdweaver_dispatch_cache_lookups_total", (("result", "hit"),)), 0)
+        misses = counters.get(("cmdweaver_dispatch_cache_lookups_total", (("result", "miss"),)), 0)
+        return hits / (hits + misses) if hits + misses else 0.0
+
+    def prometheus_text(self) -> str:
+        lines: list[str] = []
+        described: set[str] = set()
+        for (name, labels), value in sorted(self.counters().items()):
+            self._describe_family(lines, described, name, "counter")
+            lines.append(f"{_series(name, labels)} {_format_value(value)}")
+        for (name, labels), (counts, total) in sorted(self.histograms().items()):
+            self._describe_family(lines, described, name, "histogram")
+            bounds = [*map(_format_bound, self.buckets), "+Inf"]
+            for bound, count in zip(bounds, itertools.accumulate(counts), strict=True):
+                lines.append(f"{_series(name + '_bucket', (*labels, ('le', bound)))} {count}")
+            lines.append(f"{_series(name + '_sum', labels)} {_format_value(total)}")
+            lines.append(f"{_series(name + '_count', labels)} {sum(counts)}")
+        return "\n".join(lines) + "\n" if lines else ""
+
+    def _describe_family(self, lines: list[str], described: set[str], name: str, kind: str) -> None:
+        if name in described:
+            return
+        described.add(name)
+        if name in self._help:
+            lines.append(f"# HELP {name} {self._help[name]}")
+        lines.append(f"# TYPE {name} {kind}")
+
+    def write_prometheus(self, path: str | os.PathLike[str]) -> None:
+        directory = os.path.dirname(os.fspath(path)) or "."
+        with tempfile.NamedTemporaryFile("w", dir=directory, delete=False, encoding="utf-8") as output:
+            output.write(self.prometheus_text())
+        os.replace(output.name, path)
+
+    def serve(self, host: str = "127.0.0.1", port: int = 0) -> MetricsServer:
+        return MetricsServer(self, host, port)
+
+
+class MetricsServer:
+    def __init__(self, registry: MetricsRegistry, host: str, port: int) -> None:
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:
+                body = registry.prometheus_text().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format: str, *args: Any) -> None:
+                pass
+
+        self._server = ThreadingHTTPServer((host, port), Handler)
+        self._thread = threading.Thread(target=self._server.serve_forever, name="cmdweaver-metrics", daemon=True)
+        self._thread.start()
+
+    @property
+    def address(self) -> tuple[str, int]:
+        host, port = self._server.server_address[:2]
+        return str(host), int(port)
+
+    def close(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+        self._thread.join()
+
+    def __enter__(self) -> MetricsServer:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+
+def _series(name: str, labels: Labels) -> str:
+    if not labels:
+        return name
+    rendered = ",".join(f'{label}="{_escape(value)}"' for label, value in labels)
+    return f"{name}{{{rendered}}}"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_bound(bound: float) -> str:
+    return repr(float(bound))
+
+
+def _format_value(value: float) -> str:
+    return repr(float(value)) if isinstance(value, float) else str(value)
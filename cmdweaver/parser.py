@@ -1,9 +1,54 @@
+import re
 import shlex
 
+_NEEDS_LEXER = re.compile("[\"'\\\\\x0b\x0c\x1c-\x1f\x85\xa0\u1680\u2000-\u200a\u2028\u2029\u202f\u205f\u3000]")
+_LEXEME = re.compile(
+    r"""
+    (?P<space>[ \t\r\n]+)
+    | (?P<word>[^ \t\r\n'"\\]+)
+    | '(?P<single>[^']*)'
+    | "(?P<double>(?:[^"\\]|\\[\s\S])*)"
+    | \\(?P<escaped>[\s\S])
+    """,
+    re.VERBOSE,
+)
+_DOUBLE_QUOTED_ESCAPE = re.compile(r'\\([\\"])')
+
 
 class Parser:
     def parse(self, input_line: str) -> list[str]:
-        tokens = shlex.split(input_line)
+        tokens = tokenize(input_line)
         if input_line.endswith(" "):
             tokens.append("")
         return tokens
+
+
+def tokenize(line: str) -> list[str]:
+    if _NEEDS_LEXER.search(line) is None:
+        return line.split()
+    return _lex(line)
+
+
+def _lex(line: str) -> list[str]:
+    tokens: list[str] = []
+    parts: list[str] = []
+    in_token = False
+    position = 0
+    while position < len(line):
+        lexeme = _LEXEME.match(line, position)
+        if lexeme is None:
+            return shlex.split(line)
+        kind = lexeme.lastgroup
+        if kind == "space":
+            if in_token:
+                tokens.append("".join(parts))
+                parts = []
+                in_token = False
+        else:
+            in_token = True
+            text = lexeme.group(kind)  # type: ignore[arg-type]
+            parts.append(_DOUBLE_QUOTED_ESCAPE.sub(r"\1", text) if kind == "double" else text)
+        position = lexeme.end()
+    if in_token:
+        tokens.append("".join(parts))
+    return tokens
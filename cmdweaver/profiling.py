@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+import sys
+import threading
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Literal, TextIO, TypeAlias
+
+if TYPE_CHECKING:
+    from cmdweaver.command import Command
+    from cmdweaver.interpreter import Context
+
+Phase: TypeAlias = Literal["parse", "select", "validate", "execute"]
+
+
+@dataclass(frozen=True)
+class PhaseEvent:
+    phase: Phase
+    line: str
+    seconds: float
+    context: Context
+    command: Command | None = None
+    slot_type: str | None = None
+
+
+ProfileHook: TypeAlias = Callable[[PhaseEvent], None]
+
+
+@dataclass
+class TimingStats:
+    name: str
+    calls: int = 0
+    total: float = 0.0
+    slowest: float = 0.0
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.calls if self.calls else 0.0
+
+    def add(self, seconds: float) -> None:
+        self.calls += 1
+        self.total += seconds
+        self.slowest = max(self.slowest, seconds)
+
+
+class ProfileCollector:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._phases: dict[str, TimingStats] = {}
+        self._commands: dict[str, TimingStats] = {}
+        self._types: dict[str, TimingStats] = {}
+
+    def __call__(self, event: PhaseEvent) -> None:
+        with self._lock:
+            _stats(self._phases, event.phase).add(event.seconds)
+            if event.command is not None:
+                _stats(self._commands, f"{event.phase}: {event.command}").add(event.seconds)
+            if event.slot_type is not None:
+                _stats(self._types, event.slot_type).add(event.seconds)
+
+    def phases(self) -> list[TimingStats]:
+        return self._sorted(self._phases)
+
+    def commands(self, limit: int | None = None) -> list[TimingStats]:
+        return self._sorted(self._commands)[:limit]
+
+    def types(self, limit: int | None = None) -> list[TimingStats]:
+        return self._sorted(self._types)[:limit]
+
+    def reset(self) -> None:
+        with self._lock:
+            self._phases.clear()
+            self._commands.clear()
+            self._types.clear()
+
+    def report(self, limit: int = 10, file: TextIO | None = None) -> None:
+        output = file if file is not None else sys.stdout
+        for title, entries in (
+            ("phase", self.phases()),
+            ("command", self.commands(limit)),
+            ("type", self.types(limit)),
+        ):
+            print(f"{title:<48} {'calls':>8} {'total ms':>10} {'mean us':>10} {'max us':>10}", file=output)
+            for entry in entries:
+                print(
+                    f"{entry.name[:48]:<48} {entry.calls:>8} {entry.total * 1e3:>10.3f} "
+                    f"{entry.mean * 1e6:>10.1f} {entry.slowest * 1e6:>10.1f}",
+                    file=output,
+                )
+            print(file=output)
+
+    def _sorted(self, stats: dict[str, TimingStats]) -> list[TimingStats]:
+        with self._lock:
+            entries = [TimingStats(entry.name, entry.calls, entry.total, entry.slowest) for entry in stats.values()]
+        return sorted(entries, key=lambda entry: entry.total, reverse=True)
+
+
+def _stats(stats: dict[str, TimingStats], name: str) -> TimingStats:
+    entry = stats.get(name)
+    if entry is None:
+        entry = stats[name] = TimingStats(name)
+    return entry
@@ -0,0 +1,37 @@
+from __future__ import annotations
+
+import importlib
+import sys
+from collections.abc import Callable
+from typing import Any
+
+
+def check_reference(reference: str) -> str:
+    module_name, separator, attribute_path = reference.partition(":")
+    if not separator or not module_name or not attribute_path:
+        raise ValueError(f"reference must look like 'package.module:function', got {reference!r}")
+    return reference
+
+
+def resolve_reference(reference: str) -> Callable[..., Any]:
+    module_name, _, attribute_path = check_reference(reference).partition(":")
+    target: Any = importlib.import_module(module_name)
+    for attribute in attribute_path.split("."):
+        try:
+            target = getattr(target, attribute)
+        except AttributeError as error:
+            raise ImportError(f"cannot import {attribute_path!r} from {module_name!r}", name=module_name) from error
+    if not callable(target):
+        raise TypeError(f"{reference!r} does not reference a callable")
+    return target  # type: ignore[no-any-return]
+
+
+def reference_for(target: Any) -> str | None:
+    module_name = getattr(target, "__module__", None)
+    attribute_path = getattr(target, "__qualname__", None)
+    if not isinstance(module_name, str) or not isinstance(attribute_path, str) or "<" in attribute_path:
+        return None
+    found: Any = sys.modules.get(module_name)
+    for attribute in attribute_path.split("."):
+        found = getattr(found, attribute, None)
+    return f"{module_name}:{attribute_path}" if found is target else None
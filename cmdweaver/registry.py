@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+import threading
+from collections.abc import Iterable
+from typing import TYPE_CHECKING, Any
+
+from cmdweaver import exceptions
+from cmdweaver import help_index as help_index_module
+from cmdweaver import help_renderer as help_renderer_module
+from cmdweaver import index as index_module
+
+if TYPE_CHECKING:
+    from cmdweaver.command import Command
+    from cmdweaver.interpreter import Context
+
+
+class CommandRegistry:
+    def __init__(self, commands: Iterable[Command] = ()) -> None:
+        self._commands: list[Command] = []
+        self._index = index_module.ContextIndex()
+        self._help_index = help_index_module.HelpIndex()
+        self._help_renderer: help_renderer_module.HelpRenderer | None = None
+        self._lock = threading.Lock()
+        self._frozen = False
+        for command in commands:
+            self.add_command(command)
+
+    def add_command(self, command: Command) -> None:
+        with self._lock:
+            if self._frozen:
+                raise exceptions.RegistryFrozenError(command)
+            self._index.add(len(self._commands), command)
+            self._help_index.add(command)
+            self._commands.append(command)
+
+    def freeze(self) -> CommandRegistry:
+        self._frozen = True
+        return self
+
+    @property
+    def frozen(self) -> bool:
+        return self._frozen
+
+    @property
+    def version(self) -> int:
+        return len(self._commands)
+
+    def commands(self) -> list[Command]:
+        return list(self._commands)
+
+    def active(self, context: Context) -> index_module.ActiveCommands:
+        return self._index.active(context)
+
+    def search(self, query: str, limit: int | None = None) -> list[tuple[Command, float]]:
+        with self._lock:
+            return self._help_index.search(query, limit)
+
+    @property
+    def help_renderer(self) -> help_renderer_module.HelpRenderer:
+        with self._lock:
+            if self._help_renderer is None:
+                self._help_renderer = help_renderer_module.HelpRenderer(self)
+            return self._help_renderer
+
+    def __len__(self) -> int:
+        return len(self._commands)
+
+    def __getstate__(self) -> dict[str, Any]:
+        state = dict(self.__dict__)
+        del state["_lock"]
+        del state["_help_renderer"]
+        return state
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self._help_renderer = None
+        self._lock = threading.Lock()
@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+import contextlib
+import gc
+import hashlib
+import os
+import pickle
+import sys
+import tempfile
+from collections.abc import Callable
+from typing import Any, BinaryIO
+
+from cmdweaver import __version__
+from cmdweaver.registry import CommandRegistry
+
+CACHE_FORMAT = 2
+_MAGIC = b"cmdweaver-registry-cache\n"
+
+
+def definitions_hash(*sources: str | os.PathLike[str] | bytes) -> str:
+    digest = hashlib.sha256()
+    for source in sources:
+        content = source if isinstance(source, bytes) else _read(source)
+        digest.update(len(content).to_bytes(8, "big"))
+        digest.update(content)
+    return digest.hexdigest()
+
+
+def _read(path: str | os.PathLike[str]) -> bytes:
+    with open(path, "rb") as source_file:
+        return source_file.read()
+
+
+def _header(source_hash: str) -> dict[str, Any]:
+    return {
+        "format": CACHE_FORMAT,
+        "cmdweaver": __version__,
+        "python": sys.version_info[:2],
+        "source_hash": source_hash,
+    }
+
+
+def default_path(name: str) -> str:
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    if sys.platform == "win32":
+        base = os.environ.get("LOCALAPPDATA") or base
+    return os.path.join(base, "cmdweaver", f"{name}.cache")
+
+
+def save(registry: CommandRegistry, path: str | os.PathLike[str], source_hash: str) -> None:
+    payload = pickle.dumps(registry, protocol=pickle.HIGHEST_PROTOCOL)
+    path = os.path.expanduser(path)
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, mode=0o700, exist_ok=True)
+    with tempfile.NamedTemporaryFile("wb", dir=directory, delete=False) as cache_file:
+        try:
+            cache_file.write(_MAGIC)
+            pickle.dump(_header(source_hash), cache_file, protocol=pickle.HIGHEST_PROTOCOL)
+            cache_file.write(payload)
+        except BaseException:
+            cache_file.close()
+            os.unlink(cache_file.name)
+            raise
+    os.replace(cache_file.name, path)
+
+
+def load(path: str | os.PathLike[str], source_hash: str) -> CommandRegistry | None:
+    try:
+        with open(os.path.expanduser(path), "rb") as cache_file:
+            if not _is_trusted(cache_file) or cache_file.read(len(_MAGIC)) != _MAGIC:
+                return None
+            if pickle.load(cache_file) != _header(source_hash):
+                return None
+            registry = _load_without_gc(cache_file)
+    except Exception:
+        return None
+    return registry if isinstance(registry, CommandRegistry) else None
+
+
+def _is_trusted(cache_file: BinaryIO) -> bool:
+    if not hasattr(os, "getuid"):
+        return True
+    status = os.fstat(cache_file.fileno())
+    return status.st_uid == os.getuid() and not status.st_mode & 0o022
+
+
+def _load_without_gc(cache_file: BinaryIO) -> Any:
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        return pickle.load(cache_file)
+    finally:
+        if enabled:
+            gc.enable()
+
+
+def load_or_build(
+    path: str | os.PathLike[str], source_hash: str, build: Callable[[], CommandRegistry]
+) -> CommandRegistry:
+    registry = load(path, source_hash)
+    if registry is not None:
+        return registry
+    registry = build()
+    with contextlib.suppress(OSError, pickle.PicklingError, AttributeError, TypeError):
+        save(registry, path, source_hash)
+    return registry
@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+import mmap
+import os
+from collections.abc import Callable, Iterable, Iterator
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Literal, TypeAlias
+
+from cmdweaver import exceptions
+
+if TYPE_CHECKING:
+    from cmdweaver.interpreter import Interpreter
+
+ErrorPolicy: TypeAlias = Literal["stop", "skip", "collect"]
+ScriptSource: TypeAlias = str | os.PathLike[str] | Iterable[str]
+
+ERROR_POLICIES: tuple[ErrorPolicy, ...] = ("stop", "skip", "collect")
+
+
+@dataclass(frozen=True)
+class ScriptResult:
+    line_number: int
+    line: str
+    result: Any = None
+    error: Exception | None = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+@dataclass(frozen=True)
+class ScriptProgress:
+    lines: int
+    evaluated: int
+    errors: int
+    position: int | None
+    size: int | None
+
+
+ProgressCallback: TypeAlias = Callable[[ScriptProgress], None]
+
+
+def run_script(
+    interpreter: Interpreter,
+    source: ScriptSource,
+    on_error: ErrorPolicy = "stop",
+    comment_prefix: str | None = "#",
+    progress: ProgressCallback | None = None,
+    progress_every: int = 1000,
+    encoding: str = "utf-8",
+) -> Iterator[ScriptResult]:
+    if on_error not in ERROR_POLICIES:
+        raise ValueError(f"on_error must be one of {ERROR_POLICIES}, got {on_error!r}")
+    if progress_every < 1:
+        raise ValueError(f"progress_every must be positive, got {progress_every!r}")
+    if isinstance(source, (str, os.PathLike)):
+        return _run_file(interpreter, source, on_error, comment_prefix, progress, progress_every, encoding)
+    return _run_lines(interpreter, _unpositioned(source), on_error, comment_prefix, progress, progress_every, None)
+
+
+def _run_file(
+    interpreter: Interpreter,
+    path: str | os.PathLike[str],
+    on_error: ErrorPolicy,
+    comment_prefix: str | None,
+    progress: ProgressCallback | None,
+    progress_every: int,
+    encoding: str,
+) -> Iterator[ScriptResult]:
+    size = os.stat(path).st_size
+    lines = read_lines(path, encoding)
+    yield from _run_lines(interpreter, lines, on_error, comment_prefix, progress, progress_every, size)
+
+
+def read_lines(path: str | os.PathLike[str], encoding: str = "utf-8") -> Iterator[tuple[str, int]]:
+    with open(path, "rb") as script_file:
+        if os.fstat(script_file.fileno()).st_size == 0:
+            return
+        with mmap.mmap(script_file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            for raw_line in iter(mapped.readline, b""):
+                yield raw_line.decode(encoding), mapped.tell()
+
+
+def is_blank_or_comment(line: str, comment_prefix: str | None) -> bool:
+    stripped = line.strip()
+    return not stripped or bool(comment_prefix and stripped.startswith(comment_prefix))
+
+
+def _unpositioned(lines: Iterable[str]) -> Iterator[tuple[str, None]]:
+    for line in lines:
+        yield line, None
+
+
+def _run_lines(
+    interpreter: Interpreter,
+    lines: Iterable[tuple[str, int | None]],
+    on_error: ErrorPolicy,
+    comment_prefix: str | None,
+    progress: ProgressCallback | None,
+    progress_every: int,
+    size: int | None,
+) -> Iterator[ScriptResult]:
+    line_number = evaluated = errors = 0
+    position: int | None = None
+    try:
+        for raw_line, next_position in lines:
+            if progress is not None and line_number and line_number % progress_every == 0:
+                progress(ScriptProgress(line_number, evaluated, errors, position, size))
+            line_number += 1
+            position = next_position
+            line = raw_line.rstrip("\r\n")
+            if is_blank_or_comment(line, comment_prefix):
+                continue
+            evaluated += 1
+            try:
+                result = interpreter.eval(line)
+            except exceptions.EndOfProgram:
+                return
+            except Exception as error:
+                errors += 1
+                if on_error == "stop":
+                    raise exceptions.ScriptError(line_number, line, error) from error
+                if on_error == "collect":
+                    yield ScriptResult(line_number, line, error=error)
+                continue
+            yield ScriptResult(line_number, line, result)
+    finally:
+        if progress is not None:
+            progress(ScriptProgress(line_number, evaluated, errors, position, size))
@@ -0,0 +1,310 @@
+from __future__ import annotations
+
+import json
+import os
+import re
+import tomllib
+from collections import defaultdict
+from collections.abc import Callable, Iterator, Mapping
+from dataclasses import dataclass
+from itertools import combinations
+from typing import Any, TypeAlias
+
+from cmdweaver import basic_types, exceptions
+from cmdweaver.command import Command, KeywordType
+from cmdweaver.interpreter import DefaultContext
+from cmdweaver.references import check_reference, resolve_reference
+from cmdweaver.registry import CommandRegistry
+
+SlotBuilder: TypeAlias = Callable[[dict[str, Any]], Any]
+
+_NO_CONTEXT = DefaultContext()
+
+_COMMAND_FIELDS: dict[str, type] = {
+    "keywords": list,
+    "handler": str,
+    "help": str,
+    "context_name": str,
+    "always": bool,
+    "cmd_id": str,
+    "enters_context": str,
+    "exits_context": bool,
+}
+
+
+def _dynamic_options(fields: dict[str, Any]) -> basic_types.DynamicOptionsType:
+    provider = fields.pop("provider")
+    return basic_types.DynamicOptionsType(check_reference(provider), **fields)
+
+
+def _or_type(fields: dict[str, Any]) -> basic_types.OrType:
+    return basic_types.OrType(*fields.pop("types"), **fields)
+
+
+_SLOT_FIELDS: dict[str, type | tuple[type, ...]] = {
+    "name": str,
+    "options": list,
+    "provider": str,
+    "regex": str,
+    "min": int,
+    "max": int,
+    "cache_ttl": (int, float),
+    "cache_max_size": int,
+    "types": list,
+}
+
+_SLOT_TYPES: dict[str, tuple[SlotBuilder, frozenset[str], frozenset[str]]] = {
+    "string": (lambda fields: basic_types.StringType(**fields), frozenset(), frozenset({"name"})),
+    "integer": (lambda fields: basic_types.IntegerType(**fields), frozenset(), frozenset({"min", "max", "name"})),
+    "options": (
+        lambda fields: basic_types.OptionsType(fields.pop("options"), **fields),
+        frozenset({"options"}),
+        frozenset({"name"}),
+    ),
+    "dynamic_options": (
+        _dynamic_options,
+        frozenset({"provider"}),
+        frozenset({"name", "cache_ttl", "cache_max_size"}),
+    ),
+    "regex": (lambda fields: basic_types.RegexType(**fields), frozenset({"regex"}), frozenset({"name"})),
+    "bool": (lambda fields: basic_types.BoolType(**fields), frozenset(), frozenset({"name"})),
+    "or": (_or_type, frozenset({"types"}), frozenset({"name"})),
+}
+
+
+@dataclass(frozen=True)
+class _Entry:
+    index: int
+    location: str
+    command: Command
+    shape: str
+
+
+def load_spec(path: str | os.PathLike[str], check_ambiguity: bool = True) -> CommandRegistry:
+    with open(path, "rb") as spec_file:
+        content = spec_file.read()
+    is_json = os.fspath(path).endswith(".json")
+    spec = json.loads(content) if is_json else tomllib.loads(content.decode("utf-8"))
+    return build_registry(spec, check_ambiguity=check_ambiguity)
+
+
+def build_registry(spec: Mapping[str, Any], check_ambiguity: bool = True) -> CommandRegistry:
+    problems: list[str] = []
+    entries = list(_build_entries(spec, problems))
+    problems.extend(_duplicate_cmd_ids(entries))
+    if check_ambiguity:
+        problems.extend(_overlapping_shapes(entries))
+    if problems:
+        raise exceptions.SpecError(problems)
+    return CommandRegistry(entry.command for entry in entries)
+
+
+def _build_entries(spec: Mapping[str, Any], problems: list[str]) -> Iterator[_Entry]:
+    commands = spec.get("commands") if isinstance(spec, Mapping) else None
+    if not isinstance(commands, list):
+        problems.append("spec must have a 'commands' list")
+        return
+    for position, definition in enumerate(commands):
+        location = f"commands[{position}]"
+        if not isinstance(definition, Mapping):
+            problems.append(f"{location}: must be a table")
+            continue
+        entry = _build_entry(position, location, definition, problems)
+        if entry is not None:
+            yield entry
+
+
+def _build_entry(position: int, location: str, definition: Mapping[str, Any], problems: list[str]) -> _Entry | None:
+    reported = len(problems)
+    for field in definition.keys() - _COMMAND_FIELDS.keys():
+        problems.append(f"{location}: unknown field {field!r}")
+    for field, expected in _COMMAND_FIELDS.items():
+        if field in definition and not isinstance(definition[field], expected):
+            problems.append(f"{location}.{field}: expected {expected.__name__}")
+    keywords: list[Any] = definition.get("keywords") or []
+    if not keywords:
+        problems.append(f"{location}.keywords: must be a non-empty list")
+    if len(problems) > reported:
+        return None
+
+    slots = [_build_slot(f"{location}.keywords[{index}]", slot, problems) for index, slot in enumerate(keywords)]
+    handler = definition.get("handler")
+    if handler is not None:
+        try:
+            check_reference(handler)
+        except ValueError as error:
+            problems.append(f"{location}.handler: {error}")
+    if len(problems) > reported:
+        return None
+
+    command = Command(
+        slots,
+        handler,
+        help=definition.get("help"),
+        context_name=definition.get("context_name"),
+        always=definition.get("always", False),
+        cmd_id=definition.get("cmd_id"),
+        enters_context=definition.get("enters_context"),
+        exits_context=definition.get("exits_context", False),
+    )
+    return _Entry(position, location, command, json.dumps(keywords, sort_keys=True))
+
+
+def _build_slot(location: str, slot: Any, problems: list[str]) -> Any:
+    if isinstance(slot, str):
+        if slot.split() != [slot]:
+            problems.append(f"{location}: keyword {slot!r} must be a single non-empty word")
+        return slot
+    if not isinstance(slot, Mapping) or not isinstance(slot.get("type"), str):
+        problems.append(f"{location}: must be a keyword string or a table with a 'type'")
+        return None
+
+    fields = {field: value for field, value in slot.items() if field != "type"}
+    type_name = slot["type"]
+    if type_name in _SLOT_TYPES:
+        builder, required, optional = _SLOT_TYPES[type_name]
+        missing = required - fields.keys()
+        unknown = fields.keys() - required - optional
+        if missing or unknown:
+            for field in sorted(missing):
+                problems.append(f"{location}: {type_name!r} slot requires {field!r}")
+            for field in sorted(unknown):
+                problems.append(f"{location}: unknown field {field!r} for {type_name!r} slot")
+            return None
+        for field, value in fields.items():
+            if not isinstance(value, _SLOT_FIELDS[field]) or isinstance(value, bool):
+                problems.append(f"{location}.{field}: invalid value {value!r}")
+                return None
+        if type_name == "options" and not all(isinstance(option, str) for option in fields["options"]):
+            problems.append(f"{location}.options: must be a list of strings")
+            return None
+        if type_name == "or":
+            reported = len(problems)
+            members = []
+            for index, member in enumerate(fields["types"]):
+                if not isinstance(member, Mapping) or not isinstance(member.get("type"), str):
+                    problems.append(f"{location}.types[{index}]: must be a table with a 'type'")
+                else:
+                    members.append(_build_slot(f"{location}.types[{index}]", member, problems))
+            if len(problems) > reported:
+                return None
+            fields["types"] = members
+    elif ":" in type_name:
+        builder = _custom_type(type_name)
+    else:
+        problems.append(f"{location}: unknown type {type_name!r}")
+        return None
+
+    try:
+        return builder(fields)
+    except (TypeError, ValueError, ImportError, re.error) as error:
+        problems.append(f"{location}: invalid {type_name!r} slot: {error}")
+        return None
+
+
+def _custom_type(reference: str) -> SlotBuilder:
+    def build(fields: dict[str, Any]) -> Any:
+        slot_type = resolve_reference(reference)(**fields)
+        if not isinstance(slot_type, (basic_types.BaseType, basic_types.OrType)):
+            raise TypeError(f"{reference!r} did not build a BaseType")
+        return slot_type
+
+    return build
+
+
+def _duplicate_cmd_ids(entries: list[_Entry]) -> Iterator[str]:
+    seen: dict[str, str] = {}
+    for entry in entries:
+        cmd_id = entry.command.cmd_id
+        if cmd_id is None:
+            continue
+        if cmd_id in seen:
+            yield f"{entry.location}: cmd_id {cmd_id!r} is already used by {seen[cmd_id]}"
+        else:
+            seen[cmd_id] = entry.location
+
+
+def _overlapping_shapes(entries: list[_Entry]) -> Iterator[str]:
+    always = [entry for entry in entries if entry.command.always]
+    scopes: dict[tuple[int, str | None], list[_Entry]] = defaultdict(list)
+    for entry in entries:
+        if not entry.command.always:
+            scopes[(entry.command.arity, entry.command.context_name)].append(entry)
+    arities = {entry.command.arity for entry in always}
+    for arity in arities - {arity for arity, _ in scopes}:
+        scopes[(arity, None)] = []
+
+    reported: set[tuple[str, str]] = set()
+    for (arity, _), scoped in scopes.items():
+        group = scoped + [entry for entry in always if entry.command.arity == arity]
+        for first, second in _overlapping_pairs(group, 0, arity):
+            key = (first.location, second.location)
+            if key in reported:
+                continue
+            reported.add(key)
+            kind = "duplicates" if first.shape == second.shape else "is ambiguous with"
+            yield f"{second.location} ({second.command}) {kind} {first.location} ({first.command})"
+
+
+def _overlapping_pairs(group: list[_Entry], position: int, arity: int) -> Iterator[tuple[_Entry, _Entry]]:
+    if len(group) < 2:
+        return
+    if position == arity:
+        for first, second in combinations(group, 2):
+            if all(
+                _slots_overlap(a, b) for a, b in zip(first.command.definitions, second.command.definitions, strict=True)
+            ):
+                yield first, second
+        return
+
+    by_keyword: dict[str, list[_Entry]] = defaultdict(list)
+    typed: list[_Entry] = []
+    for entry in group:
+        definition = entry.command.definitions[position]
+        if isinstance(definition, KeywordType):
+            by_keyword[definition.name].append(entry)
+        else:
+            typed.append(entry)
+    for name, keyword_entries in by_keyword.items():
+        accepting = [entry for entry in typed if _accepts(entry.command.definitions[position], name)]
+        yield from _overlapping_pairs(
+            sorted(keyword_entries + accepting, key=lambda entry: entry.index), position + 1, arity
+        )
+    yield from _overlapping_pairs(typed, position + 1, arity)
+
+
+def _slots_overlap(first: Any, second: Any) -> bool:
+    if isinstance(first, KeywordType) and isinstance(second, KeywordType):
+        return first.name == second.name
+    if isinstance(first, KeywordType):
+        return _accepts(second, first.name)
+    if isinstance(second, KeywordType):
+        return _accepts(first, second.name)
+    first_options = _static_options(first)
+    second_options = _static_options(second)
+    if first_options is not None and second_options is not None:
+        return bool({option[:1] for option in first_options} & {option[:1] for option in second_options})
+    if first_options is not None:
+        return any(_accepts(second, option) for option in first_options)
+    if second_options is not None:
+        return any(_accepts(first, option) for option in second_options)
+    return True
+
+
+def _static_options(definition: Any) -> list[str] | None:
+    if isinstance(definition, basic_types.OptionsType) and not isinstance(definition, basic_types.DynamicOptionsType):
+        return definition.valid_options
+    return None
+
+
+def _accepts(definition: Any, word: str) -> bool:
+    options = _static_options(definition)
+    if options is not None:
+        return any(option.startswith(word) for option in options)
+    if isinstance(definition, basic_types.OrType):
+        return any(_accepts(member, word) for member in definition.types)
+    if isinstance(definition, basic_types.RegexType):
+        return definition.regex.match(word) is not None
+    if isinstance(definition, basic_types.IntegerType):
+        return definition.match(word, _NO_CONTEXT)
+    return True
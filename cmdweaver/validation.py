@@ -0,0 +1,161 @@
+from __future__ import annotations
+
+import itertools
+import os
+from collections import deque
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import TypeAlias
+
+from cmdweaver import exceptions
+from cmdweaver import script as script_module
+from cmdweaver.interpreter import Interpreter
+
+InterpreterFactory: TypeAlias = Callable[[], Interpreter]
+
+_VALIDATION_ERRORS = (exceptions.EvalError, exceptions.NotContextDefinedError, ValueError)
+_worker_templates: dict[InterpreterFactory, Interpreter] = {}
+
+
+@dataclass(frozen=True)
+class Diagnostic:
+    line_number: int
+    line: str
+    error_type: str
+    message: str
+    argument_errors: tuple[exceptions.ArgumentError, ...] = ()
+
+
+@dataclass(frozen=True)
+class _Shard:
+    first_line: int
+    contexts: tuple[str, ...]
+    lines: tuple[str, ...] = ()
+    path: str | None = None
+    offset: int = 0
+    count: int = 0
+
+
+def validate_line(interpreter: Interpreter, line_number: int, line: str) -> Diagnostic | None:
+    try:
+        interpreter.dry_run(line)
+    except exceptions.InvalidArgumentError as error:
+        return Diagnostic(line_number, line, type(error).__name__, str(error), tuple(error.argument_errors))
+    except _VALIDATION_ERRORS as error:
+        return Diagnostic(line_number, line, type(error).__name__, str(error))
+    return None
+
+
+def validate_lines(
+    interpreter: Interpreter, lines: Iterable[str], first_line: int = 1, comment_prefix: str | None = "#"
+) -> Iterator[Diagnostic]:
+    for line_number, raw_line in enumerate(lines, first_line):
+        line = raw_line.rstrip("\r\n")
+        if script_module.is_blank_or_comment(line, comment_prefix):
+            continue
+        diagnostic = validate_line(interpreter, line_number, line)
+        if diagnostic is not None:
+            yield diagnostic
+
+
+def validate_script(
+    interpreter_factory: InterpreterFactory,
+    source: script_module.ScriptSource,
+    max_workers: int | None = None,
+    shard_lines: int = 10_000,
+    comment_prefix: str | None = "#",
+    encoding: str = "utf-8",
+    executor: Executor | None = None,
+) -> Iterator[Diagnostic]:
+    if shard_lines < 1:
+        raise ValueError(f"shard_lines must be positive, got {shard_lines!r}")
+    shards = _shards(interpreter_factory(), source, shard_lines, comment_prefix, encoding)
+    in_flight = 2 * (max_workers or os.cpu_count() or 1)
+    return _validate_shards(interpreter_factory, shards, max_workers, in_flight, comment_prefix, encoding, executor)
+
+
+def _validate_shards(
+    interpreter_factory: InterpreterFactory,
+    shards: Iterator[_Shard],
+    max_workers: int | None,
+    in_flight: int,
+    comment_prefix: str | None,
+    encoding: str,
+    executor: Executor | None,
+) -> Iterator[Diagnostic]:
+    if executor is None:
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            yield from _validate_shards(
+                interpreter_factory, shards, max_workers, in_flight, comment_prefix, encoding, pool
+            )
+        return
+
+    pending: deque[Future[list[Diagnostic]]] = deque()
+    for shard in shards:
+        pending.append(executor.submit(_validate_shard, interpreter_factory, shard, comment_prefix, encoding))
+        if len(pending) >= in_flight:
+            yield from pending.popleft().result()
+    while pending:
+        yield from pending.popleft().result()
+
+
+def _shards(
+    tracker: Interpreter,
+    source: script_module.ScriptSource,
+    shard_lines: int,
+    comment_prefix: str | None,
+    encoding: str,
+) -> Iterator[_Shard]:
+    path: str | None = None
+    positioned: Iterator[tuple[str, int | None]]
+    if isinstance(source, (str, os.PathLike)):
+        path = os.fspath(source)
+        positioned = script_module.read_lines(path, encoding)
+    else:
+        positioned = ((line, None) for line in source)
+
+    first_line = 1
+    offset = 0
+    while chunk := list(itertools.islice(positioned, shard_lines)):
+        contexts = tuple(context.context_name for context in tracker.context[1:])
+        if path is not None:
+            yield _Shard(first_line, contexts, path=path, offset=offset, count=len(chunk))
+        else:
+            yield _Shard(first_line, contexts, lines=tuple(line for line, _ in chunk))
+        for line, position in chunk:
+            _track_context(tracker, line.rstrip("\r\n"), comment_prefix)
+            offset = position or 0
+        first_line += len(chunk)
+
+
+def _track_context(tracker: Interpreter, line: str, comment_prefix: str | None) -> None:
+    if script_module.is_blank_or_comment(line, comment_prefix):
+        return
+    try:
+        tokens = tracker.parser.parse(line.strip())
+    except ValueError:
+        return
+    candidates = tracker.candidates_for(tokens)
+    if any(command.changes_context for command in candidates):
+        validate_line(tracker, 0, line)
+
+
+def _validate_shard(
+    interpreter_factory: InterpreterFactory, shard: _Shard, comment_prefix: str | None, encoding: str
+) -> list[Diagnostic]:
+    template = _worker_templates.get(interpreter_factory)
+    if template is None:
+        template = _worker_templates.setdefault(interpreter_factory, interpreter_factory())
+    interpreter = Interpreter(parser=template.parser, registry=template.registry, abbreviations=template.abbreviations)
+    for context_name in shard.contexts:
+        interpreter.push_context(context_name)
+    return list(validate_lines(interpreter, _shard_lines(shard, encoding), shard.first_line, comment_prefix))
+
+
+def _shard_lines(shard: _Shard, encoding: str) -> Iterable[str]:
+    if shard.path is None:
+        return shard.lines
+    with open(shard.path, "rb") as script_file:
+        script_file.seek(shard.offset)
+        return [script_file.readline().decode(encoding) for _ in range(shard.count)]
@@ -0,0 +1,165 @@
+import pytest
+from doublex import Spy, assert_that, called
+from hamcrest import contains_exactly, contains_inanyorder, empty, is_
+
+from cmdweaver import basic_types, exceptions
+from cmdweaver import interpreter as interpreter_module
+from cmdweaver.command import Command
+from cmdweaver.index import KeywordTrie
+
+
+class TestAbbreviations:
+    @pytest.fixture
+    def implementation(self):
+        return Spy()
+
+    @pytest.fixture
+    def interpreter(self, implementation):
+        interp = interpreter_module.Interpreter(abbreviations=True)
+        interp.add_command(Command(["show", "version"], implementation.show_version))
+        interp.add_command(Command(["show", "vlan", basic_types.IntegerType(min=0)], implementation.show_vlan))
+        interp.add_command(Command(["show", "interfaces"], implementation.show_interfaces))
+        interp.add_command(Command(["set", "name", basic_types.StringType()], implementation.set_name))
+        interp.add_command(Command(["net", basic_types.StringType(), "show", "counters"], implementation.counters))
+        interp.add_command(Command(["net", basic_types.StringType(), "show", "config"], implementation.config))
+        return interp
+
+    def test_runs_commands_from_unique_prefixes(self, interpreter, implementation):
+        interpreter.eval("sh ver")
+
+        assert_that(
+            implementation.show_version, called().with_args(tokens=["show", "version"], interpreter=interpreter)
+        )
+
+    def test_keeps_exact_keywords(self, interpreter, implementation):
+        interpreter.eval("show interfaces")
+
+        assert_that(implementation.show_interfaces, called())
+
+    def test_does_not_expand_parameters(self, interpreter, implementation):
+        interpreter.eval("se n sh")
+
+        assert_that(
+            implementation.set_name, called().with_args("sh", tokens=["set", "name", "sh"], interpreter=interpreter)
+        )
+
+    def test_expands_keywords_after_parameters(self, interpreter, implementation):
+        interpreter.eval("n eth0 sh cou")
+
+        assert_that(
+            implementation.counters,
+            called().with_args("eth0", tokens=["net", "eth0", "show", "counters"], interpreter=interpreter),
+        )
+
+    def test_reports_ambiguous_abbreviations(self, interpreter):
+        with pytest.raises(exceptions.AmbiguousCommandError) as error:
+            interpreter.eval("sh v")
+
+        assert_that(
+            [str(command) for command in error.value.matching_commands],
+            contains_inanyorder("show version", "show vlan <IntegerType>"),
+        )
+
+    def test_reports_ambiguous_abbreviations_after_parameters(self, interpreter):
+        with pytest.raises(exceptions.AmbiguousCommandError) as error:
+            interpreter.eval("net eth0 show co")
+
+        assert_that(len(error.value.matching_commands), is_(2))
+
+    def test_prefers_a_parameter_that_accepts_an_ambiguous_word(self, interpreter, implementation):
+        interpreter.add_command(Command(["set", "speed"], implementation.set_speed))
+        interpreter.add_command(Command(["set", "state"], implementation.set_state))
+        interpreter.add_command(Command(["set", basic_types.StringType()], implementation.set_any))
+
+        interpreter.eval("set s")
+
+        assert_that(implementation.set_any, called().with_args("s", tokens=["set", "s"], interpreter=interpreter))
+
+    def test_prefers_the_line_as_typed_when_it_already_matches(self, interpreter, implementation):
+        interpreter.add_command(
+            Command(["ping", basic_types.OptionsType(["verbose", "quiet"])], implementation.ping_mode)
+        )
+        interpreter.add_command(Command(["ping", "version"], implementation.ping_version))
+
+        interpreter.eval("ping ver")
+        interpreter.eval("ping v")
+
+        assert_that(implementation.ping_mode, called().times(2))
+        assert_that(implementation.ping_version, called().times(0))
+
+    def test_keeps_parameters_that_accept_a_unique_abbreviation(self, implementation):
+        interp = interpreter_module.Interpreter(abbreviations=True)
+        interp.add_command(Command(["show", "version"], implementation.show_version))
+        interp.add_command(Command(["show", basic_types.StringType()], implementation.show_any))
+
+        interp.eval("show ver")
+
+        assert_that(implementation.show_any, called().with_args("ver", tokens=["show", "ver"], interpreter=interp))
+        assert_that(implementation.show_version, called().times(0))
+
+    def test_expands_when_the_typed_line_has_invalid_arguments(self, implementation):
+        interp = interpreter_module.Interpreter(abbreviations=True)
+        interp.add_command(Command(["set", basic_types.IntegerType(min=0)], implementation.set_number))
+        interp.add_command(Command(["set", "speed"], implementation.set_speed))
+
+        interp.eval("set sp")
+
+        assert_that(implementation.set_speed, called())
+
+    def test_includes_commands_available_in_every_context(self, interpreter, implementation):
+        interpreter.add_command(Command(["exit"], implementation.exit, always=True))
+        interpreter.add_command(
+            Command(["describe", basic_types.StringType()], implementation.describe, context_name="config")
+        )
+        interpreter.push_context("config")
+
+        interpreter.eval("ex")
+        interpreter.eval("desc uplink")
+
+        assert_that(implementation.exit, called())
+        assert_that(
+            implementation.describe,
+            called().with_args("uplink", tokens=["describe", "uplink"], interpreter=interpreter),
+        )
+
+    def test_rejects_abbreviations_when_disabled(self):
+        interp = interpreter_module.Interpreter()
+        interp.add_command(Command(["show", "version"]))
+
+        with pytest.raises(exceptions.NoMatchingCommandFoundError):
+            interp.eval("sh ver")
+
+    def test_resolves_prefixes_after_new_siblings_are_added(self, interpreter, implementation):
+        interpreter.eval("sh i")
+        interpreter.add_command(Command(["show", "ip"], implementation.show_ip))
+
+        with pytest.raises(exceptions.AmbiguousCommandError):
+            interpreter.eval("sh i")
+
+    def test_lists_candidates_for_the_typed_and_the_expanded_line(self, implementation):
+        interp = interpreter_module.Interpreter(abbreviations=True)
+        show_any = Command(["show", basic_types.StringType()], implementation.show_any)
+        show_version = Command(["show", "version"], implementation.show_version)
+        interp.add_command(show_any)
+        interp.add_command(show_version)
+
+        assert_that(interp.candidates_for(["show", "ver"]), contains_exactly(show_any, show_version))
+        assert_that(interp.candidates_for(["show", "version"]), contains_exactly(show_any, show_version))
+
+    def test_lists_only_typed_candidates_when_disabled(self):
+        interp = interpreter_module.Interpreter()
+        show_version = Command(["show", "version"])
+        interp.add_command(show_version)
+
+        assert_that(interp.candidates_for(["sh", "ver"]), is_(empty()))
+        assert_that(interp.candidates_for(["show", "version"]), contains_exactly(show_version))
+
+
+class TestKeywordTrieAbbreviations:
+    def test_resolves_prefixes_among_thousands_of_siblings(self):
+        trie = KeywordTrie()
+        for sequence in range(5000):
+            trie.add(sequence, Command(["show", f"item{sequence:05d}"]))
+
+        assert_that(trie.root.children["show"].keywords_starting_with("item04999"), is_(("item04999",)))
+        assert_that(len(trie.root.children["show"].keywords_starting_with("item0499")), is_(2))
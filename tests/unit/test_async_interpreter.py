@@ -0,0 +1,187 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from doublex import Spy, assert_that, called
+from hamcrest import contains_inanyorder, has_entries, is_, is_not
+
+from cmdweaver import basic_types, exceptions
+from cmdweaver.async_interpreter import AsyncInterpreter
+from cmdweaver.command import Command
+from cmdweaver.executor import CommandExecutor
+from cmdweaver.metrics import MetricsRegistry
+from cmdweaver.profiling import ProfileCollector
+from cmdweaver.registry import CommandRegistry
+
+
+class AsyncProvider:
+    def __init__(self, options):
+        self.options = options
+        self.calls = 0
+
+    async def __call__(self):
+        self.calls += 1
+        return self.options
+
+
+class TestAsyncInterpreter:
+    @pytest.fixture
+    def implementation(self):
+        return Spy()
+
+    @pytest.fixture
+    def interpreter(self):
+        return AsyncInterpreter()
+
+    def test_evaluates_sync_handlers(self, interpreter, implementation):
+        interpreter.add_command(Command(["show", basic_types.StringType()], implementation.show))
+
+        asyncio.run(interpreter.aeval("show version"))
+
+        assert_that(
+            implementation.show, called().with_args("version", tokens=["show", "version"], interpreter=interpreter)
+        )
+
+    def test_awaits_coroutine_handlers(self, interpreter):
+        async def fetch(host, **kwargs):
+            await asyncio.sleep(0)
+            return f"fetched {host}"
+
+        interpreter.add_command(Command(["fetch", basic_types.StringType()], fetch))
+
+        assert_that(asyncio.run(interpreter.aeval("fetch h1")), is_("fetched h1"))
+
+    def test_runs_sync_handlers_in_the_configured_executor(self):
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            interpreter = AsyncInterpreter(executor=executor)
+            interpreter.add_command(Command(["where"], lambda **kwargs: threading.get_ident()))
+
+            handler_thread = asyncio.run(interpreter.aeval("where"))
+
+        assert_that(handler_thread, is_not(threading.get_ident()))
+
+    def test_returns_none_for_empty_lines(self, interpreter):
+        assert_that(asyncio.run(interpreter.aeval("   ")), is_(None))
+
+    def test_keeps_dispatch_errors(self, interpreter):
+        with pytest.raises(exceptions.NoMatchingCommandFoundError):
+            asyncio.run(interpreter.aeval("unknown"))
+
+    def test_returns_none_when_handler_is_interrupted(self, interpreter):
+        async def interrupted(**kwargs):
+            raise KeyboardInterrupt()
+
+        interpreter.add_command(Command(["stop"], interrupted))
+
+        assert_that(asyncio.run(interpreter.aeval("stop")), is_(None))
+
+    class TestAsyncDynamicOptions:
+        @pytest.fixture
+        def provider(self):
+            return AsyncProvider(["host1", "host2"])
+
+        @pytest.fixture
+        def interpreter(self, provider, implementation):
+            interp = AsyncInterpreter()
+            interp.add_command(Command(["ping", basic_types.DynamicOptionsType(provider)], implementation.ping))
+            return interp
+
+        def test_awaits_the_provider_once_per_line(self, interpreter, provider, implementation):
+            asyncio.run(interpreter.aeval("ping host1"))
+
+            assert_that(provider.calls, is_(1))
+            assert_that(
+                implementation.ping, called().with_args("host1", tokens=["ping", "host1"], interpreter=interpreter)
+            )
+
+        def test_completes_with_async_options(self, interpreter):
+            assert_that(asyncio.run(interpreter.acomplete("ping ho")), is_({"host1", "host2"}))
+
+        def test_awaits_only_providers_the_line_can_reach(self, interpreter, provider):
+            other = AsyncProvider(["a", "b"])
+            interpreter.add_command(Command(["trace", basic_types.DynamicOptionsType(other)]))
+            interpreter.add_command(Command(["ping", "once", basic_types.DynamicOptionsType(other)]))
+
+            asyncio.run(interpreter.acomplete("x"))
+            asyncio.run(interpreter.acomplete("pi"))
+            asyncio.run(interpreter.ahelp("ping"))
+
+            assert_that(provider.calls, is_(0))
+            assert_that(other.calls, is_(0))
+
+            asyncio.run(interpreter.acomplete("ping "))
+
+            assert_that(provider.calls, is_(1))
+            assert_that(other.calls, is_(0))
+
+        def test_reports_invalid_arguments_with_async_options(self, interpreter):
+            with pytest.raises(exceptions.InvalidArgumentError) as exc_info:
+                asyncio.run(interpreter.aeval("ping router"))
+
+            assert_that(exc_info.value.argument_errors[0].valid_options, is_(["host1", "host2"]))
+
+        def test_rejects_sync_evaluation(self, interpreter):
+            with pytest.raises(TypeError):
+                interpreter.eval("ping host1")
+
+
+class TestAsyncSessions:
+    @pytest.fixture
+    def implementation(self):
+        return Spy()
+
+    @pytest.fixture
+    def registry(self, implementation):
+        return CommandRegistry(
+            [
+                Command(["show", "version"], implementation.show_version, cmd_id="show-version"),
+                Command(["hostname", basic_types.StringType()], implementation.hostname, context_name="config"),
+            ]
+        ).freeze()
+
+    def test_sessions_share_a_frozen_registry(self, registry, implementation):
+        first = AsyncInterpreter(registry=registry)
+        second = AsyncInterpreter(registry=registry)
+        second.push_context("config")
+
+        asyncio.run(first.aeval("show version"))
+        asyncio.run(second.aeval("hostname edge1"))
+
+        assert_that(first.registry, is_(second.registry))
+        assert_that(implementation.show_version, called().times(1))
+        assert_that(implementation.hostname, called().times(1))
+
+    def test_records_metrics(self, registry):
+        metrics = MetricsRegistry()
+        interpreter = AsyncInterpreter(registry=registry, metrics=metrics)
+
+        asyncio.run(interpreter.aeval("show version"))
+        with pytest.raises(exceptions.NoMatchingCommandFoundError):
+            asyncio.run(interpreter.aeval("unknown"))
+
+        snapshot = metrics.snapshot()
+        assert_that(
+            snapshot["histograms"], has_entries({'cmdweaver_eval_seconds{cmd_id="show-version"}': has_entries(count=1)})
+        )
+        assert_that(
+            snapshot["counters"],
+            has_entries({'cmdweaver_dispatch_errors_total{error="NoMatchingCommandFoundError"}': 1}),
+        )
+
+    def test_emits_profile_phases(self, registry):
+        collector = ProfileCollector()
+        interpreter = AsyncInterpreter(registry=registry)
+        interpreter.add_profile_hook(collector)
+
+        asyncio.run(interpreter.aeval("show version"))
+
+        assert_that([stats.name for stats in collector.phases()], contains_inanyorder("parse", "select", "execute"))
+
+    def test_queues_lines_on_a_command_executor(self, registry, implementation):
+        with CommandExecutor(max_workers=1) as executor:
+            interpreter = AsyncInterpreter(registry=registry, command_executor=executor)
+
+            interpreter.submit("show version").result(timeout=5)
+
+        assert_that(implementation.show_version, called().times(1))
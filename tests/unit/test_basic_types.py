@@ -1,8 +1,18 @@
 import pytest
-from doublex import Spy, Stub, assert_that, is_, when
-from hamcrest import contains, contains_string, has_items, has_length, string_contains_in_order
+from doublex import Spy, Stub, assert_that, called, is_, when
+from hamcrest import contains, contains_exactly, contains_string, has_items, has_length, string_contains_in_order
 
 from cmdweaver import basic_types
+from cmdweaver import interpreter as interpreter_module
+from cmdweaver.command import Command
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0
+
+    def __call__(self):
+        return self.now
 
 
 class TestOrType:
@@ -141,6 +151,58 @@ class TestBasicTypes:
         def test_does_not_partial_match_invalid_starts(self, options_type, context):
             assert_that(options_type.partial_match("inv", context), is_(False))
 
+        def test_completes_only_options_sharing_the_prefix_in_sorted_order(self, context):
+            options_type = basic_types.OptionsType(["host-b2", "router", "host-a1", "hostile", "host-b1"])
+
+            result = options_type.complete("host-", ["host-"], context)
+
+            assert_that(result, contains_exactly(("host-a1", True), ("host-b1", True), ("host-b2", True)))
+
+        def test_keeps_valid_options_in_definition_order(self, context):
+            options_type = basic_types.OptionsType(["zeta", "alpha"])
+
+            assert_that(options_type.get_valid_options(), is_(["zeta", "alpha"]))
+            assert_that(str(options_type), is_("<zeta|alpha>"))
+
+        def test_reindexes_when_valid_options_are_replaced(self, options_type, context):
+            options_type.valid_options = ["new_op"]
+
+            assert_that(options_type.match("new_op", context), is_(True))
+            assert_that(options_type.partial_match("op", context), is_(False))
+
+        def test_sees_options_edited_in_place_once_reassigned(self, options_type, context):
+            options_type.match("op1", context)
+            options = options_type.valid_options
+
+            options[1] = "op3"
+            options_type.valid_options = options
+
+            assert_that(options_type.match("op3", context), is_(True))
+            assert_that(options_type.match("op2", context), is_(False))
+
+        def test_indexes_options_of_subclasses_overriding_get_valid_options(self, context):
+            class ZoneType(basic_types.OptionsType):
+                def __init__(self):
+                    self.name = None
+
+                def get_valid_options(self):
+                    return ["dmz", "lan"]
+
+            zone_type = ZoneType()
+
+            assert_that(zone_type.match("lan", context), is_(True))
+            assert_that(zone_type.complete("d", ["d"], context), contains_exactly(("dmz", True)))
+
+        def test_dispatches_commands_with_subclasses_overriding_get_valid_options(self):
+            class ZoneType(basic_types.OptionsType):
+                def get_valid_options(self):
+                    return ["dmz", "lan"]
+
+            interp = interpreter_module.Interpreter()
+            interp.add_command(Command(["zone", ZoneType()], lambda zone, **kwargs: zone))
+
+            assert_that(interp.eval("zone lan"), is_("lan"))
+
         class TestRepresentation:
             def test_includes_options_in_representation(self, options_type):
                 assert_that(str(options_type), string_contains_in_order("op1", "op2"))
@@ -183,6 +245,71 @@ class TestBasicTypes:
                 dynamic_options_type = basic_types.DynamicOptionsType(Stub().get_options, name="name")
                 assert_that(str(dynamic_options_type), contains_string("name"))
 
+        class TestWhenCaching:
+            @pytest.fixture
+            def provider(self):
+                provider = Spy()
+                when(provider).get_options().returns(["op1", "op2"])
+                return provider
+
+            @pytest.fixture
+            def clock(self):
+                return Clock()
+
+            def test_calls_provider_every_time_when_cache_is_disabled(self, provider):
+                dynamic_options_type = basic_types.DynamicOptionsType(provider.get_options)
+
+                dynamic_options_type.get_valid_options()
+                dynamic_options_type.get_valid_options()
+
+                assert_that(provider.get_options, called().times(2))
+
+            def test_reuses_options_while_ttl_has_not_expired(self, provider, clock):
+                dynamic_options_type = basic_types.DynamicOptionsType(provider.get_options, cache_ttl=10, clock=clock)
+
+                dynamic_options_type.get_valid_options()
+                clock.now = 9
+                dynamic_options_type.get_valid_options()
+
+                assert_that(provider.get_options, called().times(1))
+
+            def test_reloads_options_when_ttl_expires(self, provider, clock):
+                dynamic_options_type = basic_types.DynamicOptionsType(provider.get_options, cache_ttl=10, clock=clock)
+
+                dynamic_options_type.get_valid_options()
+                clock.now = 10
+                dynamic_options_type.get_valid_options()
+
+                assert_that(provider.get_options, called().times(2))
+
+            def test_reloads_options_after_invalidation(self, provider, clock):
+                dynamic_options_type = basic_types.DynamicOptionsType(provider.get_options, cache_ttl=10, clock=clock)
+
+                dynamic_options_type.get_valid_options()
+                dynamic_options_type.invalidate()
+                dynamic_options_type.get_valid_options()
+
+                assert_that(provider.get_options, called().times(2))
+
+            def test_does_not_cache_option_lists_bigger_than_max_size(self, provider, clock):
+                dynamic_options_type = basic_types.DynamicOptionsType(
+                    provider.get_options, cache_ttl=10, cache_max_size=1, clock=clock
+                )
+
+                dynamic_options_type.get_valid_options()
+                dynamic_options_type.get_valid_options()
+
+                assert_that(provider.get_options, called().times(2))
+
+            def test_calls_provider_once_inside_an_evaluation_scope(self, provider):
+                dynamic_options_type = basic_types.DynamicOptionsType(provider.get_options)
+
+                with basic_types.evaluation_scope():
+                    dynamic_options_type.get_valid_options()
+                    dynamic_options_type.get_valid_options()
+
+                assert_that(provider.get_options, called().times(1))
+
     class TestStringType:
         def test_has_no_autocompletion(self, string_type, context):
             assert_that(string_type.complete("", [""], context), has_length(0))
@@ -1,6 +1,9 @@
+import pytest
 from doublex import assert_that
 from hamcrest import is_
 
+from cmdweaver import basic_types
+from cmdweaver import interpreter as interpreter_module
 from cmdweaver.command import Command
 
 
@@ -9,3 +12,92 @@ class TestCommand:
         command = Command(["k1", "k2"], cmd_id="cmd_id1")
 
         assert_that(command.cmd_id, is_("cmd_id1"))
+
+    def test_exposes_its_arity(self):
+        command = Command(["set", "vlan", basic_types.IntegerType()])
+
+        assert_that(command.arity, is_(3))
+
+    def test_describes_its_shape_without_option_values(self):
+        command = Command(
+            ["set", basic_types.OptionsType(["on", "off"]), basic_types.IntegerType(name="mtu"), basic_types.OrType()]
+        )
+
+        assert_that(command.shape, is_("set <OptionsType> <mtu> <OrType>"))
+
+
+class TestCompiledMatching:
+    @pytest.fixture
+    def context(self):
+        return interpreter_module.DefaultContext()
+
+    @pytest.mark.parametrize(
+        ("slot", "word", "expected"),
+        [
+            (basic_types.StringType(), "anything", True),
+            (basic_types.StringType(), "", False),
+            (basic_types.RegexType("^eth[0-9]+$"), "eth0", True),
+            (basic_types.RegexType("^eth[0-9]+$"), "lo", False),
+            (basic_types.IntegerType(min=0, max=10), "5", True),
+            (basic_types.IntegerType(min=0, max=10), "50", False),
+            (basic_types.OptionsType(["prod", "staging"]), "prod", True),
+            (basic_types.OptionsType(["prod", "staging"]), "sta", True),
+            (basic_types.OptionsType(["prod", "production"]), "prod", True),
+            (basic_types.OptionsType(["prod", "production"]), "pro", False),
+            (basic_types.BoolType(), "t", True),
+            (basic_types.BoolType(), "maybe", False),
+        ],
+    )
+    def test_matches_like_the_slot_type(self, context, slot, word, expected):
+        command = Command(["set", slot])
+
+        assert_that(command.match(["set", word], context), is_(expected))
+
+    def test_uses_overridden_match_of_type_subclasses(self, context):
+        class EvenType(basic_types.IntegerType):
+            def match(self, word, context, partial_line=None):
+                return int(word) % 2 == 0
+
+        command = Command(["set", EvenType()])
+
+        assert_that(command.match(["set", "4"], context), is_(True))
+        assert_that(command.match(["set", "3"], context), is_(False))
+
+    def test_sees_options_replaced_after_construction(self, context):
+        options = basic_types.OptionsType(["old"])
+        command = Command(["set", options])
+
+        options.valid_options = ["new"]
+
+        assert_that(command.match(["set", "new"], context), is_(True))
+
+    def test_structural_match_only_checks_keyword_positions(self, context):
+        command = Command(["set", basic_types.IntegerType(), "mtu", basic_types.IntegerType()])
+
+        assert_that(command.structural_match(["set", "x", "mtu", "y"], context), is_(True))
+        assert_that(command.structural_match(["set", "1", "mru", "2"], context), is_(False))
+
+    def test_normalizes_tokens_through_the_compiled_slots(self, context):
+        command = Command(["set", basic_types.OptionsType(["prod", "staging"]), basic_types.BoolType()])
+
+        assert_that(command.normalize_tokens(["set", "sta", "t"], context), is_(["set", "staging", "true"]))
+
+    def test_keeps_unresolved_tokens_as_typed_when_normalizing(self, context):
+        command = Command(["set", basic_types.OptionsType(["prod", "staging"])])
+
+        assert_that(command.normalize_tokens(["set", "other"], context), is_(["set", "other"]))
+
+    def test_normalizes_regardless_of_context_and_typed_keywords(self, context):
+        command = Command(["set", basic_types.OptionsType(["prod", "staging"])], context_name="cfg")
+
+        assert_that(command.normalize_tokens(["set", "sta"], context), is_(["set", "staging"]))
+        assert_that(command.normalize_tokens(["se", "sta"], context), is_(["set", "staging"]))
+
+    def test_reports_each_typed_slot_while_resolving(self, context):
+        command = Command(["set", basic_types.OptionsType(["prod", "staging"]), "mtu", basic_types.IntegerType()])
+        timed = []
+
+        result = command.resolve(["set", "sta", "mtu", "x"], context, lambda slot, seconds: timed.append(slot))
+
+        assert_that(timed, is_([command.definitions[1], command.definitions[3]]))
+        assert_that(result, is_(command.resolve(["set", "sta", "mtu", "x"], context)))
@@ -0,0 +1,149 @@
+import pytest
+from doublex import ANY_ARG, Spy, Stub, assert_that, called, when
+from hamcrest import is_
+
+from cmdweaver import basic_types
+from cmdweaver import interpreter as interpreter_module
+from cmdweaver.command import Command
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestCompletionCache:
+    @pytest.fixture
+    def host_type(self):
+        host_type = Spy(basic_types.BaseType)
+        when(host_type).match(ANY_ARG).returns(True)
+        when(host_type).partial_match(ANY_ARG).returns(True)
+        when(host_type).complete(ANY_ARG).returns([("host1", True)])
+        return host_type
+
+    @pytest.fixture
+    def interpreter(self, host_type):
+        implementation = Stub()
+        interp = interpreter_module.Interpreter(completion_cache_size=16)
+        interp.add_command(Command(["sys", "reboot"], implementation.reboot))
+        interp.add_command(Command(["sys", "shutdown"], implementation.shutdown))
+        interp.add_command(Command(["net", host_type], implementation.net))
+        return interp
+
+    def test_serves_repeated_prefixes_from_the_cache(self, interpreter, host_type):
+        interpreter.complete("net h")
+        result = interpreter.complete("net h")
+
+        assert_that(result, is_({"host1"}))
+        assert_that(host_type.complete, called().times(1))
+        assert_that(
+            (interpreter.completion_cache.stats().hits, interpreter.completion_cache.stats().misses), is_((1, 1))
+        )
+
+    def test_normalizes_whitespace_in_the_line(self, interpreter, host_type):
+        interpreter.complete("net h")
+
+        assert_that(interpreter.complete("  net   h"), is_({"host1"}))
+        assert_that(host_type.complete, called().times(1))
+
+    def test_keeps_a_trailing_space_distinct(self, interpreter):
+        assert_that(interpreter.complete("sys"), is_({"sys "}))
+        assert_that(interpreter.complete("sys "), is_({"reboot", "shutdown"}))
+
+    def test_returns_a_copy_of_the_cached_completions(self, interpreter):
+        interpreter.complete("sys ").clear()
+
+        assert_that(interpreter.complete("sys "), is_({"reboot", "shutdown"}))
+
+    def test_is_invalidated_by_add_command(self, interpreter):
+        interpreter.complete("sys ")
+
+        interpreter.add_command(Command(["sys", "status"], Stub().status))
+
+        assert_that(interpreter.complete("sys "), is_({"reboot", "shutdown", "status"}))
+
+    def test_is_invalidated_by_context_changes(self, interpreter):
+        interpreter.add_command(Command(["sys", "halt"], Stub().halt, context_name="config"))
+        interpreter.complete("sys ")
+
+        interpreter.push_context("config")
+
+        assert_that(interpreter.complete("sys "), is_({"halt"}))
+
+    def test_evicts_the_least_recently_used_prefix(self):
+        interp = interpreter_module.Interpreter(completion_cache_size=1)
+        interp.add_command(Command(["sys", "reboot"], Stub().reboot))
+
+        interp.complete("s")
+        interp.complete("sys ")
+        interp.complete("s")
+
+        assert_that(interp.completion_cache.stats().hits, is_(0))
+
+    def test_is_disabled_by_default(self):
+        assert_that(interpreter_module.Interpreter().completion_cache, is_(None))
+
+
+class TestCompletionCacheWithDynamicOptions:
+    @pytest.fixture
+    def clock(self):
+        return FakeClock()
+
+    @pytest.fixture
+    def provider(self):
+        provider = Spy()
+        when(provider).ports().returns(["eth0", "eth1"])
+        return provider
+
+    def interpreter_with(self, slot_type):
+        interp = interpreter_module.Interpreter(completion_cache_size=16)
+        interp.add_command(Command(["port", slot_type], Stub().port))
+        interp.add_command(Command(["sys", "reboot"], Stub().reboot))
+        return interp
+
+    def test_never_caches_prefixes_that_reach_uncached_dynamic_slots(self, provider):
+        interp = self.interpreter_with(basic_types.DynamicOptionsType(provider.ports))
+
+        interp.complete("port e")
+        interp.complete("port e")
+
+        assert_that(provider.ports, called().times(2))
+
+    def test_caches_prefixes_that_cannot_reach_uncached_dynamic_slots(self, provider):
+        interp = self.interpreter_with(basic_types.DynamicOptionsType(provider.ports))
+
+        interp.complete("sys ")
+        interp.complete("sys ")
+
+        assert_that(interp.completion_cache.stats().hits, is_(1))
+
+    def test_serves_dynamic_completions_within_the_slot_ttl(self, provider, clock):
+        interp = self.interpreter_with(basic_types.DynamicOptionsType(provider.ports, cache_ttl=10, clock=clock))
+        interp.complete("port e")
+
+        clock.now = 9.0
+
+        assert_that(interp.complete("port e"), is_({"eth0", "eth1"}))
+        assert_that(interp.completion_cache.stats().hits, is_(1))
+
+    def test_expires_dynamic_completions_with_the_slot_ttl(self, provider, clock):
+        interp = self.interpreter_with(basic_types.DynamicOptionsType(provider.ports, cache_ttl=10, clock=clock))
+        interp.complete("port e")
+
+        when(provider).ports().returns(["eth2"])
+        clock.now = 10.0
+
+        assert_that(interp.complete("port e"), is_({"eth2"}))
+
+    def test_expires_dynamic_completions_when_the_slot_is_invalidated(self, provider, clock):
+        slot_type = basic_types.DynamicOptionsType(provider.ports, cache_ttl=10, clock=clock)
+        interp = self.interpreter_with(slot_type)
+        interp.complete("port e")
+
+        when(provider).ports().returns(["eth2"])
+        slot_type.invalidate()
+
+        assert_that(interp.complete("port e"), is_({"eth2"}))
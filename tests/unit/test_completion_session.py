@@ -0,0 +1,74 @@
+import pytest
+from doublex import ANY_ARG, Spy, Stub, assert_that, called, when
+from hamcrest import is_
+
+from cmdweaver import basic_types
+from cmdweaver import interpreter as interpreter_module
+from cmdweaver.command import Command
+
+
+class TestCompletionSession:
+    @pytest.fixture
+    def host_type(self):
+        host_type = Spy(basic_types.BaseType)
+        when(host_type).match(ANY_ARG).returns(True)
+        when(host_type).partial_match(ANY_ARG).returns(True)
+        when(host_type).complete(ANY_ARG).returns([])
+        return host_type
+
+    @pytest.fixture
+    def interpreter(self, host_type):
+        implementation = Stub()
+        interp = interpreter_module.Interpreter()
+        interp.add_command(Command(["sys", "reboot"], implementation.reboot))
+        interp.add_command(Command(["sys", "shutdown"], implementation.shutdown))
+        interp.add_command(Command(["net", host_type, "show", "configuration"], implementation.show_net_conf))
+        interp.add_command(Command(["net", host_type, "show", "counters"], implementation.show_counters))
+        return interp
+
+    @pytest.fixture
+    def session(self, interpreter):
+        return interpreter.completion_session()
+
+    def test_returns_same_completions_as_interpreter_while_typing(self, interpreter, session):
+        line = "net host1 show co"
+
+        for end in range(len(line) + 1):
+            assert_that(session.complete(line[:end]), is_(interpreter.complete(line[:end])))
+
+    def test_does_not_rematch_completed_tokens_when_line_is_extended(self, session, host_type):
+        session.complete("net host1 ")
+        session.complete("net host1 s")
+        session.complete("net host1 sh")
+
+        assert_that(host_type.match, called().times(2))
+
+    def test_recomputes_when_line_is_edited_before_the_last_token(self, interpreter, session):
+        session.complete("net host1 show ")
+
+        result = session.complete("sys ")
+
+        assert_that(result, is_(interpreter.complete("sys ")))
+
+    def test_recomputes_after_adding_commands(self, interpreter, session):
+        session.complete("sys ")
+
+        interpreter.add_command(Command(["sys", "status"], Stub().status))
+
+        assert_that(session.complete("sys st"), is_({"status"}))
+
+    def test_recomputes_after_context_changes(self, interpreter, session):
+        interpreter.add_command(Command(["sys", "context_cmd"], Stub().cmd, context_name="context1"))
+        session.complete("sys ")
+
+        interpreter.push_context("context1")
+
+        assert_that(session.complete("sys c"), is_({"context_cmd"}))
+
+    def test_recomputes_everything_after_reset(self, session, host_type):
+        session.complete("net host1 ")
+        session.reset()
+
+        session.complete("net host1 s")
+
+        assert_that(host_type.match, called().times(4))
@@ -156,3 +156,52 @@ class TestTypesCanUseContext:
             interpreter.eval("test")
 
             assert_that(type_spy.match, called().with_args("test", actual_context, partial_line=["test"]))
+
+
+class TestActiveCommands:
+    @pytest.fixture
+    def default_cmd(self):
+        return Command(["default_cmd"])
+
+    @pytest.fixture
+    def always_cmd(self):
+        return Command(["always_cmd"], always=True)
+
+    @pytest.fixture
+    def context_cmd(self):
+        return Command(["context_cmd"], context_name="context1")
+
+    @pytest.fixture
+    def interpreter(self, default_cmd, always_cmd, context_cmd):
+        interp = interpreter_module.Interpreter()
+        interp.add_command(default_cmd)
+        interp.add_command(always_cmd)
+        interp.add_command(context_cmd)
+        return interp
+
+    def test_returns_default_and_always_commands_in_registration_order(self, interpreter, default_cmd, always_cmd):
+        assert_that(interpreter.active_commands(), is_([default_cmd, always_cmd]))
+
+    def test_swaps_to_context_commands_when_pushing_context(self, interpreter, always_cmd, context_cmd):
+        interpreter.push_context("context1")
+
+        assert_that(interpreter.active_commands(), is_([always_cmd, context_cmd]))
+
+    def test_swaps_back_when_popping_context(self, interpreter, default_cmd, always_cmd):
+        interpreter.push_context("context1")
+        interpreter.pop_context()
+
+        assert_that(interpreter.active_commands(), is_([default_cmd, always_cmd]))
+
+    def test_includes_commands_added_after_entering_the_context(self, interpreter, always_cmd, context_cmd):
+        interpreter.push_context("context1")
+        late_cmd = Command(["late_cmd"], context_name="context1")
+
+        interpreter.add_command(late_cmd)
+
+        assert_that(interpreter.active_commands(), is_([always_cmd, context_cmd, late_cmd]))
+
+    def test_returns_only_always_commands_in_a_context_without_commands(self, interpreter, always_cmd):
+        interpreter.push_context("empty_context")
+
+        assert_that(interpreter.active_commands(), is_([always_cmd]))
@@ -0,0 +1,101 @@
+import pytest
+from doublex import Spy, Stub, assert_that, called, when
+from hamcrest import is_
+
+from cmdweaver import basic_types, exceptions
+from cmdweaver import interpreter as interpreter_module
+from cmdweaver.command import Command
+
+
+class TestDispatchCache:
+    @pytest.fixture
+    def implementation(self):
+        return Spy()
+
+    @pytest.fixture
+    def interpreter(self, implementation):
+        interp = interpreter_module.Interpreter(dispatch_cache_size=16)
+        interp.add_command(Command(["vlan", "add", basic_types.IntegerType(min=0, max=4096)], implementation.vlan_add))
+        interp.add_command(Command(["show", "all"], implementation.show_all))
+        interp.add_command(Command(["show", basic_types.OptionsType(["x", "y"])], implementation.show_option))
+        return interp
+
+    def test_resolves_repeated_command_shapes_from_the_cache(self, interpreter, implementation):
+        interpreter.eval("vlan add 10")
+        interpreter.eval("vlan add 20")
+        interpreter.eval("vlan add 30")
+
+        assert_that(implementation.vlan_add, called().times(3))
+        assert_that(
+            implementation.vlan_add, called().with_args("30", tokens=["vlan", "add", "30"], interpreter=interpreter)
+        )
+        assert_that((interpreter.dispatch_cache.stats().hits, interpreter.dispatch_cache.stats().misses), is_((2, 1)))
+
+    def test_revalidates_typed_slots_on_cache_hits(self, interpreter):
+        interpreter.eval("vlan add 10")
+
+        with pytest.raises(exceptions.InvalidArgumentError):
+            interpreter.eval("vlan add 5000")
+
+    def test_keeps_commands_sharing_keyword_shape_out_of_the_cache(self, interpreter, implementation):
+        interpreter.eval("show x")
+        interpreter.eval("show all")
+        interpreter.eval("show y")
+
+        assert_that(implementation.show_all, called().times(1))
+        assert_that(implementation.show_option, called().times(2))
+        assert_that(interpreter.dispatch_cache.stats().size, is_(0))
+
+    def test_is_invalidated_when_adding_commands(self, interpreter, implementation):
+        interpreter.eval("vlan add 10")
+
+        interpreter.add_command(Command(["vlan", "add", basic_types.StringType()], implementation.other))
+
+        with pytest.raises(exceptions.AmbiguousCommandError):
+            interpreter.eval("vlan add 20")
+
+    def test_uses_a_separate_entry_per_context(self, interpreter, implementation):
+        interpreter.add_command(
+            Command(["vlan", "add", basic_types.StringType()], implementation.ctx, context_name="c1")
+        )
+        interpreter.eval("vlan add 10")
+
+        interpreter.push_context("c1")
+        interpreter.eval("vlan add 10")
+
+        assert_that(implementation.ctx, called().times(1))
+
+    def test_does_not_cache_commands_with_uncached_dynamic_options(self, implementation):
+        provider = Stub()
+        when(provider).hosts().returns(["h1", "h2"])
+        interp = interpreter_module.Interpreter(dispatch_cache_size=16)
+        interp.add_command(Command(["ping", basic_types.DynamicOptionsType(provider.hosts)], implementation.ping))
+
+        interp.eval("ping h1")
+
+        assert_that(interp.dispatch_cache.stats().size, is_(0))
+
+    def test_caches_commands_with_dynamic_options_marked_cacheable(self, implementation):
+        provider = Stub()
+        when(provider).hosts().returns(["h1", "h2"])
+        interp = interpreter_module.Interpreter(dispatch_cache_size=16)
+        hosts = basic_types.DynamicOptionsType(provider.hosts, cache_ttl=60)
+        interp.add_command(Command(["ping", hosts], implementation.ping))
+
+        interp.eval("ping h1")
+
+        assert_that(interp.dispatch_cache.stats().size, is_(1))
+
+    def test_evicts_least_recently_used_entries(self, implementation):
+        interp = interpreter_module.Interpreter(dispatch_cache_size=1)
+        interp.add_command(Command(["a", basic_types.StringType()], implementation.a))
+        interp.add_command(Command(["b", basic_types.StringType()], implementation.b))
+
+        interp.eval("a 1")
+        interp.eval("b 1")
+        interp.eval("a 2")
+
+        assert_that(interp.dispatch_cache.stats().hits, is_(0))
+
+    def test_is_disabled_by_default(self):
+        assert_that(interpreter_module.Interpreter().dispatch_cache, is_(None))
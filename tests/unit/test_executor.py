@@ -0,0 +1,190 @@
+import threading
+import time
+from concurrent.futures import CancelledError
+
+import pytest
+from doublex import assert_that
+from hamcrest import contains_exactly, is_
+
+from cmdweaver import basic_types, exceptions
+from cmdweaver import interpreter as interpreter_module
+from cmdweaver.command import Command
+from cmdweaver.executor import CommandExecutor
+from cmdweaver.registry import CommandRegistry
+
+
+class TestSubmittedCommands:
+    @pytest.fixture
+    def executor(self):
+        with CommandExecutor(max_workers=4) as executor:
+            yield executor
+
+    @pytest.fixture
+    def calls(self):
+        return []
+
+    @pytest.fixture
+    def registry(self, calls):
+        def record(value, interpreter, **kwargs):
+            time.sleep(0.001)
+            calls.append((interpreter, value))
+            return value
+
+        def enter(interpreter, **kwargs):
+            interpreter.push_context("config")
+
+        def context_name(interpreter, **kwargs):
+            return interpreter.actual_context().context_name
+
+        return CommandRegistry(
+            [
+                Command(["record", basic_types.StringType()], record),
+                Command(["configure"], enter),
+                Command(["where"], context_name, always=True),
+            ]
+        ).freeze()
+
+    def test_returns_a_future_with_the_command_result(self, registry, executor):
+        session = interpreter_module.Interpreter(registry=registry, command_executor=executor)
+
+        assert_that(session.submit("record hello").result(timeout=5), is_("hello"))
+
+    def test_runs_each_session_commands_in_submission_order(self, registry, executor, calls):
+        sessions = [interpreter_module.Interpreter(registry=registry, command_executor=executor) for _ in range(4)]
+
+        futures = [session.submit(f"record {index}") for index in range(50) for session in sessions]
+        for future in futures:
+            future.result(timeout=5)
+
+        for session in sessions:
+            session_values = [value for owner, value in calls if owner is session]
+            assert_that(session_values, contains_exactly(*[str(index) for index in range(50)]))
+
+    def test_applies_context_changes_before_later_commands(self, registry, executor):
+        session = interpreter_module.Interpreter(registry=registry, command_executor=executor)
+
+        session.submit("configure")
+        where = session.submit("where")
+
+        assert_that(where.result(timeout=5), is_("config"))
+
+    def test_propagates_dispatch_errors_through_the_future(self, registry, executor):
+        session = interpreter_module.Interpreter(registry=registry, command_executor=executor)
+
+        with pytest.raises(exceptions.NoMatchingCommandFoundError):
+            session.submit("unknown").result(timeout=5)
+
+    def test_resolves_interrupted_commands_to_none(self, executor):
+        def interrupted(**kwargs):
+            raise KeyboardInterrupt()
+
+        session = interpreter_module.Interpreter(command_executor=executor)
+        session.add_command(Command(["stop"], interrupted))
+
+        assert_that(session.submit("stop").result(timeout=5), is_(None))
+
+    def test_resolves_commands_that_have_not_started_to_none(self, executor):
+        started = threading.Event()
+        release = threading.Event()
+        ran = []
+
+        def block(**kwargs):
+            started.set()
+            return release.wait(5)
+
+        session = interpreter_module.Interpreter(command_executor=executor)
+        session.add_command(Command(["block"], block))
+        session.add_command(Command(["after"], lambda **kwargs: ran.append("after")))
+
+        blocking = session.submit("block")
+        pending = session.submit("after")
+        started.wait(5)
+        cancelled = session.cancel_submitted()
+        release.set()
+
+        assert_that(cancelled, is_(1))
+        assert_that(pending.result(timeout=5), is_(None))
+        assert_that(blocking.result(timeout=5), is_(True))
+        assert_that(ran, is_([]))
+
+    def test_lets_running_commands_finish_when_cancelling(self, executor):
+        started = threading.Event()
+        release = threading.Event()
+
+        def block(**kwargs):
+            started.set()
+            release.wait(5)
+            return "finished"
+
+        session = interpreter_module.Interpreter(command_executor=executor)
+        session.add_command(Command(["block"], block))
+
+        running = session.submit("block")
+        started.wait(5)
+        cancelled = session.cancel_submitted()
+        release.set()
+
+        assert_that(cancelled, is_(0))
+        assert_that(running.result(timeout=5), is_("finished"))
+
+    def test_keeps_futures_cancelled_by_the_caller_cancelled(self, executor):
+        started = threading.Event()
+        release = threading.Event()
+
+        def block(**kwargs):
+            started.set()
+            return release.wait(5)
+
+        session = interpreter_module.Interpreter(command_executor=executor)
+        session.add_command(Command(["block"], block))
+        session.add_command(Command(["after"], lambda **kwargs: "ran"))
+
+        session.submit("block")
+        pending = session.submit("after")
+        started.wait(5)
+        pending.cancel()
+        release.set()
+
+        with pytest.raises(CancelledError):
+            pending.result(timeout=5)
+
+    def test_shares_workers_between_busy_sessions(self):
+        started = threading.Event()
+        release = threading.Event()
+        order = []
+
+        def first(**kwargs):
+            started.set()
+            release.wait(5)
+            order.append("busy")
+
+        with CommandExecutor(max_workers=1) as executor:
+            busy = interpreter_module.Interpreter(command_executor=executor)
+            busy.add_command(Command(["work"], first))
+            busy.add_command(Command(["more"], lambda **kwargs: order.append("busy")))
+            other = interpreter_module.Interpreter(command_executor=executor)
+            other.add_command(Command(["ping"], lambda **kwargs: order.append("other")))
+
+            futures = [busy.submit("work")] + [busy.submit("more") for _ in range(10)]
+            started.wait(5)
+            other_future = other.submit("ping")
+            release.set()
+            other_future.result(timeout=5)
+            for future in futures:
+                future.result(timeout=5)
+
+        assert_that(order.index("other"), is_(1))
+
+    def test_finishes_queued_commands_when_shutting_down(self):
+        executor = CommandExecutor(max_workers=1)
+        session = interpreter_module.Interpreter(command_executor=executor)
+        session.add_command(Command(["tick"], lambda **kwargs: "tick"))
+
+        futures = [session.submit("tick") for _ in range(20)]
+        executor.shutdown()
+
+        assert_that([future.result(timeout=5) for future in futures], is_(["tick"] * 20))
+
+    def test_requires_a_command_executor(self):
+        with pytest.raises(exceptions.NoCommandExecutorError):
+            interpreter_module.Interpreter().submit("anything")
@@ -0,0 +1,96 @@
+import pickle
+
+import pytest
+from doublex import assert_that
+from hamcrest import contains_exactly, empty, is_
+
+from cmdweaver import basic_types
+from cmdweaver import interpreter as interpreter_module
+from cmdweaver.command import Command
+from cmdweaver.help_index import HelpIndex
+
+
+class TestHelpIndex:
+    @pytest.fixture
+    def show_interfaces(self):
+        return Command(["show", "interfaces"], help="Display interface counters", cmd_id="show-interfaces")
+
+    @pytest.fixture
+    def set_description(self):
+        return Command(
+            ["set", "description", basic_types.StringType("interface_name"), basic_types.StringType("text")],
+            help="Describe a port",
+        )
+
+    @pytest.fixture
+    def clear_counters(self):
+        return Command(["clear", "counters"], help="Reset all interface statistics", cmd_id="clear-stats")
+
+    @pytest.fixture
+    def reboot(self):
+        return Command(["reboot"], help="Restart the system")
+
+    @pytest.fixture
+    def index(self, show_interfaces, set_description, clear_counters, reboot):
+        index = HelpIndex()
+        for command in (show_interfaces, set_description, clear_counters, reboot):
+            index.add(command)
+        return index
+
+    def commands(self, index, query, limit=None):
+        return [command for command, _ in index.search(query, limit)]
+
+    def test_finds_commands_by_help_text(self, index, reboot):
+        assert_that(self.commands(index, "restart"), contains_exactly(reboot))
+
+    def test_finds_commands_by_cmd_id_and_slot_names(self, index, set_description, clear_counters):
+        assert_that(self.commands(index, "stats"), contains_exactly(clear_counters))
+        assert_that(self.commands(index, "name"), contains_exactly(set_description))
+
+    def test_ranks_keyword_matches_above_help_matches(self, index, show_interfaces, clear_counters):
+        assert_that(self.commands(index, "counters"), contains_exactly(clear_counters, show_interfaces))
+
+    def test_requires_every_query_term(self, index, clear_counters):
+        assert_that(self.commands(index, "interface reset"), contains_exactly(clear_counters))
+
+    def test_matches_term_prefixes(self, index, show_interfaces, set_description, clear_counters):
+        assert_that(self.commands(index, "interf"), contains_exactly(show_interfaces, set_description, clear_counters))
+
+    def test_ignores_case_and_punctuation(self, index, show_interfaces):
+        assert_that(self.commands(index, "SHOW-Interfaces!"), contains_exactly(show_interfaces))
+
+    def test_limits_the_results(self, index, show_interfaces):
+        assert_that(self.commands(index, "interf", limit=1), contains_exactly(show_interfaces))
+
+    @pytest.mark.parametrize("query", ["", "  ", "nothing", "restart nothing"])
+    def test_returns_nothing_without_matches(self, index, query):
+        assert_that(index.search(query), is_(empty()))
+
+    def test_indexes_commands_added_later(self, index, show_interfaces):
+        added = Command(["show", "version"], help="Display the software version")
+        index.search("display", limit=5)
+
+        index.add(added)
+
+        assert_that(self.commands(index, "display", limit=5), contains_exactly(show_interfaces, added))
+
+    def test_survives_pickling(self, index, reboot):
+        restored = pickle.loads(pickle.dumps(index))
+
+        assert_that([str(command) for command in self.commands(restored, "restart")], is_([str(reboot)]))
+
+
+class TestApropos:
+    def test_returns_ranked_help_for_commands_in_every_context(self):
+        interp = interpreter_module.Interpreter()
+        interp.add_command(
+            Command(["hostname", basic_types.StringType()], help="Set the hostname", context_name="config")
+        )
+        interp.add_command(Command(["show", "hostname"], help="Display the hostname"))
+
+        result = interp.apropos("hostname")
+
+        assert_that(
+            [(str(command), help) for command, help in result.items()],
+            contains_exactly(("hostname <StringType>", "Set the hostname"), ("show hostname", "Display the hostname")),
+        )
@@ -0,0 +1,114 @@
+import pytest
+from doublex import Spy, assert_that, called, when
+from hamcrest import contains_exactly, empty, is_
+
+from cmdweaver import basic_types
+from cmdweaver import interpreter as interpreter_module
+from cmdweaver.command import Command
+from cmdweaver.help_renderer import HelpRenderer
+from cmdweaver.registry import CommandRegistry
+
+
+class TestHelpRenderer:
+    @pytest.fixture
+    def registry(self):
+        return CommandRegistry(
+            [
+                Command(["show", "version"], help="Software version"),
+                Command(["reload"], help="Restart"),
+                Command(["hostname", basic_types.StringType("name")], help="Set the hostname", context_name="config"),
+                Command(["exit"], help="Leave the context", always=True),
+                Command(["clear"]),
+            ]
+        )
+
+    @pytest.fixture
+    def renderer(self, registry):
+        return HelpRenderer(registry, page_size=2)
+
+    def test_groups_commands_by_context(self, renderer):
+        assert_that(
+            [(group.context_name, group.always) for group in renderer.groups()],
+            contains_exactly((None, False), ("config", False), (None, True)),
+        )
+
+    def test_sorts_and_aligns_each_group(self, renderer):
+        assert_that(
+            renderer.group(None).lines(),
+            contains_exactly("clear", "reload        Restart", "show version  Software version"),
+        )
+
+    def test_streams_pages_for_every_group(self, renderer):
+        assert_that(
+            [(page.context_name, page.number, page.total, len(page.lines)) for page in renderer.pages()],
+            contains_exactly((None, 1, 2, 2), (None, 2, 2, 1), ("config", 1, 1, 1), (None, 1, 1, 1)),
+        )
+
+    def test_returns_pages_by_number(self, renderer):
+        assert_that(renderer.group(None).page(2, page_size=2).lines, is_(["show version  Software version"]))
+
+    def test_rejects_pages_out_of_range(self, renderer):
+        with pytest.raises(IndexError):
+            renderer.group(None).page(3, page_size=2)
+
+    def test_reuses_the_rendered_groups_until_commands_are_added(self, registry, renderer):
+        first = renderer.group(None)
+        assert_that(renderer.group(None), is_(first))
+
+        registry.add_command(Command(["show", "clock"], help="Current time"))
+
+        assert_that(renderer.group(None).lines(2, 3), is_(["show clock    Current time"]))
+        assert_that(renderer.group("config"), is_(renderer.group("config")))
+
+    def test_renders_dynamic_slots_without_calling_providers(self):
+        provider = Spy()
+        when(provider).versions().returns(["1.0", "2.0"])
+        renderer = HelpRenderer(
+            CommandRegistry(
+                [
+                    Command(["show", basic_types.DynamicOptionsType(provider.versions)]),
+                    Command(["load", basic_types.DynamicOptionsType(provider.versions, name="version")]),
+                    Command(["set", basic_types.OptionsType(["on", "off"])]),
+                ]
+            )
+        )
+
+        assert_that(
+            renderer.group(None).lines(),
+            contains_exactly("load <version>", "set <on|off>", "show <DynamicOptionsType>"),
+        )
+        assert_that(provider.versions, called().times(0))
+
+    def test_does_not_import_lazy_providers(self):
+        registry = CommandRegistry(
+            [Command(["show", basic_types.DynamicOptionsType("tests.unit.not_a_module:versions")])]
+        )
+
+        assert_that(HelpRenderer(registry).group(None).lines(), is_(["show <DynamicOptionsType>"]))
+
+    def test_renders_unknown_groups_as_empty(self, renderer):
+        assert_that(renderer.group("missing").lines(), is_(empty()))
+
+
+class TestInterpreterHelpPages:
+    def test_pages_the_commands_available_in_the_current_context(self):
+        interp = interpreter_module.Interpreter()
+        interp.add_command(Command(["configure"], help="Enter configuration"))
+        interp.add_command(Command(["hostname", basic_types.StringType()], help="Set it", context_name="config"))
+        interp.add_command(Command(["exit"], always=True))
+        interp.push_context("config")
+
+        lines = [line for page in interp.help_pages(page_size=10) for line in page.lines]
+
+        assert_that(lines, contains_exactly("hostname <StringType>  Set it", "exit"))
+
+    def test_sessions_sharing_a_registry_share_the_rendered_groups(self):
+        registry = CommandRegistry([Command(["show", "version"])])
+        first = interpreter_module.Interpreter(registry=registry)
+        second = interpreter_module.Interpreter(registry=registry)
+
+        list(first.help_pages())
+        list(second.help_pages())
+
+        assert_that(first.help_renderer, is_(second.help_renderer))
+        assert_that(first.help_renderer.group(None), is_(second.help_renderer.group(None)))
@@ -0,0 +1,64 @@
+import pytest
+from doublex import Spy, assert_that
+from hamcrest import contains_exactly, empty, is_
+
+from cmdweaver import basic_types, exceptions
+from cmdweaver import interpreter as interpreter_module
+from cmdweaver.command import Command
+from cmdweaver.index import KeywordTrie
+
+
+class TestKeywordTrie:
+    @pytest.fixture
+    def show_version(self):
+        return Command(["show", "version"])
+
+    @pytest.fixture
+    def show_interface(self):
+        return Command(["show", "interface", basic_types.StringType()])
+
+    @pytest.fixture
+    def show_anything(self):
+        return Command(["show", basic_types.StringType()])
+
+    @pytest.fixture
+    def typed_first(self):
+        return Command([basic_types.StringType(), "now"])
+
+    @pytest.fixture
+    def trie(self, show_version, show_interface, show_anything, typed_first):
+        trie = KeywordTrie()
+        for sequence, command in enumerate([show_version, show_interface, show_anything, typed_first]):
+            trie.add(sequence, command)
+        return trie
+
+    def test_returns_commands_under_the_keyword_path(self, trie, show_interface):
+        assert_that(trie.candidates(["show", "interface", "eth0"]), contains_exactly(show_interface))
+
+    def test_includes_typed_slot_fallbacks_in_registration_order(self, trie, show_version, show_anything, typed_first):
+        assert_that(trie.candidates(["show", "version"]), contains_exactly(show_version, show_anything, typed_first))
+
+    def test_only_returns_commands_with_the_same_arity(self, trie):
+        assert_that(trie.candidates(["show", "version", "extra"]), is_(empty()))
+
+    def test_falls_back_to_root_candidates_for_unknown_keywords(self, trie, typed_first):
+        assert_that(trie.candidates(["later", "now"]), contains_exactly(typed_first))
+
+
+class TestInterpreterDispatchIndex:
+    def test_does_not_try_commands_outside_the_keyword_path(self):
+        unrelated_type = Spy(basic_types.BaseType)
+        interp = interpreter_module.Interpreter()
+        interp.add_command(Command(["net", unrelated_type]))
+        interp.add_command(Command(["sys", "reboot"]))
+
+        interp.eval("sys reboot")
+
+        assert_that(unrelated_type.match.calls, is_(empty()))
+
+    def test_keeps_structural_fallback_for_indexed_commands(self):
+        interp = interpreter_module.Interpreter()
+        interp.add_command(Command(["pick", basic_types.OptionsType(["a", "b"])]))
+
+        with pytest.raises(exceptions.InvalidArgumentError):
+            interp.eval("pick z")
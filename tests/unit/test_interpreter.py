@@ -221,6 +221,75 @@ class TestInterpreter:
                 ),
             )
 
+    class TestDynamicOptionsProviders:
+        def test_calls_provider_once_per_evaluated_line(self, cmds_implementation):
+            provider = Spy()
+            when(provider).get_options().returns(["firstOp", "secondOp"])
+            interp = interpreter_module.Interpreter()
+            interp.add_command(
+                Command(["cmd1", basic_types.DynamicOptionsType(provider.get_options)], cmds_implementation.cmd1)
+            )
+
+            interp.eval("cmd1 first")
+
+            assert_that(provider.get_options, called().times(1))
+            assert_that(
+                cmds_implementation.cmd1, called().with_args("firstOp", tokens=["cmd1", "firstOp"], interpreter=interp)
+            )
+
+    class TestSinglePassResolution:
+        @pytest.fixture
+        def expensive_type(self):
+            expensive_type = Spy(basic_types.BaseType)
+            when(expensive_type).complete(ANY_ARG).returns([("value", True)])
+            return expensive_type
+
+        def test_expands_each_parameter_once_per_evaluated_line(self, cmds_implementation, expensive_type):
+            when(expensive_type).match(ANY_ARG).returns(True)
+            interp = interpreter_module.Interpreter()
+            interp.add_command(Command(["cmd1", expensive_type], cmds_implementation.cmd1))
+
+            interp.eval("cmd1 val")
+
+            assert_that(expensive_type.complete, called().times(1))
+            assert_that(
+                cmds_implementation.cmd1, called().with_args("value", tokens=["cmd1", "value"], interpreter=interp)
+            )
+
+        def test_expands_each_parameter_once_when_reporting_invalid_arguments(
+            self, cmds_implementation, expensive_type
+        ):
+            when(expensive_type).match(ANY_ARG).returns(False)
+            interp = interpreter_module.Interpreter()
+            interp.add_command(Command(["cmd1", expensive_type], cmds_implementation.cmd1))
+
+            with pytest.raises(exceptions.InvalidArgumentError):
+                interp.eval("cmd1 val")
+
+            assert_that(expensive_type.complete, called().times(1))
+
+    class TestResolve:
+        def test_returns_normalized_tokens_and_no_errors_for_valid_line(self):
+            command = Command(["set", basic_types.OptionsType(["prod", "staging"], name="env")])
+
+            result = command.resolve(["set", "st"], interpreter_module.DefaultContext())
+
+            assert_that(result.tokens, is_(["set", "staging"]))
+            assert_that(result.is_valid, is_(True))
+
+        def test_returns_argument_errors_for_invalid_slots(self):
+            command = Command(["set", basic_types.OptionsType(["prod", "staging"], name="env")])
+
+            result = command.resolve(["set", "banana"], interpreter_module.DefaultContext())
+
+            assert_that(result.is_valid, is_(False))
+            assert_that(result.argument_errors[0].value, is_("banana"))
+
+        def test_returns_none_when_keywords_do_not_match(self):
+            command = Command(["set", basic_types.StringType()])
+
+            assert_that(command.resolve(["get", "x"], interpreter_module.DefaultContext()), is_(none()))
+
     class TestInvalidArgument:
         def test_reports_invalid_option_in_named_slot(self, cmds_implementation):
             interp = interpreter_module.Interpreter()
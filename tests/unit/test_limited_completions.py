@@ -0,0 +1,113 @@
+import itertools
+
+import pytest
+from doublex import Stub, assert_that
+from hamcrest import contains_exactly, is_
+
+from cmdweaver import basic_types
+from cmdweaver import interpreter as interpreter_module
+from cmdweaver.command import Command
+
+
+class EndlessType(basic_types.BaseType):
+    def __init__(self):
+        super().__init__("endless")
+        self.pulled = 0
+
+    def partial_match(self, word, context, partial_line=None):
+        return True
+
+    def iter_complete(self, token, tokens, context):
+        for number in itertools.count():
+            self.pulled += 1
+            yield f"{token}{number:06d}", True
+
+
+class TestLimitedCompletions:
+    @pytest.fixture
+    def hosts(self):
+        return basic_types.OptionsType([f"host{number:06d}" for number in range(100_000)])
+
+    @pytest.fixture
+    def interpreter(self, hosts):
+        implementation = Stub()
+        interp = interpreter_module.Interpreter()
+        interp.add_command(Command(["ping", hosts], implementation.ping))
+        interp.add_command(Command(["ping", "help"], implementation.ping_help))
+        interp.add_command(Command(["sys", "reboot"], implementation.reboot))
+        interp.add_command(Command(["sys", "shutdown"], implementation.shutdown))
+        return interp
+
+    def test_returns_the_first_completions_in_order(self, interpreter):
+        result = interpreter.complete_limited("ping ", 3)
+
+        assert_that(result.completions, contains_exactly("help", "host000000", "host000001"))
+        assert_that(result.has_more, is_(True))
+
+    def test_narrows_large_domains_by_prefix(self, interpreter):
+        result = interpreter.complete_limited("ping host04999", 20)
+
+        assert_that(result.completions, is_([f"host04999{digit}" for digit in range(10)]))
+        assert_that(result.has_more, is_(False))
+
+    def test_matches_complete_when_under_the_limit(self, interpreter):
+        result = interpreter.complete_limited("sys ", 10)
+
+        assert_that(set(result.completions), is_(interpreter.complete("sys ")))
+        assert_that(result.has_more, is_(False))
+
+    def test_reports_more_only_when_completions_were_left_out(self, interpreter):
+        assert_that(interpreter.complete_limited("sys ", 2).has_more, is_(False))
+        assert_that(interpreter.complete_limited("sys ", 1).has_more, is_(True))
+
+    def test_stops_pulling_from_types_after_the_limit(self):
+        endless = EndlessType()
+        interp = interpreter_module.Interpreter()
+        interp.add_command(Command(["tag", endless]))
+
+        result = interp.complete_limited("tag t", 5)
+
+        assert_that(len(result.completions), is_(5))
+        assert_that(endless.pulled, is_(6))
+
+    def test_merges_or_type_members_in_sorted_order(self):
+        interp = interpreter_module.Interpreter()
+        interp.add_command(
+            Command(
+                [
+                    "connect",
+                    basic_types.OrType(
+                        basic_types.OptionsType(["zeta", "zulu"]), basic_types.OptionsType(["alpha", "beta"])
+                    ),
+                ]
+            )
+        )
+        interp.add_command(Command(["connect", basic_types.OptionsType(["mid"]), "now"]))
+
+        result = interp.complete_limited("connect ", 3)
+
+        assert_that(result.completions, contains_exactly("alpha", "beta", "mid "))
+        assert_that(result.has_more, is_(True))
+
+    def test_sorts_completions_of_types_that_do_not_stream(self):
+        class UnsortedType(basic_types.BaseType):
+            def partial_match(self, word, context, partial_line=None):
+                return True
+
+            def complete(self, token, tokens, context):
+                return [("zebra", True), ("apple", True), ("mango", True)]
+
+        interp = interpreter_module.Interpreter()
+        interp.add_command(Command(["fruit", UnsortedType()]))
+
+        assert_that(interp.complete_limited("fruit ", 2).completions, contains_exactly("apple", "mango"))
+
+
+class TestOptionsTypeIterComplete:
+    def test_yields_matching_options_lazily_in_sorted_order(self):
+        options = basic_types.OptionsType(["beta", "alpha", "alps", "gamma"])
+
+        completions = options.iter_complete("al", ["al"], interpreter_module.DefaultContext())
+
+        assert_that(next(completions), is_(("alpha", True)))
+        assert_that(list(completions), is_([("alps", True)]))
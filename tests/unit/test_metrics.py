@@ -0,0 +1,182 @@
+import threading
+import urllib.request
+
+import pytest
+from doublex import Spy, assert_that, called, when
+from hamcrest import contains_string, has_entries, is_
+
+from cmdweaver import basic_types, exceptions
+from cmdweaver import interpreter as interpreter_module
+from cmdweaver.command import Command
+from cmdweaver.metrics import MetricsRegistry
+
+
+class TestMetricsRegistry:
+    @pytest.fixture
+    def metrics(self):
+        return MetricsRegistry(buckets=(0.1, 1.0))
+
+    def test_adds_counters_per_labels(self, metrics):
+        metrics.increment("requests_total", (("kind", "a"),))
+        metrics.increment("requests_total", (("kind", "a"),), amount=2)
+        metrics.increment("requests_total", (("kind", "b"),))
+
+        assert_that(
+            metrics.snapshot()["counters"],
+            is_({'requests_total{kind="a"}': 3, 'requests_total{kind="b"}': 1}),
+        )
+
+    def test_fills_cumulative_histogram_buckets(self, metrics):
+        for value in [0.05, 0.1, 0.5, 3.0]:
+            metrics.observe("latency_seconds", value)
+
+        assert_that(
+            metrics.snapshot()["histograms"]["latency_seconds"],
+            is_({"count": 4, "sum": 3.65, "buckets": {"0.1": 2, "1.0": 3, "+Inf": 4}}),
+        )
+
+    def test_merges_updates_from_many_threads(self, metrics):
+        def work():
+            for _ in range(1000):
+                metrics.increment("ops_total")
+                metrics.observe("latency_seconds", 0.5)
+
+        threads = [threading.Thread(target=work) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert_that(metrics.snapshot()["counters"]["ops_total"], is_(8000))
+        assert_that(metrics.snapshot()["histograms"]["latency_seconds"]["count"], is_(8000))
+
+    def test_renders_prometheus_text(self, metrics):
+        metrics.describe("requests_total", "Handled requests")
+        metrics.increment("requests_total", (("path", 'a"b'),))
+        metrics.observe("latency_seconds", 0.5)
+
+        assert_that(
+            metrics.prometheus_text(),
+            is_(
+                "# HELP requests_total Handled requests\n"
+                "# TYPE requests_total counter\n"
+                'requests_total{path="a\\"b"} 1\n'
+                "# TYPE latency_seconds histogram\n"
+                'latency_seconds_bucket{le="0.1"} 0\n'
+                'latency_seconds_bucket{le="1.0"} 1\n'
+                'latency_seconds_bucket{le="+Inf"} 1\n'
+                "latency_seconds_sum 0.5\n"
+                "latency_seconds_count 1\n"
+            ),
+        )
+
+    def test_writes_prometheus_text_to_a_file(self, metrics, tmp_path):
+        metrics.increment("requests_total")
+        path = tmp_path / "cmdweaver.prom"
+
+        metrics.write_prometheus(path)
+
+        assert_that(path.read_text(), contains_string("requests_total 1"))
+
+    def test_serves_prometheus_text_over_http(self, metrics):
+        metrics.increment("requests_total")
+
+        with metrics.serve() as server:
+            host, port = server.address
+            with urllib.request.urlopen(f"http://{host}:{port}/metrics", timeout=5) as response:
+                body = response.read().decode()
+
+        assert_that(body, contains_string("requests_total 1"))
+
+
+class TestInterpreterMetrics:
+    @pytest.fixture
+    def metrics(self):
+        return MetricsRegistry()
+
+    @pytest.fixture
+    def interpreter(self, metrics):
+        interpreter = interpreter_module.Interpreter(metrics=metrics, dispatch_cache_size=16)
+        interpreter.add_command(Command(["show", "version"], cmd_id="show-version"))
+        interpreter.add_command(Command(["set", basic_types.OptionsType(["on", "off"])]))
+        return interpreter
+
+    def test_records_eval_latency_per_command(self, interpreter, metrics):
+        interpreter.eval("show version")
+        interpreter.eval("show version")
+        interpreter.eval("set on")
+
+        assert_that(
+            metrics.snapshot()["histograms"],
+            has_entries(
+                {
+                    'cmdweaver_eval_seconds{cmd_id="show-version"}': has_entries(count=2),
+                    'cmdweaver_eval_seconds{cmd_id="set <OptionsType>"}': has_entries(count=1),
+                }
+            ),
+        )
+
+    def test_labels_unnamed_commands_without_calling_providers(self, metrics):
+        provider = Spy()
+        when(provider).hosts().returns(["h1", "h2"])
+        interpreter = interpreter_module.Interpreter(metrics=metrics)
+        interpreter.add_command(Command(["ping", basic_types.DynamicOptionsType(provider.hosts)]))
+        interpreter.add_command(Command(["trace", basic_types.DynamicOptionsType(provider.hosts, name="host")]))
+
+        interpreter.eval("ping h1")
+        interpreter.eval("trace h2")
+
+        assert_that(provider.hosts, called().times(2))
+        assert_that(
+            metrics.snapshot()["histograms"],
+            has_entries(
+                {
+                    'cmdweaver_eval_seconds{cmd_id="ping <DynamicOptionsType>"}': has_entries(count=1),
+                    'cmdweaver_eval_seconds{cmd_id="trace <host>"}': has_entries(count=1),
+                }
+            ),
+        )
+
+    @pytest.mark.parametrize(
+        "line,error",
+        [
+            ("unknown", exceptions.NoMatchingCommandFoundError),
+            ("set maybe", exceptions.InvalidArgumentError),
+        ],
+    )
+    def test_counts_dispatch_errors_by_type(self, interpreter, metrics, line, error):
+        with pytest.raises(error):
+            interpreter.eval(line)
+
+        assert_that(
+            metrics.snapshot()["counters"],
+            has_entries({f'cmdweaver_dispatch_errors_total{{error="{error.__name__}"}}': 1}),
+        )
+
+    def test_records_completion_latency(self, interpreter, metrics):
+        interpreter.complete("sh")
+
+        assert_that(metrics.snapshot()["histograms"], has_entries({"cmdweaver_complete_seconds": has_entries(count=1)}))
+
+    def test_reports_the_dispatch_cache_hit_rate(self, interpreter, metrics):
+        for _ in range(4):
+            interpreter.eval("show version")
+
+        assert_that(metrics.snapshot()["dispatch_cache_hit_rate"], is_(0.75))
+
+    def test_counts_completion_cache_lookups(self, metrics):
+        interpreter = interpreter_module.Interpreter(metrics=metrics, completion_cache_size=16)
+        interpreter.add_command(Command(["show", "version"]))
+
+        interpreter.complete("sh")
+        interpreter.complete("sh")
+
+        assert_that(
+            metrics.snapshot()["counters"],
+            has_entries(
+                {
+                    'cmdweaver_completion_cache_lookups_total{result="hit"}': 1,
+                    'cmdweaver_completion_cache_lookups_total{result="miss"}': 1,
+                }
+            ),
+        )
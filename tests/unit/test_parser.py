@@ -0,0 +1,74 @@
+import random
+import shlex
+
+import pytest
+from doublex import assert_that
+from hamcrest import is_
+
+from cmdweaver import parser
+
+SHLEX_CASES = [
+    "",
+    "   ",
+    "show version",
+    "  show\tversion\r\n",
+    'description "uplink to core"',
+    "description 'uplink to core'",
+    'say "a \\"quoted\\" word"',
+    'path "c:\\dir\\file"',
+    'trailing "\\\\"',
+    r"escaped\ space",
+    r"escaped\"quote",
+    "empty '' \"\" tokens",
+    "glued'single'\"double\"parts",
+    'it\'s "here"',
+    "hash # is not a comment",
+    "non\xa0breaking\u3000spaces\x0bstay",
+    "unicode café ñandú",
+    "unclosed 'quote",
+    'unclosed "quote',
+    'unclosed "escaped\\"',
+    'unclosed "escape\\',
+    "dangling escape\\",
+]
+
+ALPHABET = ["a", "b", " ", "\t", "\n", "'", '"', "\\", "#", "\x0b", "\xa0", "é", "="]
+
+
+def shlex_result(line):
+    try:
+        return shlex.split(line)
+    except ValueError as error:
+        return ("error", str(error))
+
+
+def tokenize_result(line):
+    try:
+        return parser.tokenize(line)
+    except ValueError as error:
+        return ("error", str(error))
+
+
+class TestTokenize:
+    @pytest.mark.parametrize("line", SHLEX_CASES)
+    def test_behaves_like_shlex(self, line):
+        assert_that(tokenize_result(line), is_(shlex_result(line)))
+
+    def test_behaves_like_shlex_for_random_lines(self):
+        generator = random.Random(1234)
+
+        for _ in range(5000):
+            line = "".join(generator.choice(ALPHABET) for _ in range(generator.randint(0, 12)))
+
+            assert_that(tokenize_result(line), is_(shlex_result(line)))
+
+
+class TestParser:
+    def test_adds_empty_token_when_line_ends_with_space(self):
+        assert_that(parser.Parser().parse("show "), is_(["show", ""]))
+
+    def test_adds_empty_token_after_quoted_token_followed_by_space(self):
+        assert_that(parser.Parser().parse('say "hi there" '), is_(["say", "hi there", ""]))
+
+    def test_does_not_add_empty_token_without_trailing_space(self):
+        assert_that(parser.Parser().parse("show"), is_(["show"]))
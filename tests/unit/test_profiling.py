@@ -0,0 +1,128 @@
+import io
+
+import pytest
+from doublex import Spy, assert_that
+from hamcrest import contains_exactly, contains_string, empty, has_properties, is_
+
+from cmdweaver import basic_types, exceptions
+from cmdweaver import interpreter as interpreter_module
+from cmdweaver.command import Command
+from cmdweaver.profiling import PhaseEvent, ProfileCollector
+
+
+class TestProfileHooks:
+    @pytest.fixture
+    def events(self):
+        return []
+
+    @pytest.fixture
+    def interpreter(self, events):
+        interpreter = interpreter_module.Interpreter()
+        interpreter.add_command(
+            Command(
+                ["set", basic_types.OptionsType(["on", "off"]), basic_types.StringType()],
+                lambda *args, **kwargs: "done",
+            )
+        )
+        interpreter.add_command(
+            Command(["configure"], lambda interpreter, **kwargs: interpreter.push_context("config"))
+        )
+        interpreter.add_profile_hook(events.append)
+        return interpreter
+
+    def test_emits_one_event_per_phase_and_typed_slot(self, interpreter, events):
+        interpreter.eval("set on label")
+
+        assert_that(
+            [(event.phase, event.slot_type) for event in events],
+            contains_exactly(
+                ("parse", None),
+                ("select", None),
+                ("validate", "OptionsType"),
+                ("validate", "StringType"),
+                ("execute", None),
+            ),
+        )
+
+    def test_attaches_the_line_and_the_command(self, interpreter, events):
+        interpreter.eval("  set on label ")
+
+        assert_that(events[-1], has_properties(line="set on label", command=interpreter.active_commands()[0]))
+
+    def test_attaches_the_context_the_command_ran_in(self, interpreter, events):
+        interpreter.eval("configure")
+
+        assert_that(events[-1].context.is_default(), is_(True))
+
+    def test_emits_events_for_lines_that_fail_to_match(self, interpreter, events):
+        with pytest.raises(exceptions.NoMatchingCommandFoundError):
+            interpreter.eval("unknown")
+
+        assert_that([event.phase for event in events], contains_exactly("parse", "select"))
+
+    def test_stops_emitting_once_the_hook_is_removed(self, interpreter, events):
+        interpreter.remove_profile_hook(events.append)
+
+        interpreter.eval("set on label")
+
+        assert_that(events, is_(empty()))
+
+    def test_does_not_change_dispatch(self, interpreter):
+        with pytest.raises(exceptions.InvalidArgumentError):
+            interpreter.eval("set maybe label")
+
+
+class TestProfileCollector:
+    @pytest.fixture
+    def collector(self):
+        collector = ProfileCollector()
+        context = interpreter_module.DefaultContext()
+        show = Command(["show"])
+        reload = Command(["reload"])
+        for event in [
+            PhaseEvent("parse", "show", 0.001, context),
+            PhaseEvent("execute", "show", 0.002, context, show),
+            PhaseEvent("execute", "reload", 0.5, context, reload),
+            PhaseEvent("execute", "reload", 0.3, context, reload),
+            PhaseEvent("validate", "show x", 0.004, context, show, "OptionsType"),
+        ]:
+            collector(event)
+        return collector
+
+    def test_aggregates_per_phase(self, collector):
+        assert_that(
+            [(entry.name, entry.calls) for entry in collector.phases()],
+            contains_exactly(("execute", 3), ("validate", 1), ("parse", 1)),
+        )
+
+    def test_ranks_the_slowest_commands_first(self, collector):
+        slowest = collector.commands(limit=1)[0]
+
+        assert_that(slowest, has_properties(name="execute: reload", calls=2, slowest=0.5))
+        assert_that(slowest.mean, is_(pytest.approx(0.4)))
+
+    def test_aggregates_per_type(self, collector):
+        assert_that([entry.name for entry in collector.types()], contains_exactly("OptionsType"))
+
+    def test_prints_a_report(self, collector):
+        output = io.StringIO()
+
+        collector.report(file=output)
+
+        assert_that(output.getvalue(), contains_string("execute: reload"))
+
+    def test_can_be_reset(self, collector):
+        collector.reset()
+
+        assert_that(collector.phases(), is_(empty()))
+
+    def test_collects_from_an_interpreter(self):
+        collector = ProfileCollector()
+        handler = Spy()
+        interpreter = interpreter_module.Interpreter()
+        interpreter.add_command(Command(["show"], handler.show))
+        interpreter.add_profile_hook(collector)
+
+        interpreter.eval("show")
+
+        assert_that([entry.name for entry in collector.commands()], contains_exactly("execute: show"))
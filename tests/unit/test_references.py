@@ -0,0 +1,106 @@
+import sys
+import textwrap
+
+import pytest
+from doublex import assert_that
+from hamcrest import contains_exactly, is_
+
+from cmdweaver import basic_types
+from cmdweaver import interpreter as interpreter_module
+from cmdweaver.command import Command
+from cmdweaver.references import reference_for, resolve_reference
+
+HEAVY_MODULE = """
+def greet(name, **kwargs):
+    return f"hello {name}"
+
+
+def ports():
+    return ["eth0", "eth1"]
+
+
+class Handlers:
+    @staticmethod
+    def reload(**kwargs):
+        return "reloading"
+
+
+NOT_CALLABLE = 42
+"""
+
+
+def is_imported():
+    return "lazy_heavy_module" in sys.modules
+
+
+@pytest.fixture
+def heavy_module(tmp_path, monkeypatch):
+    (tmp_path / "lazy_heavy_module.py").write_text(textwrap.dedent(HEAVY_MODULE))
+    monkeypatch.syspath_prepend(str(tmp_path))
+    yield
+    sys.modules.pop("lazy_heavy_module", None)
+
+
+class TestResolveReference:
+    def test_resolves_dotted_attributes(self, heavy_module):
+        assert_that(resolve_reference("lazy_heavy_module:Handlers.reload")(), is_("reloading"))
+
+    @pytest.mark.parametrize("reference", ["lazy_heavy_module", "lazy_heavy_module:", ":greet"])
+    def test_rejects_malformed_references(self, reference):
+        with pytest.raises(ValueError):
+            resolve_reference(reference)
+
+    def test_raises_import_error_for_missing_attributes(self, heavy_module):
+        with pytest.raises(ImportError):
+            resolve_reference("lazy_heavy_module:missing")
+
+    def test_rejects_references_to_non_callables(self, heavy_module):
+        with pytest.raises(TypeError):
+            resolve_reference("lazy_heavy_module:NOT_CALLABLE")
+
+    def test_builds_references_for_importable_callables(self, heavy_module):
+        greet = resolve_reference("lazy_heavy_module:greet")
+        handlers = sys.modules["lazy_heavy_module"].Handlers
+
+        assert_that(reference_for(greet), is_("lazy_heavy_module:greet"))
+        assert_that(reference_for(handlers.reload), is_("lazy_heavy_module:Handlers.reload"))
+
+    def test_has_no_reference_for_local_callables(self):
+        assert_that(reference_for(lambda: None), is_(None))
+        assert_that(reference_for("x".upper), is_(None))
+
+
+class TestLazyHandlers:
+    def test_does_not_import_the_handler_module_when_registering(self, heavy_module):
+        interpreter = interpreter_module.Interpreter()
+        interpreter.add_command(Command(["greet", basic_types.StringType()], "lazy_heavy_module:greet"))
+
+        interpreter.help("gr")
+
+        assert_that(is_imported(), is_(False))
+
+    def test_imports_the_handler_on_first_execution(self, heavy_module):
+        interpreter = interpreter_module.Interpreter()
+        interpreter.add_command(Command(["greet", basic_types.StringType()], "lazy_heavy_module:greet"))
+
+        results = [interpreter.eval("greet ana"), interpreter.eval("greet bob")]
+
+        assert_that(results, contains_exactly("hello ana", "hello bob"))
+        assert_that(is_imported(), is_(True))
+
+    def test_keeps_the_reference(self, heavy_module):
+        command = Command(["greet"], "lazy_heavy_module:greet")
+
+        assert_that(command.command_function, is_(sys.modules["lazy_heavy_module"].greet))
+        assert_that(command.handler_reference, is_("lazy_heavy_module:greet"))
+
+    def test_rejects_malformed_references_when_registering(self):
+        with pytest.raises(ValueError):
+            Command(["greet"], "not-a-reference")
+
+    def test_loads_dynamic_options_providers_on_first_use(self, heavy_module):
+        interpreter = interpreter_module.Interpreter()
+        interpreter.add_command(Command(["port", basic_types.DynamicOptionsType("lazy_heavy_module:ports")]))
+
+        assert_that(is_imported(), is_(False))
+        assert_that(interpreter.complete("port "), is_({"eth0", "eth1"}))
@@ -0,0 +1,84 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from doublex import Spy, assert_that, called
+from hamcrest import is_
+
+from cmdweaver import exceptions
+from cmdweaver import interpreter as interpreter_module
+from cmdweaver.command import Command
+from cmdweaver.registry import CommandRegistry
+
+
+class TestCommandRegistry:
+    @pytest.fixture
+    def implementation(self):
+        return Spy()
+
+    @pytest.fixture
+    def registry(self, implementation):
+        return CommandRegistry(
+            [
+                Command(["configure"], implementation.configure),
+                Command(["hostname"], implementation.hostname, context_name="config"),
+            ]
+        ).freeze()
+
+    def test_sessions_share_the_registered_commands(self, registry, implementation):
+        first = interpreter_module.Interpreter(registry=registry)
+        second = interpreter_module.Interpreter(registry=registry)
+
+        first.eval("configure")
+        second.eval("configure")
+
+        assert_that(implementation.configure, called().times(2))
+
+    def test_sessions_keep_their_own_context_stack(self, registry, implementation):
+        first = interpreter_module.Interpreter(registry=registry)
+        second = interpreter_module.Interpreter(registry=registry)
+
+        first.push_context("config")
+        first.eval("hostname")
+
+        with pytest.raises(exceptions.NoMatchingCommandFoundError):
+            second.eval("hostname")
+
+    def test_sessions_keep_their_own_context_data(self, registry):
+        first = interpreter_module.Interpreter(registry=registry)
+        second = interpreter_module.Interpreter(registry=registry)
+
+        first.actual_context().data["user"] = "alice"
+
+        assert_that(second.actual_context().data, is_({}))
+
+    def test_rejects_new_commands_once_frozen(self, registry):
+        with pytest.raises(exceptions.RegistryFrozenError):
+            registry.add_command(Command(["late"]))
+
+    def test_rejects_new_commands_through_sessions_once_frozen(self, registry):
+        session = interpreter_module.Interpreter(registry=registry)
+
+        with pytest.raises(exceptions.RegistryFrozenError):
+            session.add_command(Command(["late"]))
+
+    def test_interpreter_owns_a_private_registry_by_default(self):
+        first = interpreter_module.Interpreter()
+        second = interpreter_module.Interpreter()
+
+        first.add_command(Command(["only_first"]))
+
+        assert_that(len(first.registry), is_(1))
+        assert_that(len(second.registry), is_(0))
+
+    def test_serves_concurrent_sessions(self, registry):
+        def run_session(_):
+            session = interpreter_module.Interpreter(registry=registry)
+            session.eval("configure")
+            session.push_context("config")
+            session.eval("hostname")
+            return session.actual_context().context_name
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            contexts = list(executor.map(run_session, range(200)))
+
+        assert_that(set(contexts), is_({"config"}))
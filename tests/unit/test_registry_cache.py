@@ -0,0 +1,193 @@
+import importlib
+import os
+import stat
+import sys
+import textwrap
+
+import pytest
+from doublex import assert_that
+from hamcrest import is_
+
+from cmdweaver import basic_types, registry_cache
+from cmdweaver import interpreter as interpreter_module
+from cmdweaver.command import Command
+from cmdweaver.registry import CommandRegistry
+
+BUILDS = []
+
+HANDLER_MODULE = """
+def show(version, **kwargs):
+    return f"showing {version}"
+
+
+def versions():
+    return ["1.0", "2.0"]
+"""
+
+posix_only = pytest.mark.skipif(not hasattr(os, "getuid"), reason="ownership checks need POSIX")
+
+
+def set_mode(mode, **kwargs):
+    return f"mode {mode}"
+
+
+def set_address(address, **kwargs):
+    return f"address {address}"
+
+
+def list_ports():
+    return ["eth0", "eth1"]
+
+
+def build_registry():
+    BUILDS.append(True)
+    return CommandRegistry(
+        [
+            Command(["set", "mode", basic_types.OptionsType(["fast", "slow"])], set_mode),
+            Command(["set", "address", basic_types.RegexType(r"^\d+\.\d+\.\d+\.\d+$")], set_address),
+            Command(["port", basic_types.DynamicOptionsType(list_ports, cache_ttl=60)], set_mode),
+            Command(["configure"], "tests.unit.test_registry_cache:set_mode", enters_context="config"),
+        ]
+    ).freeze()
+
+
+class TestRegistryCache:
+    @pytest.fixture(autouse=True)
+    def builds(self):
+        BUILDS.clear()
+        return BUILDS
+
+    @pytest.fixture
+    def cache_path(self, tmp_path):
+        return tmp_path / "commands.cache"
+
+    @pytest.fixture
+    def handler_module(self, tmp_path, monkeypatch):
+        (tmp_path / "cached_handlers.py").write_text(textwrap.dedent(HANDLER_MODULE))
+        monkeypatch.syspath_prepend(str(tmp_path))
+        yield importlib.import_module("cached_handlers")
+        sys.modules.pop("cached_handlers", None)
+
+    def test_builds_and_writes_the_cache_on_first_start(self, cache_path, builds):
+        registry_cache.load_or_build(cache_path, "v1", build_registry)
+
+        assert_that(len(builds), is_(1))
+        assert_that(cache_path.exists(), is_(True))
+
+    def test_loads_the_cache_on_later_starts(self, cache_path, builds):
+        registry_cache.load_or_build(cache_path, "v1", build_registry)
+
+        registry = registry_cache.load_or_build(cache_path, "v1", build_registry)
+
+        assert_that(len(builds), is_(1))
+        assert_that(registry.frozen, is_(True))
+
+    def test_loaded_registry_dispatches_like_the_built_one(self, cache_path):
+        registry_cache.load_or_build(cache_path, "v1", build_registry)
+        interpreter = interpreter_module.Interpreter(registry=registry_cache.load(cache_path, "v1"))
+
+        assert_that(interpreter.eval("set mode f"), is_("mode fast"))
+        assert_that(interpreter.eval("set address 10.0.0.1"), is_("address 10.0.0.1"))
+        assert_that(interpreter.eval("port eth1"), is_("mode eth1"))
+        assert_that(interpreter.complete("set mode "), is_({"fast", "slow"}))
+
+    def test_caches_registries_that_already_rendered_help(self, cache_path):
+        registry = build_registry()
+        registry.help_renderer.groups()
+        registry_cache.save(registry, cache_path, "v1")
+
+        loaded = registry_cache.load(cache_path, "v1")
+
+        assert_that(loaded.help_renderer.registry, is_(loaded))
+        assert_that(loaded.help_renderer.groups(), is_(registry.help_renderer.groups()))
+
+    def test_stores_resolved_lazy_handlers_by_reference(self, cache_path):
+        registry = build_registry()
+        registry.commands()[3].execute("fast")
+        registry_cache.save(registry, cache_path, "v1")
+
+        configure = registry_cache.load(cache_path, "v1").commands()[3]
+
+        assert_that(configure.handler_reference, is_("tests.unit.test_registry_cache:set_mode"))
+        assert_that(configure.execute("slow"), is_("mode slow"))
+
+    def test_loads_handlers_and_providers_lazily(self, cache_path, handler_module):
+        registry = CommandRegistry(
+            [Command(["show", basic_types.DynamicOptionsType(handler_module.versions)], handler_module.show)]
+        )
+        registry_cache.save(registry, cache_path, "v1")
+        del sys.modules["cached_handlers"]
+
+        interpreter = interpreter_module.Interpreter(registry=registry_cache.load(cache_path, "v1"))
+
+        assert_that("cached_handlers" in sys.modules, is_(False))
+        assert_that(interpreter.eval("show 1.0"), is_("showing 1.0"))
+
+    @posix_only
+    def test_ignores_caches_writable_by_others(self, cache_path, builds):
+        registry_cache.load_or_build(cache_path, "v1", build_registry)
+        cache_path.chmod(0o666)
+
+        assert_that(registry_cache.load(cache_path, "v1"), is_(None))
+
+    @posix_only
+    def test_ignores_caches_owned_by_other_users(self, cache_path, monkeypatch):
+        registry_cache.load_or_build(cache_path, "v1", build_registry)
+        monkeypatch.setattr(registry_cache.os, "getuid", lambda: os.stat(cache_path).st_uid + 1)
+
+        assert_that(registry_cache.load(cache_path, "v1"), is_(None))
+
+    @posix_only
+    def test_writes_caches_in_private_directories(self, tmp_path):
+        cache_path = tmp_path / "nested" / "commands.cache"
+
+        registry_cache.save(build_registry(), cache_path, "v1")
+
+        assert_that(stat.S_IMODE(os.stat(cache_path.parent).st_mode), is_(0o700))
+        assert_that(stat.S_IMODE(os.stat(cache_path).st_mode), is_(0o600))
+
+    def test_defaults_to_the_user_cache_directory(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(registry_cache.sys, "platform", "linux")
+        monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+
+        assert_that(registry_cache.default_path("myshell"), is_(str(tmp_path / "cmdweaver" / "myshell.cache")))
+
+    def test_rebuilds_when_the_source_hash_changes(self, cache_path, builds):
+        registry_cache.load_or_build(cache_path, "v1", build_registry)
+
+        registry_cache.load_or_build(cache_path, "v2", build_registry)
+
+        assert_that(len(builds), is_(2))
+        assert_that(registry_cache.load(cache_path, "v2") is not None, is_(True))
+
+    @pytest.mark.parametrize("content", [b"", b"garbage", registry_cache._MAGIC + b"\x80\x05truncated"])
+    def test_rebuilds_when_the_cache_is_corrupt(self, cache_path, builds, content):
+        cache_path.write_bytes(content)
+
+        registry = registry_cache.load_or_build(cache_path, "v1", build_registry)
+
+        assert_that(len(builds), is_(1))
+        assert_that(len(registry), is_(4))
+
+    def test_skips_the_cache_when_handlers_cannot_be_pickled(self, cache_path):
+        registry = registry_cache.load_or_build(
+            cache_path, "v1", lambda: CommandRegistry([Command(["show"], lambda **kwargs: None)])
+        )
+
+        assert_that(len(registry), is_(1))
+        assert_that(list(cache_path.parent.iterdir()), is_([]))
+
+
+class TestDefinitionsHash:
+    def test_changes_with_the_source_content(self, tmp_path):
+        source = tmp_path / "commands.py"
+        source.write_text("one")
+        first = registry_cache.definitions_hash(source)
+        source.write_text("two")
+
+        assert_that(registry_cache.definitions_hash(source) == first, is_(False))
+
+    def test_accepts_raw_bytes(self):
+        assert_that(
+            registry_cache.definitions_hash(b"ab", b"c") == registry_cache.definitions_hash(b"a", b"bc"), is_(False)
+        )
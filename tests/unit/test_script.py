@@ -0,0 +1,97 @@
+import pytest
+from doublex import Spy, assert_that, called
+from hamcrest import contains_exactly, has_properties, instance_of, is_
+
+from cmdweaver import basic_types, exceptions
+from cmdweaver import interpreter as interpreter_module
+from cmdweaver.command import Command
+
+SCRIPT = """# replayed configuration
+set 1
+
+set two
+  # indented comment
+set 3
+"""
+
+
+class TestRunScript:
+    @pytest.fixture
+    def interpreter(self):
+        interpreter = interpreter_module.Interpreter()
+        interpreter.add_command(
+            Command(["set", basic_types.IntegerType(min=0)], lambda value, **kwargs: int(value) * 10)
+        )
+        interpreter.add_command(Command(["quit"], lambda interpreter, **kwargs: interpreter.exit()))
+        return interpreter
+
+    @pytest.fixture
+    def script_path(self, tmp_path):
+        path = tmp_path / "commands.txt"
+        path.write_text(SCRIPT)
+        return path
+
+    def test_yields_results_of_a_memory_mapped_file(self, interpreter, script_path):
+        results = list(interpreter.run_script(script_path, on_error="skip"))
+
+        assert_that([(result.line_number, result.result) for result in results], contains_exactly((2, 10), (6, 30)))
+
+    def test_accepts_any_iterable_of_lines(self, interpreter):
+        results = interpreter.run_script(iter(["set 1\n", "set 2\r\n"]))
+
+        assert_that([result.result for result in results], contains_exactly(10, 20))
+
+    def test_evaluates_lines_lazily(self, interpreter):
+        handler = Spy()
+        interpreter.add_command(Command(["touch"], handler.touch))
+
+        results = interpreter.run_script(["touch", "touch"])
+        next(results)
+
+        assert_that(handler.touch, called().times(1))
+
+    def test_stops_on_the_first_error_by_default(self, interpreter, script_path):
+        results = interpreter.run_script(script_path)
+
+        assert_that(next(results).result, is_(10))
+        with pytest.raises(exceptions.ScriptError) as error:
+            next(results)
+        assert_that(error.value, has_properties(line_number=4, line="set two"))
+        assert_that(error.value.error, instance_of(exceptions.InvalidArgumentError))
+
+    def test_collects_errors_with_their_line_numbers(self, interpreter, script_path):
+        results = list(interpreter.run_script(script_path, on_error="collect"))
+
+        assert_that(
+            [(result.line_number, result.ok) for result in results], contains_exactly((2, True), (4, False), (6, True))
+        )
+
+    def test_evaluates_comments_when_comment_skipping_is_disabled(self, interpreter):
+        with pytest.raises(exceptions.ScriptError):
+            list(interpreter.run_script(["# not a command"], comment_prefix=None))
+
+    def test_stops_at_end_of_program(self, interpreter):
+        results = list(interpreter.run_script(["set 1", "quit", "set 2"]))
+
+        assert_that([result.result for result in results], contains_exactly(10))
+
+    def test_reports_progress_periodically_and_at_the_end(self, interpreter, script_path):
+        reports = []
+
+        list(interpreter.run_script(script_path, on_error="skip", progress=reports.append, progress_every=2))
+
+        assert_that(
+            [(report.lines, report.evaluated, report.errors) for report in reports],
+            contains_exactly((2, 1, 0), (4, 2, 1), (6, 3, 1)),
+        )
+        assert_that(reports[-1].position, is_(reports[-1].size))
+
+    def test_handles_empty_files(self, interpreter, tmp_path):
+        path = tmp_path / "empty.txt"
+        path.write_text("")
+
+        assert_that(list(interpreter.run_script(path)), is_([]))
+
+    def test_rejects_unknown_error_policies(self, interpreter):
+        with pytest.raises(ValueError):
+            interpreter.run_script([], on_error="ignore")
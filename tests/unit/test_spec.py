@@ -0,0 +1,204 @@
+import json
+import textwrap
+
+import pytest
+from doublex import assert_that
+from hamcrest import contains_exactly, contains_string, has_item, is_
+
+from cmdweaver import basic_types, exceptions
+from cmdweaver import interpreter as interpreter_module
+from cmdweaver.spec import build_registry, load_spec
+
+SPEC = """
+[[commands]]
+keywords = ["set", "mode", { type = "options", options = ["fast", "slow"], name = "mode" }]
+handler = "tests.unit.test_spec:echo"
+help = "Set the mode"
+cmd_id = "set-mode"
+
+[[commands]]
+keywords = ["interface", { type = "regex", regex = "^eth\\\\d+$" }]
+handler = "tests.unit.test_spec:echo"
+enters_context = "interface"
+
+[[commands]]
+keywords = ["mtu", { type = "or", types = [{ type = "integer", min = 0 }, { type = "options", options = ["jumbo"] }] }]
+handler = "tests.unit.test_spec:echo"
+context_name = "interface"
+
+[[commands]]
+keywords = ["port", { type = "dynamic_options", provider = "tests.unit.test_spec:ports", cache_ttl = 5 }]
+handler = "tests.unit.test_spec:echo"
+
+[[commands]]
+keywords = ["exit"]
+always = true
+"""
+
+
+def echo(*args, **kwargs):
+    return " ".join(args)
+
+
+def ports():
+    return ["eth0", "eth1"]
+
+
+def spec_with(*commands):
+    return {"commands": list(commands)}
+
+
+def problems_of(spec):
+    with pytest.raises(exceptions.SpecError) as error:
+        build_registry(spec)
+    return error.value.problems
+
+
+class TestLoadSpec:
+    def test_builds_a_registry_from_toml(self, tmp_path):
+        path = tmp_path / "commands.toml"
+        path.write_text(textwrap.dedent(SPEC))
+        interpreter = interpreter_module.Interpreter(registry=load_spec(path))
+
+        assert_that(interpreter.eval("set mode f"), is_("fast"))
+        assert_that(interpreter.eval("port eth1"), is_("eth1"))
+        interpreter.dry_run("interface eth0")
+        assert_that(interpreter.eval("mtu jumbo"), is_("jumbo"))
+
+    def test_builds_a_registry_from_json(self, tmp_path):
+        path = tmp_path / "commands.json"
+        path.write_text(json.dumps(spec_with({"keywords": ["show", {"type": "string"}], "cmd_id": "show"})))
+
+        registry = load_spec(path)
+
+        assert_that([command.cmd_id for command in registry.commands()], contains_exactly("show"))
+
+    def test_keeps_command_attributes(self):
+        registry = build_registry(
+            spec_with({"keywords": ["reload"], "help": "Reload", "context_name": "config", "always": True})
+        )
+
+        command = registry.commands()[0]
+        assert_that((command.help, command.context_name, command.always), is_(("Reload", "config", True)))
+
+    def test_does_not_import_handlers_while_loading(self):
+        registry = build_registry(spec_with({"keywords": ["sync"], "handler": "not_installed_sdk.module:sync"}))
+
+        assert_that(registry.commands()[0].handler_reference, is_("not_installed_sdk.module:sync"))
+
+    def test_builds_custom_types_from_references(self):
+        registry = build_registry(
+            spec_with({"keywords": ["name", {"type": "cmdweaver.basic_types:StringType", "name": "host"}]})
+        )
+
+        assert_that(registry.commands()[0].definitions[1], is_(basic_types.StringType))
+
+
+class TestSpecValidation:
+    def test_reports_every_problem_at_once(self):
+        problems = problems_of(
+            spec_with(
+                {"keywords": ["a", {"type": "float"}]},
+                {"keywords": ["b"], "colour": "red"},
+                {"keywords": []},
+                {"keywords": ["c", {"type": "options"}]},
+            )
+        )
+
+        assert_that(
+            problems,
+            contains_exactly(
+                "commands[0].keywords[1]: unknown type 'float'",
+                "commands[1]: unknown field 'colour'",
+                "commands[2].keywords: must be a non-empty list",
+                "commands[3].keywords[1]: 'options' slot requires 'options'",
+            ),
+        )
+
+    @pytest.mark.parametrize(
+        "command,problem",
+        [
+            ({"keywords": "show"}, "commands[0].keywords: expected list"),
+            ({"keywords": ["show version"]}, "must be a single non-empty word"),
+            ({"keywords": ["show"], "handler": "no-colon"}, "commands[0].handler"),
+            ({"keywords": ["x", {"type": "regex", "regex": "("}]}, "invalid 'regex' slot"),
+            ({"keywords": ["x", {"type": "options", "options": "abc"}]}, "commands[0].keywords[1].options"),
+            ({"keywords": ["x", {"type": "integer", "min": "1"}]}, "commands[0].keywords[1].min"),
+            ({"keywords": ["x", {"type": "or", "types": [{"type": "nope"}]}]}, "keywords[1].types[0]: unknown type"),
+            (
+                {"keywords": ["x", {"type": "or", "types": ["auto", {"type": "integer"}]}]},
+                "keywords[1].types[0]: must be a table with a 'type'",
+            ),
+            ({"keywords": ["x", {"type": "or", "types": [{"min": 1}]}]}, "keywords[1].types[0]: must be a table"),
+        ],
+    )
+    def test_rejects_invalid_definitions(self, command, problem):
+        assert_that(problems_of(spec_with(command)), has_item(contains_string(problem)))
+
+    def test_rejects_specs_without_commands(self):
+        assert_that(problems_of({}), contains_exactly("spec must have a 'commands' list"))
+
+    def test_rejects_duplicate_cmd_ids(self):
+        problems = problems_of(spec_with({"keywords": ["a"], "cmd_id": "x"}, {"keywords": ["b"], "cmd_id": "x"}))
+
+        assert_that(problems, contains_exactly("commands[1]: cmd_id 'x' is already used by commands[0]"))
+
+    def test_rejects_duplicate_shapes(self):
+        problems = problems_of(spec_with({"keywords": ["show", "version"]}, {"keywords": ["show", "version"]}))
+
+        assert_that(problems, contains_exactly("commands[1] (show version) duplicates commands[0] (show version)"))
+
+    @pytest.mark.parametrize(
+        "first,second",
+        [
+            (["show", "version"], ["show", {"type": "string"}]),
+            (
+                ["set", {"type": "options", "options": ["start", "stop"]}],
+                ["set", {"type": "options", "options": ["status"]}],
+            ),
+            (["vlan", {"type": "integer"}], ["vlan", {"type": "regex", "regex": "^\\d+$"}]),
+        ],
+    )
+    def test_rejects_shapes_that_can_match_the_same_line(self, first, second):
+        problems = problems_of(spec_with({"keywords": first}, {"keywords": second}))
+
+        assert_that(problems, contains_exactly(contains_string("is ambiguous with commands[0]")))
+
+    def test_rejects_always_commands_that_shadow_context_commands(self):
+        problems = problems_of(
+            spec_with({"keywords": ["exit"], "always": True}, {"keywords": ["exit"], "context_name": "config"})
+        )
+
+        assert_that(problems, contains_exactly(contains_string("duplicates")))
+
+    @pytest.mark.parametrize(
+        "first,second",
+        [
+            (["show", "version"], ["show", "clock"]),
+            (["show", "version"], ["show", {"type": "options", "options": ["clock", "users"]}]),
+            (["set", {"type": "options", "options": ["on"]}], ["set", {"type": "options", "options": ["auto"]}]),
+            (["vlan", {"type": "integer", "min": 1}], ["vlan", "all"]),
+            (["mtu", {"type": "string"}], ["mtu", {"type": "string"}, "now"]),
+        ],
+    )
+    def test_accepts_shapes_that_cannot_overlap(self, first, second):
+        registry = build_registry(spec_with({"keywords": first}, {"keywords": second}))
+
+        assert_that(len(registry), is_(2))
+
+    def test_accepts_shapes_in_different_contexts(self):
+        registry = build_registry(
+            spec_with(
+                {"keywords": ["exit"], "context_name": "config"}, {"keywords": ["exit"], "context_name": "interface"}
+            )
+        )
+
+        assert_that(len(registry), is_(2))
+
+    def test_can_skip_the_ambiguity_check(self):
+        registry = build_registry(
+            spec_with({"keywords": ["show", "version"]}, {"keywords": ["show", {"type": "string"}]}),
+            check_ambiguity=False,
+        )
+
+        assert_that(len(registry), is_(2))
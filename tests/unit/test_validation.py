@@ -0,0 +1,103 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from doublex import Spy, assert_that
+from hamcrest import contains_exactly, empty, has_properties, is_
+
+from cmdweaver import basic_types, exceptions
+from cmdweaver import interpreter as interpreter_module
+from cmdweaver.command import Command
+from cmdweaver.validation import validate_script
+
+SCRIPT = """# change set
+hostname core-1
+interface eth0
+  mtu 9000
+  mtu huge
+  exit
+mtu 1500
+bogus line
+"""
+EXPECTED = [(5, "InvalidArgumentError"), (7, "NoMatchingCommandFoundError"), (8, "NoMatchingCommandFoundError")]
+
+
+def build_interpreter():
+    interpreter = interpreter_module.Interpreter()
+    interpreter.add_command(Command(["hostname", basic_types.StringType()]))
+    interpreter.add_command(Command(["interface", basic_types.StringType()], enters_context="interface"))
+    interpreter.add_command(Command(["mtu", basic_types.IntegerType(min=0)], context_name="interface"))
+    interpreter.add_command(Command(["exit"], context_name="interface", exits_context=True))
+    return interpreter
+
+
+def diagnostics_summary(diagnostics):
+    return [(diagnostic.line_number, diagnostic.error_type) for diagnostic in diagnostics]
+
+
+class TestDryRun:
+    def test_matches_without_executing_the_handler(self):
+        handler = Spy()
+        interpreter = interpreter_module.Interpreter()
+        interpreter.add_command(Command(["reload"], handler.reload, cmd_id="reload"))
+
+        command = interpreter.dry_run("reload")
+
+        assert_that(command.cmd_id, is_("reload"))
+        assert_that(handler.reload.calls, is_(empty()))
+
+    def test_applies_declared_context_changes(self):
+        interpreter = build_interpreter()
+
+        interpreter.dry_run("interface eth0")
+
+        assert_that(interpreter.actual_context().context_name, is_("interface"))
+
+    def test_raises_the_same_errors_as_eval(self):
+        interpreter = build_interpreter()
+        interpreter.dry_run("interface eth0")
+
+        with pytest.raises(exceptions.InvalidArgumentError):
+            interpreter.dry_run("mtu huge")
+
+
+class TestValidateScript:
+    @pytest.fixture
+    def script_path(self, tmp_path):
+        path = tmp_path / "changes.txt"
+        path.write_text(SCRIPT)
+        return path
+
+    @pytest.fixture
+    def executor(self):
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            yield executor
+
+    @pytest.mark.parametrize("shard_lines", [1, 3, 100])
+    def test_reports_diagnostics_with_line_numbers_across_shards(self, script_path, executor, shard_lines):
+        diagnostics = validate_script(build_interpreter, script_path, shard_lines=shard_lines, executor=executor)
+
+        assert_that(diagnostics_summary(diagnostics), contains_exactly(*EXPECTED))
+
+    def test_includes_the_failing_arguments(self, script_path, executor):
+        diagnostics = list(validate_script(build_interpreter, script_path, shard_lines=2, executor=executor))
+
+        assert_that(diagnostics[0].argument_errors[0], has_properties(index=1, value="huge"))
+
+    def test_validates_iterables_of_lines(self, executor):
+        diagnostics = validate_script(build_interpreter, SCRIPT.splitlines(), shard_lines=2, executor=executor)
+
+        assert_that(diagnostics_summary(diagnostics), contains_exactly(*EXPECTED))
+
+    def test_reports_tokenizer_errors(self, executor):
+        diagnostics = validate_script(build_interpreter, ['hostname "unclosed'], executor=executor)
+
+        assert_that(diagnostics_summary(diagnostics), contains_exactly((1, "ValueError")))
+
+    def test_shards_across_a_process_pool(self, script_path):
+        diagnostics = validate_script(build_interpreter, script_path, max_workers=2, shard_lines=2)
+
+        assert_that(diagnostics_summary(diagnostics), contains_exactly(*EXPECTED))
+
+    def test_rejects_empty_shards(self, script_path):
+        with pytest.raises(ValueError):
+            validate_script(build_interpreter, script_path, shard_lines=0)